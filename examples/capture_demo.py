@@ -4,10 +4,11 @@ This script exercises the simplified gRPC capture interface by:
 1. Creating a capture camera
 2. Triggering synchronous snapshot captures with different payload options
 3. Persisting the outputs under ``logs/capture_demo_*`` for inspection
+4. Recording a short stream into a chunked dataset with ``CaptureRecorder``
 
 The code is intentionally lightweight so it can be run alongside other
 examples in ``examples/``.  It only relies on the standard
-library and the SDK provided in this repository.
+library, NumPy and the SDK provided in this repository.
 """
 
 from __future__ import annotations
@@ -19,11 +20,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 import tongsim as ts
 from tongsim.core.world_context import WorldContext
+from tongsim.record import CaptureDataset, CaptureRecorder
 from tongsim_lite_protobuf import capture_pb2
 
 GRPC_ENDPOINT = "127.0.0.1:5726"
+# Frames streamed into the recorded dataset at the end of the demo
+RECORD_FRAMES = 30
 
 LOG_ROOT = Path(__file__).resolve().parents[1] / "logs"
 # Choose color image format: "png" (no loss) or "jpg" (smaller, lossy)
@@ -62,22 +68,18 @@ def _ensure_run_dir() -> Path:
 
 
 def _save_color_png(
-    frame: dict[str, Any], path: Path, fmt: str | None = None
+    frame: ts.CaptureFrame, path: Path, fmt: str | None = None
 ) -> Path | None:
-    rgba = frame.get("rgba8")
-    if not rgba:
-        return None
-    width = int(frame.get("width", 0))
-    height = int(frame.get("height", 0))
-    if width <= 0 or height <= 0:
+    bgra = frame.bgra
+    if bgra is None or bgra.size == 0:
         return None
+    height, width = bgra.shape[:2]
 
-    # Try Pillow for convenience (UE LDR render targets are typically BGRA8).
+    # Try Pillow for convenience; its "BGRA" raw mode reads the buffer as is.
     try:
         from PIL import Image  # type: ignore
 
-        # Interpret the source bytes as BGRA and convert to RGBA for saving.
-        img = Image.frombytes("RGBA", (width, height), bytes(rgba), "raw", "BGRA")
+        img = Image.frombuffer("RGBA", (width, height), bgra, "raw", "BGRA", 0, 1)
         ext = (fmt or COLOR_FORMAT).lower()
         if ext == "jpg" or ext == "jpeg":
             # Convert to RGB for JPEG
@@ -91,7 +93,7 @@ def _save_color_png(
     except Exception:
         pass
 
-    # Minimal PNG encoder (convert BGRA -> RGBA, row-by-row, filter=0).
+    # Minimal PNG encoder (RGBA rows, filter=0).
     def _crc(chunk_type: bytes, data: bytes) -> bytes:
         c = binascii.crc32(chunk_type)
         c = binascii.crc32(data, c)
@@ -103,35 +105,22 @@ def _save_color_png(
     sig = b"\x89PNG\r\n\x1a\n"
     ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
     # each row: filter byte 0 + RGBA bytes
-    raw = bytearray()
-    mv = memoryview(rgba)
-    row_bytes = width * 4
-    for y in range(height):
-        raw.append(0)
-        start = y * row_bytes
-        row = mv[start : start + row_bytes]
-        # BGRA -> RGBA
-        for x in range(width):
-            b = row[x * 4 + 0]
-            g = row[x * 4 + 1]
-            r = row[x * 4 + 2]
-            a = row[x * 4 + 3] if len(row) >= (x * 4 + 4) else 255
-            raw += bytes((r, g, b, a))
-    idat = zlib.compress(bytes(raw))
+    raw = np.zeros((height, 1 + width * 4), dtype=np.uint8)
+    rows = raw[:, 1:].reshape(height, width, 4)
+    rows[..., :3] = frame.rgb
+    rows[..., 3] = frame.alpha
+    idat = zlib.compress(raw.tobytes())
     png = sig + _chunk(b"IHDR", ihdr) + _chunk(b"IDAT", idat) + _chunk(b"IEND", b"")
     out = path.with_suffix(".png")
     out.write_bytes(png)
     return out
 
 
-def _save_depth_exr(frame: dict[str, Any], path: Path) -> Path | None:
-    depth_bytes = frame.get("depth_r32")
-    if not depth_bytes:
-        return None
-    width = int(frame.get("width", 0))
-    height = int(frame.get("height", 0))
-    if width <= 0 or height <= 0:
+def _save_depth_exr(frame: ts.CaptureFrame, path: Path) -> Path | None:
+    depth = frame.depth
+    if depth is None or depth.size == 0:
         return None
+    height, width = depth.shape
 
     # Try OpenEXR if available
     try:
@@ -143,7 +132,7 @@ def _save_depth_exr(frame: dict[str, Any], path: Path) -> Path | None:
         ch = Imath.Channel(Imath.PixelType(Imath.PixelType.FLOAT))
         header["channels"] = {"Z": ch}
         exr = OpenEXR.OutputFile(str(path.with_suffix(".exr")), header)
-        exr.writePixels({"Z": bytes(depth_bytes)})
+        exr.writePixels({"Z": frame.depth_bytes})
         exr.close()
         out = path.with_suffix(".exr")
     except Exception:
@@ -154,23 +143,15 @@ def _save_depth_exr(frame: dict[str, Any], path: Path) -> Path | None:
             f.write(f"{width} {height}\n".encode("ascii"))
             # negative scale = little-endian floats per PFM spec
             f.write(b"-1.0\n")
-            f.write(depth_bytes)
+            f.write(frame.depth_bytes)
 
     # Also write quick stats
-    minimum = float("inf")
-    maximum = float("-inf")
-    sample: list[float] = []
-    for idx, (value,) in enumerate(struct.iter_unpack("<f", depth_bytes)):
-        if value < minimum:
-            minimum = value
-        if value > maximum:
-            maximum = value
-        if idx < 10:
-            sample.append(value)
     stats_path = out.with_suffix(out.suffix + ".txt")
     with stats_path.open("w", encoding="utf-8") as handle:
-        count = len(depth_bytes) // 4
-        handle.write(f"count={count}\nmin={minimum}\nmax={maximum}\nfirst10={sample}\n")
+        handle.write(
+            f"count={depth.size}\nmin={float(depth.min())}\n"
+            f"max={float(depth.max())}\nfirst10={depth.ravel()[:10].tolist()}\n"
+        )
     return out
 
 
@@ -251,7 +232,21 @@ async def capture_demo(context: WorldContext) -> None:
             if depth_path:
                 print("[Capture] Saved depth-only snapshot to", depth_path.name)
 
-        # Status is only meaningful for continuous capture; skip in snapshot-only demo
+        # Record a short stream: record() only queues, a writer thread fills
+        # the chunk files, so the loop keeps up with the camera rate.
+        dataset_dir = run_dir / "dataset"
+        with CaptureRecorder(dataset_dir) as recorder:
+            queued = 0
+            async with ts.CaptureAPI.stream_frames(conn, camera_id) as frames:
+                async for frame in frames:
+                    queued += recorder.record(frame)
+                    if queued == RECORD_FRAMES:
+                        break
+        dataset = CaptureDataset(dataset_dir)
+        print(
+            f"[Capture] Recorded {len(dataset)} frames to {dataset_dir.name}/:",
+            recorder.stats(),
+        )
 
     finally:
         await ts.CaptureAPI.destroy_camera(conn, camera_id)
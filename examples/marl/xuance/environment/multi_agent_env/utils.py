@@ -8,10 +8,10 @@ and geometric transformations used in the MACS multi-agent environment.
 import asyncio
 import random
 import time
-import uuid
 
 import numpy as np
 import tongsim as ts
+from tongsim.connection.grpc import ACTOR_IDS
 
 DEFAULT_CONFIG = {
     "grpc_endpoint": "127.0.0.1:5726",
@@ -106,7 +106,8 @@ async def spawn_actors_concurrently(
     Spawn multiple actors concurrently in a specified arena.
 
     This function generates safe random locations for actors and spawns them
-    in parallel to improve performance. Failed spawns are tracked and reported.
+    with a single bulk request to improve performance. Failed spawns are
+    tracked and reported.
 
     Args:
         context: World context containing connection and configuration.
@@ -128,38 +129,33 @@ async def spawn_actors_concurrently(
         ... )
         >>> print(f"Spawned {len(actors)} actors successfully")
     """
-    # Generate spawn tasks with random safe locations
-
-    tasks = []
+    # Generate random safe locations and spawn every actor with one bulk request
+    transforms = []
     for _i in range(count):
-        # Generate safe random location for this actor
         rand_x, rand_y = generate_safe_random_location(
             DEFAULT_CONFIG["x_bounds"], DEFAULT_CONFIG["y_bounds"], DEFAULT_CONFIG["block_ranges"]
         )
-
-        # Create spawn task
-        tasks.append(
-            ts.UnaryAPI.spawn_actor_in_arena(
-                context.conn,
-                arena_id,
-                blueprint_path,
-                ts.Transform(location=ts.Vector3(rand_x, rand_y, spawn_z)),
-                15.0,  # Spawn timeout in seconds
-            )
-        )
-
-    # Execute all spawn operations concurrently
-    spawn_results = await asyncio.gather(*tasks, return_exceptions=True)
+        transforms.append(ts.Transform(location=ts.Vector3(rand_x, rand_y, spawn_z)))
+
+    spawned = await ts.UnaryAPI.spawn_actors_in_arena_bulk(
+        context.conn,
+        arena_id,
+        blueprint_path,
+        transforms,
+        15.0,  # Spawn timeout in seconds
+    )
+    if spawned is None:
+        raise RuntimeError(f"Actor spawning failed in arena {arena_id}: bulk spawn request failed.")
 
     # Categorize results
     successful_spawns = []
     failed_spawns = []
 
-    for i, res in enumerate(spawn_results):
-        if isinstance(res, dict):
+    for i, res in enumerate(spawned.to_dicts()):
+        if res is not None:
             successful_spawns.append(res)
         else:
-            failed_spawns.append((i, res))
+            failed_spawns.append((i, "not spawned"))
 
     # Handle spawn failures
     if failed_spawns:
@@ -428,14 +424,8 @@ def convert_bytes_le_to_guid_string(guid_bytes_le: bytes) -> str:
         >>> convert_bytes_le_to_guid_string(guid_bytes)
         '04030201-0605-0807-090A-0B0C0D0E0F10'
     """
-    # Parse bytes as UUID in little-endian format
-    uuid_obj = uuid.UUID(bytes_le=guid_bytes_le)
-
-    # Convert to string representation
-    guid_string = str(uuid_obj)
-
-    # Return uppercase version for consistency with UE conventions
-    return guid_string.upper()
+    # Interned by the SDK: each GUID is formatted once per process.
+    return ACTOR_IDS.from_guid(bytes(guid_bytes_le)).text
 
 
 def generate_circular_rays(forward_vector: np.ndarray, num_rays: int = 30, radius: float = 1.0) -> np.ndarray:
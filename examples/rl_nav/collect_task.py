@@ -207,11 +207,16 @@ class CollectTask(gym.Env):
         cur_loc = cur_loc - ts.Vector3(self.anchor)
         self.agent_loc = ts.Vector3(cur_loc)
 
+        # The RPCs below do not depend on each other; they are sent together
+        # in one sync_run_many hop once the step's bookkeeping is done.
+        pending = []
+        goal_destroy_idx = None
+
         if hit:
             if hit["hit_actor"].tag == "RL_Coin":
                 reward += 50.0
                 goal_id = hit["hit_actor"].object_info.id.guid
-                destoryok = self.ue.context.sync_run(
+                pending.append(
                     ts.UnaryAPI.arena_destroy_actor(
                         self.ue.context.conn, self.arena_id, goal_id
                     )
@@ -278,7 +283,7 @@ class CollectTask(gym.Env):
         det_loc = cur_loc - expected_loc
         d = math.sqrt(det_loc.x * det_loc.x + det_loc.y * det_loc.y)
         if d > 2.0:
-            self.ue.context.sync_run(
+            pending.append(
                 ts.UnaryAPI.set_actor_pose_local(
                     self.ue.context.conn,
                     arena_id=self.arena_id,
@@ -302,17 +307,12 @@ class CollectTask(gym.Env):
             ):
                 for goal_id, pos in self.id_to_pos.items():
                     if pos == self.current_global_goal:
-                        destoryok = self.ue.context.sync_run(
+                        goal_destroy_idx = len(pending)
+                        pending.append(
                             ts.UnaryAPI.arena_destroy_actor(
                                 self.ue.context.conn, self.arena_id, goal_id
                             )
                         )
-                        if destoryok:
-                            self.global_map[
-                                self.current_global_goal[0],
-                                self.current_global_goal[1],
-                            ] = para.FREE
-                            reward += 50.0
                         break
             else:
                 reward += 20.0
@@ -323,6 +323,14 @@ class CollectTask(gym.Env):
             manhattan_dis_old = abs(x2 - x1) + abs(y2 - y1)
             reward += (manhattan_dis_old - manhattan_dis) * 0.2
 
+        if pending:
+            results = self.ue.context.sync_run_many(pending)
+            if goal_destroy_idx is not None and results[goal_destroy_idx]:
+                self.global_map[
+                    self.current_global_goal[0], self.current_global_goal[1]
+                ] = para.FREE
+                reward += 50.0
+
         local_view = self._get_local_view(self.agent_pos, self.view_size)
 
         self.upper_policy.update(local_view, self.agent_pos)
@@ -465,29 +473,40 @@ class CollectTask(gym.Env):
         self.goal_num = random.randint(3, 8)
         self.id_to_pos = {}
         spawn_errors = 0
+        cells: list[tuple[int, int]] = []
         for _ in range(self.goal_num):
             area_id = np.random.randint(0, 7)
             area = para.AREA_LIST[area_id]
             x = np.random.uniform(area[0][0], area[1][0])
             y = np.random.uniform(area[0][1], area[1][1])
-            z = 5.0
 
             x_idx = int((x + para.TRANS_X) / para.GRID_RES)
             y_idx = int(y / para.GRID_RES)
-            x = (x_idx + 0.5) * para.GRID_RES - para.TRANS_X
-            y = (y_idx + 0.5) * para.GRID_RES
-            location = ts.Vector3(x, y, z)
-            paper_used_tf = Transform(location=location)
+            cells.append((x_idx, y_idx))
 
-            spawned = self.ue.context.sync_run(
-                ts.UnaryAPI.spawn_actor_in_arena(
-                    self.ue.context.conn,
-                    arena_id=self.arena_id,
-                    class_path=para.BP_PAPER_USED,
-                    local_transform=paper_used_tf,
-                )
+        # Spawn every goal with one bulk request instead of one call per goal.
+        spawned = self.ue.context.sync_run(
+            ts.UnaryAPI.spawn_actors_in_arena_bulk(
+                self.ue.context.conn,
+                arena_id=self.arena_id,
+                class_paths=para.BP_PAPER_USED,
+                local_transforms=[
+                    Transform(
+                        location=ts.Vector3(
+                            (x_idx + 0.5) * para.GRID_RES - para.TRANS_X,
+                            (y_idx + 0.5) * para.GRID_RES,
+                            5.0,
+                        )
+                    )
+                    for x_idx, y_idx in cells
+                ],
             )
+        )
+        spawned_list = (
+            spawned.to_dicts() if spawned is not None else [None] * len(cells)
+        )
 
+        for (x_idx, y_idx), spawned in zip(cells, spawned_list, strict=True):
             if spawned is not None:
                 id = spawned["id"]
                 if (
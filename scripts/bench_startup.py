@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Measure SDK startup cost: ``import tongsim`` and ``TongSim()`` construction.
+
+Each sample runs in a fresh interpreter so module caches do not hide the
+import cost. ``TongSim()`` does not need a running UE server: the connection
+warm-up is skipped (``connect_timeout=0``), so the measurement covers loop
+start-up, channel creation and stub resolution only.
+
+Usage:
+    uv run python scripts/bench_startup.py
+    uv run python scripts/bench_startup.py --runs 20 --json bench_startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import tongsim as ts
+t1 = time.perf_counter()
+sims, ctor = [], []
+for _ in range({instances}):
+    s = time.perf_counter()
+    sim = ts.TongSim(grpc_endpoint="{endpoint}", connect_timeout=0)
+    sim.context.sync_run(_first_stub(sim.context.conn))
+    ctor.append(time.perf_counter() - s)
+    sims.append(sim)
+for s in sims:
+    s.close()
+print(json.dumps({{"import_s": t1 - t0, "ctor_s": ctor}}))
+"""
+
+_PRELUDE = r"""
+async def _first_stub(conn):
+    from tongsim_lite_protobuf.demo_rl_pb2_grpc import DemoRLServiceStub
+    conn.get_stub(DemoRLServiceStub)
+"""
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters.")
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=4,
+        help="TongSim() instances built per interpreter (first one is cold).",
+    )
+    parser.add_argument(
+        "--endpoint",
+        default="127.0.0.1:5726",
+        help="gRPC endpoint passed to TongSim (no server required).",
+    )
+    parser.add_argument("--json", default=None, help="Write raw samples to a file.")
+    return parser.parse_args()
+
+
+def _sample(instances: int, endpoint: str) -> dict:
+    code = _PRELUDE + _PROBE.format(instances=instances, endpoint=endpoint)
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _summary(label: str, values_s: list[float]) -> str:
+    ms = [v * 1000 for v in values_s]
+    return (
+        f"{label:<22} median {statistics.median(ms):8.2f} ms   "
+        f"min {min(ms):8.2f} ms   max {max(ms):8.2f} ms   (n={len(ms)})"
+    )
+
+
+def main():
+    args = _parse_args()
+    samples = [_sample(args.instances, args.endpoint) for _ in range(args.runs)]
+
+    imports = [s["import_s"] for s in samples]
+    cold = [s["ctor_s"][0] for s in samples]
+    warm = [v for s in samples for v in s["ctor_s"][1:]]
+
+    print(_summary("import tongsim", imports))
+    print(_summary("TongSim() first", cold))
+    if warm:
+        print(_summary("TongSim() subsequent", warm))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "samples": samples}, f, indent=2)
+        print(f"[Info] Samples written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
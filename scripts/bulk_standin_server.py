@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Local stand-in for the bulk spawn / destroy endpoints.
+
+Serves ``ArenaService.SpawnActorInArena`` / ``BatchSpawnActorsInArena`` and
+``DemoRLService.DestroyActor`` / ``BatchDestroyActors`` without a running UE
+instance, enforcing the server batch cap, so the chunking and fallback paths
+of ``UnaryAPI.spawn_actors_in_arena_bulk`` / ``destroy_actors_bulk`` can be
+exercised and benchmarked:
+
+- every call sleeps ``--latency-ms`` (one simulated round trip)
+- batches larger than the cap are rejected with ``INVALID_ARGUMENT``
+- ``--no-batch`` answers the batch RPCs with ``UNIMPLEMENTED``
+- ``--fail-every N`` fails every Nth batch call with ``INTERNAL``, so one
+  chunk of a bulk call fails while the others succeed
+
+Usage:
+    uv run python scripts/bulk_standin_server.py --port 5728 --latency-ms 5
+    uv run python scripts/bulk_standin_server.py --bench 600
+    uv run python scripts/bulk_standin_server.py --bench 600 --fail-every 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import grpc
+
+from tongsim_lite_protobuf import (
+    arena_pb2,
+    arena_pb2_grpc,
+    common_pb2,
+    demo_rl_pb2,
+    demo_rl_pb2_grpc,
+    object_pb2,
+)
+
+BATCH_CAP = 256
+
+
+class World:
+    def __init__(self, latency_s: float, batch: bool, fail_every: int = 0):
+        self.latency_s = latency_s
+        self.batch = batch
+        self.fail_every = fail_every
+        self.actors: dict[bytes, object_pb2.ObjectInfo] = {}
+        self.calls = 0
+        self.batch_calls = 0
+
+    async def round_trip(self, context, size: int = 1) -> None:
+        self.calls += 1
+        if size > BATCH_CAP:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, f"batch of {size} > {BATCH_CAP}"
+            )
+        await asyncio.sleep(self.latency_s)
+
+    async def batch_round_trip(self, context, size: int) -> None:
+        if not self.batch:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, "batch disabled")
+        self.batch_calls += 1
+        if self.fail_every and self.batch_calls % self.fail_every == 0:
+            await context.abort(grpc.StatusCode.INTERNAL, "injected chunk failure")
+        await self.round_trip(context, size)
+
+    def spawn(self, item: arena_pb2.SpawnActorInArenaRequest) -> object_pb2.ObjectInfo:
+        guid = uuid.uuid4().bytes_le
+        info = object_pb2.ObjectInfo(
+            id=object_pb2.ObjectId(guid=guid),
+            name=f"{item.class_path.rsplit('/', 1)[-1]}_{len(self.actors)}",
+            class_path=item.class_path,
+        )
+        self.actors[guid] = info
+        return info
+
+
+class StandInArenaService(arena_pb2_grpc.ArenaServiceServicer):
+    def __init__(self, world: World):
+        self._world = world
+
+    async def SpawnActorInArena(self, request, context):  # noqa: N802
+        await self._world.round_trip(context)
+        return arena_pb2.SpawnActorInArenaResponse(actor=self._world.spawn(request))
+
+    async def BatchSpawnActorsInArena(self, request, context):  # noqa: N802
+        await self._world.batch_round_trip(context, len(request.items))
+        out = arena_pb2.BatchSpawnActorsInArenaResponse()
+        for item in request.items:
+            out.results.add(success=True)
+            out.actors.append(self._world.spawn(item))
+        return out
+
+
+class StandInDemoRLService(demo_rl_pb2_grpc.DemoRLServiceServicer):
+    def __init__(self, world: World):
+        self._world = world
+
+    async def DestroyActor(self, request, context):  # noqa: N802
+        await self._world.round_trip(context)
+        if self._world.actors.pop(request.actor_id.guid, None) is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "unknown actor")
+        return common_pb2.Empty()
+
+    async def BatchDestroyActors(self, request, context):  # noqa: N802
+        await self._world.batch_round_trip(context, len(request.actor_ids))
+        out = demo_rl_pb2.BatchDestroyActorsResponse()
+        for actor_id in request.actor_ids:
+            found = self._world.actors.pop(actor_id.guid, None) is not None
+            out.results.add(success=found, message="" if found else "unknown actor")
+        return out
+
+
+async def serve(port: int, world: World) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    arena_pb2_grpc.add_ArenaServiceServicer_to_server(
+        StandInArenaService(world), server
+    )
+    demo_rl_pb2_grpc.add_DemoRLServiceServicer_to_server(
+        StandInDemoRLService(world), server
+    )
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+async def bench(port: int, world: World, count: int) -> None:
+    from tongsim.connection.grpc import GrpcConnection, UnaryAPI
+    from tongsim.math import Transform, Vector3
+
+    arena = "00000000-0000-0000-0000-000000000001"
+    transforms = [Transform(Vector3(i * 100.0, 0, 0)) for i in range(count)]
+    async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+        world.calls = 0
+        start = time.perf_counter()
+        spawned = await UnaryAPI.spawn_actors_in_arena_bulk(
+            conn, arena, "/Game/Stand/BP_Box", transforms
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"[Info] spawned {count - spawned.num_failed}/{count} actors in "
+            f"{elapsed * 1e3:.1f} ms with {world.calls} calls"
+        )
+
+        world.calls = 0
+        start = time.perf_counter()
+        destroyed = await UnaryAPI.destroy_actors_bulk(conn, spawned.actor_ids())
+        elapsed = time.perf_counter() - start
+        print(
+            f"[Info] destroyed {sum(destroyed)}/{len(destroyed)} actors in "
+            f"{elapsed * 1e3:.1f} ms with {world.calls} calls"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--no-batch", action="store_true", help="Reject the batch RPCs."
+    )
+    parser.add_argument(
+        "--fail-every", type=int, default=0, help="Fail every Nth batch call."
+    )
+    parser.add_argument(
+        "--bench", type=int, default=0, help="Spawn and destroy N actors and exit."
+    )
+    args = parser.parse_args()
+
+    world = World(args.latency_ms / 1000.0, not args.no_batch, args.fail_every)
+    server, port = await serve(args.port, world)
+    print(f"[Info] bulk spawn stand-in listening on 127.0.0.1:{port}")
+    if args.bench:
+        await bench(port, world, args.bench)
+        await server.stop(grace=1.0)
+        return
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
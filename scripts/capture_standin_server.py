@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+"""
+Local stand-in for continuous capture.
+
+Serves ``CaptureService.CreateCaptureCamera`` / ``CaptureSnapshot`` /
+``CaptureSnapshotBatch`` / ``StreamFrames`` with synthetic frames, without a
+running UE instance, so ``CaptureAPI.stream_frames`` (ring buffers) and
+``CaptureAPI.capture_snapshot_batch`` (alignment) can be exercised and
+benchmarked against per-camera snapshots:
+
+- the game clock ticks at 60 Hz; captures render one at a time, each in
+  the tick it starts
+- every camera streams at its ``qps`` (or the rate the stream asks for)
+- every snapshot sleeps ``--latency-ms`` (one simulated render + readback),
+  plus ``--readback-ms`` per camera of a batch
+- ``--skip-every N`` makes the server skip every N-th frame id
+- ``--no-stream`` / ``--no-batch`` answer ``StreamFrames`` /
+  ``CaptureSnapshotBatch`` with ``UNIMPLEMENTED``
+
+Usage:
+    uv run python scripts/capture_standin_server.py --port 5730
+    uv run python scripts/capture_standin_server.py --bench 120 --skip-every 10
+    uv run python scripts/capture_standin_server.py --bench-batch 50
+    uv run python scripts/capture_standin_server.py --check-record 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+
+import grpc
+import numpy as np
+
+from tongsim_lite_protobuf import capture_pb2, capture_pb2_grpc, object_pb2
+
+TICK_HZ = 60.0
+
+
+class Camera:
+    def __init__(self, guid: bytes, params: capture_pb2.CaptureCameraParams):
+        self.guid = guid
+        self.width = params.width or 640
+        self.height = params.height or 480
+        self.qps = params.qps or 10.0
+        self.frame_id = 0
+        pixels = self.width * self.height
+        self.color = (
+            np.random.default_rng(0)
+            .integers(0, 255, pixels * 4, dtype=np.uint8)
+            .tobytes()
+        )
+        self.depth = np.linspace(10.0, 5000.0, pixels, dtype="<f4").tobytes()
+
+    def render(
+        self,
+        game_time: float,
+        skip_every: int,
+        include_color: bool,
+        include_depth: bool,
+    ) -> capture_pb2.CaptureFrame:
+        self.frame_id += 1
+        if skip_every and self.frame_id % skip_every == 0:
+            self.frame_id += 1
+        frame = capture_pb2.CaptureFrame(
+            camera_id=object_pb2.ObjectId(guid=self.guid),
+            frame_id=self.frame_id,
+            game_time_seconds=game_time,
+            gpu_ready_timestamp=time.time(),
+            width=self.width,
+            height=self.height,
+            has_color=include_color,
+            has_depth=include_depth,
+            depth_near=10.0,
+            depth_far=5000.0,
+            depth_mode=capture_pb2.CAPTURE_DEPTH_LINEAR,
+        )
+        frame.intrinsics.fx = frame.intrinsics.fy = self.width / 2.0
+        frame.intrinsics.cx, frame.intrinsics.cy = self.width / 2.0, self.height / 2.0
+        frame.world_pose.scale.x = frame.world_pose.scale.y = 1.0
+        frame.world_pose.scale.z = 1.0
+        if include_color:
+            frame.rgba8 = self.color
+        if include_depth:
+            frame.depth_r32 = self.depth
+        return frame
+
+
+class StandInCaptureService(capture_pb2_grpc.CaptureServiceServicer):
+    def __init__(
+        self,
+        latency_s: float,
+        readback_s: float,
+        skip_every: int,
+        stream: bool,
+        batch: bool,
+    ):
+        self.latency_s = latency_s
+        self.readback_s = readback_s
+        self.skip_every = skip_every
+        self.stream = stream
+        self.batch = batch
+        self.cameras: dict[bytes, Camera] = {}
+        self.started = time.monotonic()
+        # One capture renders at a time, like the game thread.
+        self.render_lock = asyncio.Lock()
+
+    def tick(self) -> int:
+        return int((time.monotonic() - self.started) * TICK_HZ)
+
+    async def CreateCaptureCamera(self, request, context):  # noqa: N802
+        guid = uuid.uuid4().bytes_le
+        self.cameras[guid] = Camera(guid, request.params)
+        out = capture_pb2.CreateCaptureCameraResponse()
+        out.camera.id.guid = guid
+        out.camera.name = request.capture_name or f"StandInCam_{len(self.cameras)}"
+        return out
+
+    def _camera(self, camera_id: object_pb2.ObjectId) -> Camera | None:
+        return self.cameras.get(camera_id.guid)
+
+    async def CaptureSnapshot(self, request, context):  # noqa: N802
+        camera = self._camera(request.camera_id)
+        if camera is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "unknown camera")
+        async with self.render_lock:
+            tick = self.tick()
+            await asyncio.sleep(self.latency_s)
+        return camera.render(
+            tick / TICK_HZ,
+            self.skip_every,
+            request.include_color,
+            request.include_depth,
+        )
+
+    async def CaptureSnapshotBatch(self, request, context):  # noqa: N802
+        if not self.batch:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, "batch disabled")
+        cameras = [self._camera(c) for c in request.camera_ids]
+        if None in cameras:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "unknown camera")
+        async with self.render_lock:
+            tick = self.tick()
+            await asyncio.sleep(self.latency_s + self.readback_s * len(cameras))
+        return capture_pb2.CaptureSnapshotBatchResponse(
+            frames=[
+                camera.render(
+                    tick / TICK_HZ,
+                    self.skip_every,
+                    request.include_color,
+                    request.include_depth,
+                )
+                for camera in cameras
+            ],
+            render_tick=tick,
+            game_time_seconds=tick / TICK_HZ,
+        )
+
+    async def StreamFrames(self, request, context):  # noqa: N802
+        if not self.stream:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, "stream disabled")
+        cameras = [self._camera(c) for c in request.camera_ids]
+        if not cameras or None in cameras:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "unknown camera")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        due = dict.fromkeys(range(len(cameras)), start)
+        while True:
+            index = min(due, key=due.get)
+            await asyncio.sleep(max(0.0, due[index] - loop.time()))
+            camera = cameras[index]
+            due[index] += 1.0 / (request.qps or camera.qps)
+            yield camera.render(
+                camera.frame_id / (request.qps or camera.qps),
+                self.skip_every,
+                request.include_color,
+                request.include_depth,
+            )
+
+
+async def serve(
+    port: int, service: StandInCaptureService
+) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server(
+        options=[("grpc.max_send_message_length", 64 * 1024 * 1024)]
+    )
+    capture_pb2_grpc.add_CaptureServiceServicer_to_server(service, server)
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+async def bench(port: int, frames: int, qps: float) -> None:
+    from tongsim.connection.grpc import CaptureAPI, GrpcConnection
+    from tongsim.math import Transform
+
+    params = {"width": 640, "height": 480, "qps": qps}
+    async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+        cams = [
+            await CaptureAPI.create_camera(conn, transform=Transform(), params=params)
+            for _ in range(2)
+        ]
+
+        start = time.perf_counter()
+        for i in range(frames):
+            await CaptureAPI.capture_snapshot(conn, cams[i % 2], timeout_seconds=1.0)
+        elapsed = time.perf_counter() - start
+        print(
+            f"[Info] snapshot polling: {frames} frames in {elapsed:.2f} s "
+            f"({frames / elapsed:.1f} fps over 2 cameras)"
+        )
+
+        # A consumer slower than the combined camera rate: the ring buffer
+        # bounds memory and latest() stays fresh.
+        async with CaptureAPI.stream_frames(conn, cams, buffer_size=4) as stream:
+            start = time.perf_counter()
+            lag = []
+            consumed = 0
+            async for frame in stream:
+                await asyncio.sleep(1.5 / qps)
+                lag.append(stream.latest(frame.camera_id).frame_id - frame.frame_id)
+                consumed += 1
+                if consumed == frames:
+                    break
+            elapsed = time.perf_counter() - start
+        print(
+            f"[Info] stream (drop_oldest, slow consumer): {frames} frames in "
+            f"{elapsed:.2f} s, mean lag behind latest {np.mean(lag):.1f} frames"
+        )
+        for cam in cams:
+            print(f"[Info]   camera {cam.hex()[:8]}: {stream.stats()[cam]}")
+
+
+async def bench_batch(port: int, rounds: int) -> None:
+    from tongsim.connection.grpc import CaptureAPI, FrameSetAssembler, GrpcConnection
+    from tongsim.math import Transform
+
+    params = {"width": 320, "height": 240}
+    async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+        cams = [
+            await CaptureAPI.create_camera(conn, transform=Transform(), params=params)
+            for _ in range(8)
+        ]
+        for n in (1, 2, 4, 8):
+            views = cams[:n]
+            assembler = FrameSetAssembler(views)
+            start = time.perf_counter()
+            aligned = 0
+            for _ in range(rounds):
+                frames = await asyncio.gather(
+                    *(CaptureAPI.capture_snapshot(conn, c) for c in views)
+                )
+                aligned += assembler.assemble(frames).aligned
+            per_camera = (time.perf_counter() - start) / rounds
+            start = time.perf_counter()
+            batch_aligned = 0
+            for _ in range(rounds):
+                views_set = await CaptureAPI.capture_snapshot_batch(conn, views)
+                batch_aligned += views_set.aligned
+            batch = (time.perf_counter() - start) / rounds
+            print(
+                f"[Info] {n} cameras: per-camera snapshots {per_camera * 1e3:.1f} ms "
+                f"({aligned}/{rounds} aligned), batch {batch * 1e3:.1f} ms "
+                f"({batch_aligned}/{rounds} aligned)"
+            )
+
+
+async def check_record(port: int, frames: int) -> None:
+    """Record snapshots, read them back and back-project both versions."""
+    from tongsim.connection.grpc import CaptureAPI, GrpcConnection
+    from tongsim.math import Transform
+    from tongsim.perception import depth_to_points
+    from tongsim.record import CaptureDataset, CaptureRecorder
+
+    params = {"width": 160, "height": 120}
+    with tempfile.TemporaryDirectory() as tmp:
+        async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+            cam = await CaptureAPI.create_camera(
+                conn, transform=Transform(), params=params
+            )
+            live = []
+            with CaptureRecorder(f"{tmp}/run", chunk_frames=4) as recorder:
+                for _ in range(frames):
+                    frame = await CaptureAPI.capture_snapshot(conn, cam)
+                    assert recorder.record(frame)
+                    live.append(frame)
+        data = CaptureDataset(f"{tmp}/run")
+        assert len(data) == frames, len(data)
+        for frame, recorded in zip(live, data, strict=True):
+            assert (recorded.width, recorded.height) == (frame.width, frame.height)
+            points, colors = depth_to_points(recorded, stride=4, with_colors=True)
+            expected, _ = depth_to_points(frame, stride=4, with_colors=True)
+            np.testing.assert_array_equal(points, expected)
+            assert len(colors) == len(points)
+    print(f"[Info] {frames} recorded frames back-project like the live ones")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--readback-ms", type=float, default=1.0)
+    parser.add_argument("--skip-every", type=int, default=0)
+    parser.add_argument("--no-stream", action="store_true", help="Reject StreamFrames.")
+    parser.add_argument(
+        "--no-batch", action="store_true", help="Reject CaptureSnapshotBatch."
+    )
+    parser.add_argument("--qps", type=float, default=30.0, help="Bench camera rate.")
+    parser.add_argument(
+        "--bench", type=int, default=0, help="Poll and stream N frames and exit."
+    )
+    parser.add_argument(
+        "--bench-batch",
+        type=int,
+        default=0,
+        help="Compare N rounds of per-camera and batch snapshots and exit.",
+    )
+    parser.add_argument(
+        "--check-record",
+        type=int,
+        default=0,
+        help="Record N frames, read them back as point clouds and exit.",
+    )
+    args = parser.parse_args()
+
+    service = StandInCaptureService(
+        args.latency_ms / 1000.0,
+        args.readback_ms / 1000.0,
+        args.skip_every,
+        not args.no_stream,
+        not args.no_batch,
+    )
+    server, port = await serve(args.port, service)
+    print(f"[Info] capture stand-in listening on 127.0.0.1:{port}")
+    if args.bench or args.bench_batch or args.check_record:
+        if args.bench:
+            await bench(port, args.bench, args.qps)
+        if args.bench_batch:
+            await bench_batch(port, args.bench_batch)
+        if args.check_record:
+            await check_record(port, args.check_record)
+        await server.stop(grace=1.0)
+        return
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
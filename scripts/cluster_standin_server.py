@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+"""
+Local stand-ins for a multi-instance ``TongSimCluster``.
+
+Starts several in-process ``ArenaService`` stand-ins, one per port, serving
+``LoadArena`` / ``ListArenas`` / ``ResetArena`` / ``DestroyArena`` /
+``SpawnActorInArena`` without a running UE instance, so load-based placement
+and per-arena routing of ``TongSimCluster`` can be exercised:
+
+- ``--preload`` seeds each instance with one arena holding that many actors,
+  which ``refresh_load`` reports through ``ListArenas``
+- every call sleeps ``--latency-ms`` (one simulated round trip)
+- calls naming an arena the instance does not own are rejected with
+  ``NOT_FOUND``, so a mis-routed call fails instead of passing silently
+- ``--check`` adds one endpoint with no server behind it, which placement
+  must skip
+
+Usage:
+    uv run python scripts/cluster_standin_server.py --preload 40,0
+    uv run python scripts/cluster_standin_server.py --check --preload 40,0,10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import uuid
+
+import grpc
+
+from tongsim_lite_protobuf import arena_pb2, arena_pb2_grpc, common_pb2, object_pb2
+
+
+class Instance:
+    def __init__(self, latency_s: float, preload: int):
+        self.latency_s = latency_s
+        self.arenas: dict[bytes, arena_pb2.ArenaDescriptor] = {}
+        self.calls = 0
+        if preload:
+            arena = self.add_arena("/Game/Stand/Preloaded", common_pb2.Transform())
+            arena.num_actors = preload
+
+    def add_arena(
+        self, asset_path: str, anchor: common_pb2.Transform
+    ) -> arena_pb2.ArenaDescriptor:
+        guid = uuid.uuid4().bytes_le
+        arena = arena_pb2.ArenaDescriptor(
+            arena_id=object_pb2.ObjectId(guid=guid),
+            asset_path=asset_path,
+            anchor=anchor,
+            is_loaded=True,
+            is_visible=True,
+        )
+        self.arenas[guid] = arena
+        return arena
+
+    async def round_trip(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+
+    async def arena(self, arena_id: object_pb2.ObjectId, context):
+        arena = self.arenas.get(arena_id.guid)
+        if arena is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "arena not on instance")
+        return arena
+
+
+class StandInArenaService(arena_pb2_grpc.ArenaServiceServicer):
+    def __init__(self, instance: Instance):
+        self._instance = instance
+
+    async def LoadArena(self, request, context):  # noqa: N802
+        await self._instance.round_trip()
+        arena = self._instance.add_arena(request.level_asset_path, request.anchor)
+        arena.is_visible = request.make_visible
+        return arena_pb2.LoadArenaResponse(arena_id=arena.arena_id)
+
+    async def ListArenas(self, request, context):  # noqa: N802
+        await self._instance.round_trip()
+        return arena_pb2.ListArenasResponse(arenas=self._instance.arenas.values())
+
+    async def ResetArena(self, request, context):  # noqa: N802
+        await self._instance.round_trip()
+        await self._instance.arena(request.arena_id, context)
+        return common_pb2.Empty()
+
+    async def DestroyArena(self, request, context):  # noqa: N802
+        await self._instance.round_trip()
+        await self._instance.arena(request.arena_id, context)
+        del self._instance.arenas[request.arena_id.guid]
+        return common_pb2.Empty()
+
+    async def SpawnActorInArena(self, request, context):  # noqa: N802
+        await self._instance.round_trip()
+        arena = await self._instance.arena(request.arena_id, context)
+        arena.num_actors += 1
+        guid = uuid.uuid4().bytes_le
+        return arena_pb2.SpawnActorInArenaResponse(
+            actor=object_pb2.ObjectInfo(
+                id=object_pb2.ObjectId(guid=guid),
+                name=f"{request.class_path.rsplit('/', 1)[-1]}_{arena.num_actors}",
+                class_path=request.class_path,
+            )
+        )
+
+
+async def serve(port: int, instance: Instance) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    arena_pb2_grpc.add_ArenaServiceServicer_to_server(
+        StandInArenaService(instance), server
+    )
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+def check(endpoints: list[str], instances: list[Instance], dead: str) -> None:
+    """Drive a ``TongSimCluster`` over the stand-ins and verify placement."""
+    from tongsim.cluster import TongSimCluster
+    from tongsim.connection.grpc import UnaryAPI
+    from tongsim.math import Transform
+
+    # Placement on actor counts alone: loopback latency is noise here.
+    with TongSimCluster([*endpoints, dead], latency_weight=0.0) as cluster:
+        load = cluster.refresh_load()
+        print(f"[Info] initial load: {load}")
+        # The dead endpoint keeps 0 actors but must never be chosen.
+        assert not cluster.stats()["endpoints"][dead]["healthy"]
+
+        placed: list[str] = []
+        for i in range(2 * len(endpoints)):
+            load = cluster.refresh_load()
+            expected = min(endpoints, key=load.__getitem__)
+            arena_id = cluster.load_arena(f"/Game/Stand/Arena_{i}", Transform())
+            owner = cluster.arenas()[arena_id]
+            assert owner == expected, f"arena {i} placed on {owner}, not {expected}"
+            # Give the new arena weight so the next placement moves on.
+            for _ in range(15):
+                assert cluster.spawn_actor_in_arena(
+                    arena_id, "/Game/Stand/BP_Box", Transform()
+                )
+            placed.append(arena_id)
+        print(f"[Info] placement: {cluster.refresh_load()}")
+
+        # Routed calls: each stand-in rejects arenas it does not own.
+        assert all(cluster.call(a, UnaryAPI.reset_arena, a) for a in placed)
+        resets = cluster.call_many(
+            (a, lambda conn, a=a: UnaryAPI.reset_arena(conn, a)) for a in placed
+        )
+        assert all(resets), resets
+        for arena_id in placed:
+            assert cluster.destroy_arena(arena_id)
+        assert not set(placed) & set(cluster.arenas())
+
+        stats = cluster.stats()["endpoints"]
+        assert stats[dead]["errors"] > 0 and not stats[dead]["healthy"], stats[dead]
+        for endpoint, instance in zip(endpoints, instances, strict=True):
+            assert stats[endpoint]["errors"] == 0, stats[endpoint]
+            print(
+                f"[Info] {endpoint}: {instance.calls} calls served, "
+                f"{stats[endpoint]['calls']} routed, "
+                f"{stats[endpoint]['latency_ms']:.2f} ms mean latency"
+            )
+    print("[Info] cluster placement and routing OK")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--port", type=int, default=0, help="First port; 0 picks free ports."
+    )
+    parser.add_argument(
+        "--preload",
+        default="0,0",
+        help="Comma-separated preloaded actor count per instance.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--check", action="store_true", help="Run the cluster check and exit."
+    )
+    args = parser.parse_args()
+
+    preload = [int(n) for n in args.preload.split(",")]
+    instances = [Instance(args.latency_ms / 1000.0, n) for n in preload]
+    servers = []
+    endpoints = []
+    for i, instance in enumerate(instances):
+        server, port = await serve(args.port + i if args.port else 0, instance)
+        servers.append(server)
+        endpoints.append(f"127.0.0.1:{port}")
+    print(f"[Info] cluster stand-ins listening on {', '.join(endpoints)}")
+    try:
+        if args.check:
+            # A port that was just served and released: connections are refused.
+            server, port = await serve(0, Instance(0.0, 0))
+            await server.stop(None)
+            # The cluster blocks on its own loops; keep serving meanwhile.
+            await asyncio.to_thread(check, endpoints, instances, f"127.0.0.1:{port}")
+            return
+        await asyncio.gather(*(s.wait_for_termination() for s in servers))
+    finally:
+        await asyncio.gather(*(s.stop(grace=1.0) for s in servers))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
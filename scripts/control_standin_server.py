@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+Local stand-in for ``ControlService.ControlStream``.
+
+Answers every ``ActionBatch`` without a running UE instance so client code
+built on ``ControlStream`` can be exercised and benchmarked:
+
+- move: reports the target as the current location
+- teleport: succeeds
+- trace: reports no blocking hit
+
+``--check-timeouts`` makes the stand-in answer late, then not at all, while
+``request`` times out, and verifies the stream still serves requests
+afterwards.
+
+Usage:
+    uv run python scripts/control_standin_server.py --port 5727 --latency-ms 2
+    uv run python scripts/control_standin_server.py --bench 2000
+    uv run python scripts/control_standin_server.py --check-timeouts
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import time
+
+import grpc
+
+from tongsim_lite_protobuf import control_pb2, control_pb2_grpc
+
+
+class StandInControlService(control_pb2_grpc.ControlServiceServicer):
+    def __init__(self, latency_s: float = 0.0, reorder: bool = False):
+        self.latency_s = latency_s
+        self.silent = False  # Swallow batches without answering.
+        self._reorder = reorder
+
+    def _answer(self, batch: control_pb2.ActionBatch) -> control_pb2.ActionBatchResult:
+        out = control_pb2.ActionBatchResult(request_id=batch.request_id)
+        for action in batch.actions:
+            result = out.results.add(success=True)
+            kind = action.WhichOneof("kind")
+            if kind == "move":
+                result.move.current_location.CopyFrom(action.move.target_location)
+            elif kind == "trace":
+                result.trace.blocking_hit = False
+        return out
+
+    async def ControlStream(self, request_iterator, context):  # noqa: N802
+        # Answer batches concurrently, so results may come back out of order
+        # when ``reorder`` is set, like a server ticking several arenas.
+        replies: asyncio.Queue = asyncio.Queue()
+        handlers: set[asyncio.Future] = set()
+        pending = 0
+        done_reading = False
+
+        async def handle(batch, delay):
+            await asyncio.sleep(delay)
+            await replies.put(self._answer(batch))
+
+        async def read_all():
+            nonlocal pending, done_reading
+            async for batch in request_iterator:
+                if self.silent:
+                    continue
+                pending += 1
+                delay = self.latency_s
+                if self._reorder and batch.request_id % 2:
+                    delay *= 2
+                task = asyncio.ensure_future(handle(batch, delay))
+                handlers.add(task)
+                task.add_done_callback(handlers.discard)
+            done_reading = True
+
+        reader = asyncio.ensure_future(read_all())
+        while not (done_reading and pending == 0):
+            try:
+                reply = await asyncio.wait_for(replies.get(), timeout=0.1)
+            except TimeoutError:
+                continue
+            pending -= 1
+            yield reply
+        await reader
+
+
+async def serve(
+    port: int, service: StandInControlService
+) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    control_pb2_grpc.add_ControlServiceServicer_to_server(service, server)
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+async def bench(port: int, batches: int, actions: int) -> None:
+    from tongsim.connection.grpc import ActionBatch, ControlStream, GrpcConnection
+    from tongsim.math import Vector3
+
+    actor = "00000000-0000-0000-0000-000000000001"
+    async with (
+        GrpcConnection(f"127.0.0.1:{port}") as conn,
+        ControlStream(conn) as ctl,
+    ):
+        start = time.perf_counter()
+        for _ in range(batches):
+            batch = ActionBatch()
+            for _ in range(actions):
+                batch.move(actor, Vector3(100, 0, 0))
+            await ctl.request(batch)
+        elapsed = time.perf_counter() - start
+        print(
+            f"[Info] {batches} batches x {actions} actions: "
+            f"{elapsed / batches * 1e6:.1f} us/batch ({batches / elapsed:.0f} Hz)"
+        )
+        print(f"[Info] stream stats: {ctl.stats()}")
+
+
+async def check_timeouts(port: int, service: StandInControlService) -> None:
+    from tongsim.connection.grpc import ActionBatch, ControlStream, GrpcConnection
+    from tongsim.math import Vector3
+
+    actor = "00000000-0000-0000-0000-000000000001"
+    batch = ActionBatch().move(actor, Vector3(100, 0, 0))
+    async with (
+        GrpcConnection(f"127.0.0.1:{port}") as conn,
+        ControlStream(conn, max_in_flight=8, result_queue_size=64) as ctl,
+    ):
+        # Late answers: more than the result queue holds.
+        service.latency_s = 0.02
+        for _ in range(100):
+            with contextlib.suppress(TimeoutError):
+                await ctl.request(batch, timeout=0.001)
+                raise AssertionError("request should have timed out")
+        # No answers at all: more than the window holds.
+        await asyncio.sleep(0.1)
+        service.silent = True
+        for _ in range(20):
+            with contextlib.suppress(TimeoutError):
+                await ctl.request(batch, timeout=0.005)
+        service.silent = False
+        service.latency_s = 0.0
+        results = await ctl.request(batch, timeout=2.0)
+        assert results[0]["success"], results
+        stats = ctl.stats()
+        print(f"[Info] stream stats: {stats}")
+        assert stats["queued"] == 0 and stats["in_flight"] == 0, stats
+        assert stats["abandoned"] == 120 and stats["late_dropped"] >= 64, stats
+    print("[Info] request() still completes after 120 timeouts")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--reorder", action="store_true", help="Answer out of order.")
+    parser.add_argument(
+        "--bench", type=int, default=0, help="Run N request/response batches and exit."
+    )
+    parser.add_argument("--actions", type=int, default=16, help="Actions per batch.")
+    parser.add_argument(
+        "--check-timeouts",
+        action="store_true",
+        help="Verify requests survive timed-out and unanswered batches, then exit.",
+    )
+    args = parser.parse_args()
+
+    service = StandInControlService(args.latency_ms / 1000.0, args.reorder)
+    server, port = await serve(args.port, service)
+    print(f"[Info] ControlService stand-in listening on 127.0.0.1:{port}")
+    if args.check_timeouts:
+        await check_timeouts(port, service)
+        await server.stop(grace=1.0)
+        return
+    if args.bench:
+        await bench(port, args.bench, args.actions)
+        await server.stop(grace=1.0)
+        return
+    await server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 import os
+import re
 import subprocess
 import sys
 
@@ -8,6 +9,9 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROTO_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "protobuf"))
 OUTPUT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "src"))
 BLACKLIST_DIRS = ["demo"]
+REGISTRY_MODULE = "_stub_registry.py"
+
+_SERVICE_RE = re.compile(r"^\s*service\s+(\w+)", re.MULTILINE)
 
 
 def is_blacklisted(path: str) -> bool:
@@ -61,6 +65,43 @@ def generate_pb(proto_file: str):
     ensure_init_packages(relevant_path)
 
 
+def find_services(proto_file: str) -> list[tuple[str, str]]:
+    """Return ``(module, stub class)`` pairs for every service in ``proto_file``."""
+    with open(proto_file, encoding="utf-8-sig") as f:
+        source = f.read()
+    base = os.path.splitext(os.path.relpath(proto_file, PROTO_DIR))[0]
+    module = base.replace(os.sep, ".") + "_pb2_grpc"
+    return [(module, f"{name}Stub") for name in _SERVICE_RE.findall(source)]
+
+
+def write_stub_registry(proto_files: list[str]):
+    """
+    Emit a static stub registry next to the generated code so the SDK can
+    resolve stubs without walking and importing every ``*_pb2_grpc`` module.
+    """
+    entries = sorted(
+        (stub, module) for f in proto_files for module, stub in find_services(f)
+    )
+    packages = {module.split(".")[0] for _, module in entries}
+    for package in packages:
+        lines = [
+            "# Auto-generated by scripts/generate_pb2.py. Do not edit.",
+            '"""Static registry of the gRPC service stubs in this package."""',
+            "",
+            "STUBS: dict[str, str] = {",
+        ]
+        lines += [
+            f'    "{stub}": "{module}",'
+            for stub, module in entries
+            if module.split(".")[0] == package
+        ]
+        lines.append("}")
+        path = os.path.join(OUTPUT_DIR, package, REGISTRY_MODULE)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"[Info]  Wrote stub registry {path}")
+
+
 def main():
     if not os.path.exists(PROTO_DIR):
         print(f"[Error] Proto directory not found: {PROTO_DIR}")
@@ -76,6 +117,8 @@ def main():
     for proto_file in proto_files:
         generate_pb(proto_file)
 
+    write_stub_registry(proto_files)
+
     print("[Info] gRPC Python code generation complete.")
 
 
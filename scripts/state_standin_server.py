@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+"""
+Local stand-in for ``DemoRLService`` state queries with deltas.
+
+Simulates a scene of static props plus a few moving agents spread over
+several arenas, without a running UE instance, and serves ``QueryState``,
+``QueryStateDelta`` and ``StreamStateDelta`` so ``WorldStateMirror`` can be
+exercised and benchmarked against full snapshots, plus the per-actor reads
+(``GetActorTransform`` / ``GetActorState`` and their ``BatchGet*`` forms)
+behind the read coalescer:
+
+- every tick (``--tick-ms``) moves the agents and bumps the state version
+- every tenth tick one prop is destroyed and another spawned
+- deltas older than ``--history`` versions are answered with a full snapshot
+- ``--no-batch`` answers the ``BatchGet*`` RPCs with ``UNIMPLEMENTED``
+
+Usage:
+    uv run python scripts/state_standin_server.py --port 5729 --props 5000
+    uv run python scripts/state_standin_server.py --props 5000 --bench 200
+    uv run python scripts/state_standin_server.py --check-reads
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import grpc
+
+from tongsim_lite_protobuf import common_pb2, demo_rl_pb2, demo_rl_pb2_grpc, object_pb2
+
+
+class Scene:
+    def __init__(self, props: int, agents: int, arenas: int, history: int):
+        self.version = 1
+        self.tick = 0
+        self.history = history
+        self.states: dict[bytes, demo_rl_pb2.ActorState] = {}
+        self.arena_of: dict[bytes, bytes] = {}
+        self.changed_at: dict[bytes, int] = {}
+        self.removed: list[tuple[int, bytes]] = []
+        self.arenas = [uuid.uuid4().bytes_le for _ in range(arenas)]
+        self.agents = [self.spawn("agent") for _ in range(agents)]
+        for _ in range(props):
+            self.spawn("prop")
+        self.advanced = asyncio.Condition()
+
+    def spawn(self, tag: str) -> bytes:
+        guid = uuid.uuid4().bytes_le
+        state = demo_rl_pb2.ActorState(tag=tag)
+        state.object_info.id.guid = guid
+        state.object_info.name = f"{tag}_{len(self.states)}"
+        state.object_info.class_path = f"/Game/StandIn/BP_{tag.title()}"
+        state.location.x = random.uniform(-5000, 5000)
+        state.location.y = random.uniform(-5000, 5000)
+        state.unit_forward_vector.x = 1.0
+        state.unit_right_vector.y = 1.0
+        self.states[guid] = state
+        self.arena_of[guid] = random.choice(self.arenas)
+        self.changed_at[guid] = self.version
+        return guid
+
+    async def step(self) -> None:
+        async with self.advanced:
+            self.version += 1
+            self.tick += 1
+            for guid in self.agents:
+                state = self.states[guid]
+                state.location.x += random.uniform(-10, 10)
+                state.location.y += random.uniform(-10, 10)
+                state.current_speed = 100.0
+                self.changed_at[guid] = self.version
+            if self.tick % 10 == 0:
+                props = [g for g, s in self.states.items() if s.tag == "prop"]
+                if props:
+                    gone = random.choice(props)
+                    del self.states[gone], self.arena_of[gone], self.changed_at[gone]
+                    self.removed.append((self.version, gone))
+                self.spawn("prop")
+            horizon = self.version - self.history
+            self.removed = [(v, g) for v, g in self.removed if v > horizon]
+            self.advanced.notify_all()
+
+    def delta(self, since: int, tags: set[str]) -> demo_rl_pb2.StateDelta:
+        full = since <= 0 or since < self.version - self.history
+        out = demo_rl_pb2.StateDelta(version=self.version, tick=self.tick, full=full)
+        for guid, state in self.states.items():
+            if (full or self.changed_at[guid] > since) and (
+                not tags or state.tag in tags
+            ):
+                out.changed.append(state)
+                out.changed_arena_ids.add(guid=self.arena_of[guid])
+        if not full:
+            out.removed.extend(
+                object_pb2.ObjectId(guid=g) for v, g in self.removed if v > since
+            )
+        return out
+
+
+class StandInStateService(demo_rl_pb2_grpc.DemoRLServiceServicer):
+    def __init__(self, scene: Scene, batch: bool = True):
+        self._scene = scene
+        self.batch = batch
+        self.calls: dict[str, int] = {}
+
+    def _count(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _transform(self, state: demo_rl_pb2.ActorState) -> common_pb2.Transform:
+        return common_pb2.Transform(
+            location=state.location, scale=common_pb2.Vector3f(x=1, y=1, z=1)
+        )
+
+    async def _batch_allowed(self, context) -> None:
+        if not self.batch:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, "batch reads disabled")
+
+    async def GetActorTransform(self, request, context):  # noqa: N802
+        self._count("GetActorTransform")
+        state = self._scene.states.get(request.actor_id.guid)
+        if state is None or state.destroyed:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "actor not found")
+        return demo_rl_pb2.GetActorTransformResponse(transform=self._transform(state))
+
+    async def BatchGetActorTransforms(self, request, context):  # noqa: N802
+        self._count("BatchGetActorTransforms")
+        await self._batch_allowed(context)
+        out = demo_rl_pb2.BatchGetActorTransformsResponse()
+        for actor_id in request.actor_ids:
+            state = self._scene.states.get(actor_id.guid)
+            if state is None or state.destroyed:
+                out.results.add(found=False)
+            else:
+                out.results.add(found=True, transform=self._transform(state))
+        return out
+
+    async def GetActorState(self, request, context):  # noqa: N802
+        self._count("GetActorState")
+        state = self._scene.states.get(request.actor_id.guid)
+        if state is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "actor not found")
+        return demo_rl_pb2.GetActorStateResponse(actor_state=state)
+
+    async def BatchGetActorStates(self, request, context):  # noqa: N802
+        self._count("BatchGetActorStates")
+        await self._batch_allowed(context)
+        out = demo_rl_pb2.BatchGetActorStatesResponse()
+        for actor_id in request.actor_ids:
+            state = self._scene.states.get(actor_id.guid)
+            # Actors pending destruction are still found, with ``destroyed`` set.
+            if state is None:
+                out.results.add(found=False)
+            else:
+                out.results.add(found=True, actor_state=state)
+        return out
+
+    async def QueryState(self, request, context):  # noqa: N802
+        return demo_rl_pb2.DemoRLState(actor_states=list(self._scene.states.values()))
+
+    async def QueryStateDelta(self, request, context):  # noqa: N802
+        return self._scene.delta(request.since_version, set(request.tags))
+
+    async def StreamStateDelta(self, request, context):  # noqa: N802
+        since, tags = request.since_version, set(request.tags)
+        while True:
+            async with self._scene.advanced:
+                await self._scene.advanced.wait_for(
+                    lambda since=since: self._scene.version > since
+                )
+                delta = self._scene.delta(since, tags)
+            since = delta.version
+            yield delta
+
+
+async def serve(port: int, service: StandInStateService) -> tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server()
+    demo_rl_pb2_grpc.add_DemoRLServiceServicer_to_server(service, server)
+    bound = server.add_insecure_port(f"127.0.0.1:{port}")
+    await server.start()
+    return server, bound
+
+
+async def bench(port: int, scene: Scene, steps: int) -> None:
+    from tongsim.connection.grpc import GrpcConnection, UnaryAPI, WorldStateMirror
+
+    async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+        mirror = WorldStateMirror(conn)
+        await mirror.refresh()
+
+        full_s = delta_s = 0.0
+        for _ in range(steps):
+            await scene.step()
+            start = time.perf_counter()
+            await UnaryAPI.query_info_table(conn)
+            full_s += time.perf_counter() - start
+            start = time.perf_counter()
+            await mirror.refresh()
+            delta_s += time.perf_counter() - start
+
+        assert len(mirror) == len(scene.states)
+        print(
+            f"[Info] {len(scene.states)} actors, {steps} steps: "
+            f"full snapshot {full_s / steps * 1e3:.2f} ms/step, "
+            f"delta {delta_s / steps * 1e3:.2f} ms/step"
+        )
+        print(f"[Info] mirror stats: {mirror.stats()}")
+
+
+async def check_reads(port: int, scene: Scene, service: StandInStateService) -> None:
+    """Gather per-agent reads through the coalescer, batched and unbatched."""
+    from tongsim.connection.grpc import GrpcConnection, UnaryAPI
+
+    ids = [{"guid": g} for g in scene.agents]
+    # One agent pending destruction, one that never existed.
+    scene.states[scene.agents[0]].destroyed = True
+    ids.append({"guid": uuid.uuid4().bytes_le})
+
+    for batch in (True, False):
+        service.batch = batch
+        service.calls.clear()
+        async with GrpcConnection(f"127.0.0.1:{port}") as conn:
+            states, transforms = await asyncio.gather(
+                asyncio.gather(*(UnaryAPI.get_actor_state(conn, i) for i in ids)),
+                asyncio.gather(*(UnaryAPI.get_actor_transform(conn, i) for i in ids)),
+            )
+        # Actors pending destruction still read, with ``destroyed`` set.
+        assert states[0] is not None and states[0]["destroyed"], states[0]
+        assert states[-1] is None and transforms[-1] is None
+        assert transforms[0] is None
+        assert all(s is not None and not s["destroyed"] for s in states[1:-1])
+        assert all(t is not None for t in transforms[1:-1])
+        assert "QueryState" not in service.calls, service.calls
+        if batch:
+            assert service.calls == {
+                "BatchGetActorStates": 1,
+                "BatchGetActorTransforms": 1,
+            }, service.calls
+        print(f"[Info] {len(ids)} reads each, batch={batch}: {service.calls}")
+    print("[Info] coalesced reads OK")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+    parser.add_argument("--props", type=int, default=5000)
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--arenas", type=int, default=4)
+    parser.add_argument("--history", type=int, default=600)
+    parser.add_argument("--tick-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--bench", type=int, default=0, help="Compare N snapshot/delta steps and exit."
+    )
+    parser.add_argument(
+        "--no-batch", action="store_true", help="Reject the BatchGet* RPCs."
+    )
+    parser.add_argument(
+        "--check-reads", action="store_true", help="Run the read check and exit."
+    )
+    args = parser.parse_args()
+
+    scene = Scene(args.props, args.agents, args.arenas, args.history)
+    service = StandInStateService(scene, batch=not args.no_batch)
+    server, port = await serve(args.port, service)
+    print(f"[Info] state stand-in listening on 127.0.0.1:{port}")
+    if args.check_reads:
+        await check_reads(port, scene, service)
+        await server.stop(grace=1.0)
+        return
+    if args.bench:
+        await bench(port, scene, args.bench)
+        await server.stop(grace=1.0)
+        return
+    while True:
+        await asyncio.sleep(args.tick_ms / 1000.0)
+        await scene.step()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,14 +12,20 @@ __version__ = VERSION
 
 __all__ = (
     "AABB",
+    "ActorId",
+    "AsyncTongSim",
     "CaptureAPI",
+    "CaptureFrame",
     "Pose",
     "Quaternion",
+    "RpcPolicy",
     "TongSim",
+    "TongSimCluster",
     "Transform",
     "UnaryAPI",
     "Vector3",
     "__version__",
+    "deadline",
     "get_version_info",
     "initialize_logger",
     "math",
@@ -29,7 +35,16 @@ __all__ = (
 if typing.TYPE_CHECKING:
     # Imported for IDE completion and type checking
     from . import math
-    from .connection.grpc import CaptureAPI, UnaryAPI
+    from .async_tongsim import AsyncTongSim
+    from .cluster import TongSimCluster
+    from .connection.grpc import (
+        ActorId,
+        CaptureAPI,
+        CaptureFrame,
+        RpcPolicy,
+        UnaryAPI,
+        deadline,
+    )
     from .logger import initialize_logger, set_log_level
     from .math.geometry import AABB, Pose, Quaternion, Transform, Vector3
     from .tongsim import TongSim
@@ -46,12 +61,18 @@ _dynamic_imports: dict[str, tuple[str, str]] = {
     "math": (__spec__.parent, "."),
     # Core
     "TongSim": (__spec__.parent, ".tongsim"),
+    "TongSimCluster": (__spec__.parent, ".cluster"),
+    "AsyncTongSim": (__spec__.parent, ".async_tongsim"),
     # Logger
     "initialize_logger": (__spec__.parent, ".logger"),
     "set_log_level": (__spec__.parent, ".logger"),
     # gRPC
     "CaptureAPI": (__spec__.parent, ".connection.grpc"),
+    "CaptureFrame": (__spec__.parent, ".connection.grpc"),
     "UnaryAPI": (__spec__.parent, ".connection.grpc"),
+    "RpcPolicy": (__spec__.parent, ".connection.grpc"),
+    "deadline": (__spec__.parent, ".connection.grpc"),
+    "ActorId": (__spec__.parent, ".connection.grpc"),
     # Version
     "get_version_info": (__spec__.parent, ".version"),
 }
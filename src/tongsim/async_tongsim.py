@@ -0,0 +1,178 @@
+"""
+tongsim.async_tongsim
+
+asyncio facade for a single TongSim UE instance. Unlike ``TongSim`` it owns
+no background loop: the gRPC connection is bound to the event loop of the
+caller, so awaiting an RPC involves no cross-thread hop.
+"""
+
+import asyncio
+import functools
+from collections.abc import Callable
+from typing import Any, Literal
+
+from tongsim.connection.grpc import (
+    CaptureAPI,
+    GrpcConnection,
+    RpcPolicy,
+    UnaryAPI,
+    render_metrics,
+)
+from tongsim.logger import get_logger
+
+__all__ = ["AsyncTongSim"]
+
+_logger = get_logger("world")
+
+
+class _BoundAPI:
+    """
+    ``UnaryAPI`` / ``CaptureAPI`` with the connection argument pre-bound.
+
+    ``bound.get_actor_transform(actor_id)`` is
+    ``UnaryAPI.get_actor_transform(conn, actor_id)``.
+    """
+
+    __slots__ = ("_api", "_conn", "_methods")
+
+    def __init__(self, api: type, conn: GrpcConnection):
+        self._api = api
+        self._conn = conn
+        self._methods: dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = self._methods.get(name)
+        if method is None:
+            if name.startswith("_"):
+                raise AttributeError(name)
+            method = functools.partial(getattr(self._api, name), self._conn)
+            self._methods[name] = method
+        return method
+
+    def __dir__(self) -> list[str]:
+        return [name for name in dir(self._api) if not name.startswith("_")]
+
+
+class AsyncTongSim:
+    """
+    asyncio entry point for controlling a connected TongSim UE instance.
+
+    Use it from code that already runs an event loop (rollout servers,
+    async environments): every call is a coroutine awaited on that loop.
+    Synchronous scripts should keep using ``TongSim``.
+
+    Example::
+
+        async with AsyncTongSim("127.0.0.1:5726") as sim:
+            actors = await sim.unary.query_info()
+            await sim.unary.set_actor_transform(actor_id, transform)
+            frame = await sim.capture.capture_snapshot(camera_id)
+
+    The connection belongs to the loop that entered the context (or called
+    ``connect``) and must not be used from another loop.
+    """
+
+    def __init__(
+        self,
+        grpc_endpoint: str = "127.0.0.1:5726",
+        channel_pool_size: int = 1,
+        rpc_policy: RpcPolicy | None = None,
+        connect_timeout: float = 0.0,
+    ):
+        """
+        Args:
+            grpc_endpoint (str): gRPC endpoint of the UE server, for example
+                "localhost:5726".
+            channel_pool_size (int): Number of gRPC channels to open.
+            rpc_policy (RpcPolicy | None): Retry/hedge/circuit-breaker policy
+                for unary RPCs; ``None`` uses the defaults.
+            connect_timeout (float): Seconds ``connect`` waits for the
+                channels to become ready; ``0`` (default) starts connecting
+                without waiting.
+        """
+        self._endpoint = grpc_endpoint
+        self._channel_pool_size = channel_pool_size
+        self._rpc_policy = rpc_policy
+        self._connect_timeout = connect_timeout
+        self._conn: GrpcConnection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._unary: _BoundAPI | None = None
+        self._capture: _BoundAPI | None = None
+
+    async def connect(self) -> "AsyncTongSim":
+        """
+        Open the connection on the running loop (idempotent).
+
+        Returns:
+            AsyncTongSim: ``self``, for chaining.
+        """
+        if self._conn is not None:
+            return self
+        self._loop = asyncio.get_running_loop()
+        conn = GrpcConnection(
+            self._endpoint, pool_size=self._channel_pool_size, policy=self._rpc_policy
+        )
+        # GrpcConnection.connect already warns when the server is not ready.
+        await conn.connect(timeout=self._connect_timeout)
+        self._conn = conn
+        self._unary = _BoundAPI(UnaryAPI, conn)
+        self._capture = _BoundAPI(CaptureAPI, conn)
+        return self
+
+    def _require(self) -> GrpcConnection:
+        if self._conn is None:
+            raise RuntimeError(
+                "[AsyncTongSim] not connected; use `async with` or `await connect()`."
+            )
+        return self._conn
+
+    @property
+    def conn(self) -> GrpcConnection:
+        """Underlying gRPC connection (for calling ``UnaryAPI`` directly)."""
+        return self._require()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """Event loop the connection is bound to (``None`` before ``connect``)."""
+        return self._loop
+
+    @property
+    def unary(self) -> Any:
+        """``UnaryAPI`` bound to this connection: ``await sim.unary.query_info()``."""
+        self._require()
+        return self._unary
+
+    @property
+    def capture(self) -> Any:
+        """``CaptureAPI`` bound to this connection."""
+        self._require()
+        return self._capture
+
+    def metrics(self) -> dict[str, Any]:
+        """Client-side RPC metrics of the connection (see ``GrpcConnection.metrics``)."""
+        return self._require().metrics()
+
+    def dump_metrics(self, fmt: Literal["prometheus", "json"] = "prometheus") -> str:
+        """
+        Render ``metrics()`` as Prometheus text exposition or as JSON.
+
+        Args:
+            fmt (str): ``"prometheus"`` or ``"json"``.
+
+        Returns:
+            str: Serialised metrics.
+        """
+        return render_metrics(self.metrics(), fmt)
+
+    async def aclose(self) -> None:
+        """Close the connection; safe to call more than once."""
+        conn, self._conn = self._conn, None
+        self._unary = self._capture = None
+        if conn is not None:
+            await conn.aclose()
+
+    async def __aenter__(self) -> "AsyncTongSim":
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
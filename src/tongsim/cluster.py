@@ -0,0 +1,438 @@
+"""
+tongsim.cluster
+
+Python facade spanning several TongSim UE instances. Each endpoint gets its
+own WorldContext; arenas are placed on the least-loaded instance and calls
+for an arena are routed to the instance that owns it.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from concurrent.futures import Future
+from typing import Any, Final
+
+import grpc.aio
+
+from tongsim.connection.grpc import GrpcConnection, UnaryAPI
+from tongsim.core.world_context import WorldContext
+from tongsim.logger import get_logger
+from tongsim.math import Transform
+
+__all__ = ["TongSimCluster"]
+
+_logger = get_logger("cluster")
+
+_LATENCY_EWMA_ALPHA: Final[float] = 0.2
+
+
+async def _list_arenas(conn: GrpcConnection) -> list[dict] | None:
+    """``list_arenas``, but ``None`` on failure instead of an empty instance."""
+    try:
+        # The undecorated coroutine raises where the wrapper returns ``[]``.
+        return await UnaryAPI.list_arenas.__wrapped__(conn)
+    except grpc.aio.AioRpcError as e:
+        _logger.debug(f"[TongSimCluster] list_arenas failed: {e.code().name}")
+        return None
+
+
+class _EndpointState:
+    """Load bookkeeping for one UE instance of the cluster."""
+
+    __slots__ = (
+        "arenas",
+        "calls",
+        "context",
+        "endpoint",
+        "errors",
+        "healthy",
+        "latency_s",
+        "lock",
+        "num_actors",
+    )
+
+    def __init__(self, endpoint: str, context: WorldContext):
+        self.endpoint = endpoint
+        self.context = context
+        self.arenas: set[str] = set()
+        self.num_actors: int = 0
+        self.latency_s: float = 0.0  # EWMA of routed call latency.
+        self.calls: int = 0
+        self.errors: int = 0
+        self.healthy: bool = True  # Whether the last load refresh succeeded.
+        self.lock = threading.Lock()
+
+    def observe(self, elapsed_s: float, failed: bool) -> None:
+        with self.lock:
+            self.calls += 1
+            if failed:
+                # Fast failures say nothing about the instance's latency.
+                self.errors += 1
+            elif self.latency_s == 0.0:
+                self.latency_s = elapsed_s
+            else:
+                self.latency_s += _LATENCY_EWMA_ALPHA * (elapsed_s - self.latency_s)
+
+
+class TongSimCluster:
+    """
+    Session manager over several UE server processes.
+
+    - One ``WorldContext`` (loop thread + gRPC connection) per endpoint.
+    - ``load_arena`` places new arenas on the instance with the lowest load
+      score: reported ``num_actors`` plus observed RPC latency. Instances whose
+      last ``refresh_load`` failed are skipped.
+    - ``call`` / ``call_many`` route ``UnaryAPI`` coroutines for an arena (or
+      for an actor spawned through the cluster) to the owning instance.
+    - ``stats`` reports per-instance load and aggregate throughput.
+
+    All methods are synchronous and blocking, like ``TongSim``.
+    """
+
+    def __init__(
+        self,
+        grpc_endpoints: Sequence[str],
+        channel_pool_size: int = 1,
+        latency_weight: float = 1.0,
+    ):
+        """
+        Create one runtime binding per endpoint.
+
+        Args:
+            grpc_endpoints (Sequence[str]): gRPC endpoints of the UE servers,
+                for example ``["127.0.0.1:5726", "127.0.0.1:5727"]``.
+            channel_pool_size (int): Channels opened per endpoint.
+            latency_weight (float): Actors-equivalent cost of one millisecond
+                of observed call latency in the placement score.
+        """
+        if not grpc_endpoints:
+            raise ValueError("TongSimCluster requires at least one endpoint.")
+        if len(set(grpc_endpoints)) != len(grpc_endpoints):
+            raise ValueError(f"Duplicate endpoints in {list(grpc_endpoints)}.")
+
+        self._latency_weight = latency_weight
+        self._states: Final[list[_EndpointState]] = []
+        try:
+            for endpoint in grpc_endpoints:
+                context = WorldContext(endpoint, channel_pool_size=channel_pool_size)
+                self._states.append(_EndpointState(endpoint, context))
+        except Exception:
+            self.close()
+            raise
+
+        self._owners: dict[str, _EndpointState] = {}  # arena/actor id -> owner
+        self._owners_lock = threading.Lock()
+        self._steps: int = 0
+        self._steps_lock = threading.Lock()
+        self._last_stats: tuple[float, int, int] = (time.perf_counter(), 0, 0)
+        self._closed = False
+
+    # ---------------------------
+    # Topology
+    # ---------------------------
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoints managed by this cluster, in construction order."""
+        return [s.endpoint for s in self._states]
+
+    @property
+    def contexts(self) -> list[WorldContext]:
+        """WorldContext per endpoint, in construction order."""
+        return [s.context for s in self._states]
+
+    def context_for(self, arena_or_actor_id: str) -> WorldContext:
+        """
+        Return the WorldContext owning an arena (or an actor spawned through
+        ``spawn_actor_in_arena``).
+
+        Raises:
+            KeyError: If the id is unknown to the cluster.
+        """
+        return self._owner(arena_or_actor_id).context
+
+    def arenas(self) -> dict[str, str]:
+        """Return ``{arena_id: endpoint}`` for every arena known to the cluster."""
+        return {
+            arena_id: state.endpoint
+            for state in self._states
+            for arena_id in state.arenas
+        }
+
+    def _owner(self, key: str) -> _EndpointState:
+        with self._owners_lock:
+            state = self._owners.get(key)
+        if state is None:
+            raise KeyError(f"[TongSimCluster] unknown arena or actor id: {key}")
+        return state
+
+    def _claim(self, key: str, state: _EndpointState) -> None:
+        with self._owners_lock:
+            self._owners[key] = state
+
+    def _score(self, state: _EndpointState) -> float:
+        if not state.healthy:
+            return math.inf
+        return state.num_actors + self._latency_weight * state.latency_s * 1000.0
+
+    def refresh_load(self) -> dict[str, int]:
+        """
+        Query ``list_arenas`` on every instance concurrently and update the
+        per-instance actor counts and arena ownership.
+
+        An instance that cannot be queried (unreachable, timed out, circuit
+        breaker open) is marked unhealthy and keeps its previous counts; it is
+        counted in ``errors`` and skipped by ``load_arena`` until a later
+        refresh succeeds.
+
+        Returns:
+            dict[str, int]: Total ``num_actors`` per endpoint.
+        """
+        futures = [self._submit(state, _list_arenas) for state in self._states]
+        for state, future in zip(self._states, futures, strict=True):
+            arenas = future.result()
+            if arenas is None:
+                if state.healthy:
+                    _logger.warning(
+                        f"[TongSimCluster] {state.endpoint} unavailable; "
+                        "skipped by placement until it answers again."
+                    )
+                state.healthy = False
+                continue
+            state.healthy = True
+            state.num_actors = sum(a["num_actors"] for a in arenas)
+            for a in arenas:
+                state.arenas.add(a["id"])
+                self._claim(a["id"], state)
+        return {s.endpoint: s.num_actors for s in self._states}
+
+    # ---------------------------
+    # Routing
+    # ---------------------------
+
+    async def _timed(self, state: _EndpointState, coro: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await coro
+            failed = result is None or result is False
+            return result
+        finally:
+            state.observe(time.perf_counter() - start, failed)
+
+    def _submit(
+        self,
+        state: _EndpointState,
+        fn: Callable[[GrpcConnection], Awaitable[Any]],
+    ) -> Future[Any]:
+        return state.context.async_task(
+            self._timed(state, fn(state.context.conn)),
+            name=f"[TongSimCluster {state.endpoint}] routed call",
+        )
+
+    def call(
+        self,
+        arena_or_actor_id: str,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run ``fn(conn, *args, **kwargs)`` on the instance owning the id and
+        wait for the result.
+
+        Example::
+
+            cluster.call(arena_id, UnaryAPI.reset_arena, arena_id)
+            cluster.call(agent_id, UnaryAPI.get_actor_transform, agent_id)
+
+        Args:
+            arena_or_actor_id (str): Arena id, or an actor id returned by
+                ``spawn_actor_in_arena``; only used for routing.
+            fn (Callable[..., Awaitable]): Async API taking the connection as
+                its first argument, typically a ``UnaryAPI`` method.
+            timeout (float | None): Optional wait timeout in seconds.
+
+        Returns:
+            Any: Whatever ``fn`` returns.
+        """
+        state = self._owner(arena_or_actor_id)
+        return self._submit(state, lambda conn: fn(conn, *args, **kwargs)).result(
+            timeout=timeout
+        )
+
+    def call_many(
+        self,
+        calls: Iterable[tuple[str, Callable[[GrpcConnection], Awaitable[Any]]]],
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """
+        Route several calls at once; calls on different instances run in
+        parallel and results come back in input order.
+
+        Example::
+
+            cluster.call_many(
+                (aid, lambda conn, aid=aid: UnaryAPI.reset_arena(conn, aid))
+                for aid in arena_ids
+            )
+
+        Args:
+            calls: ``(arena_or_actor_id, fn(conn) -> Awaitable)`` pairs.
+            timeout (float | None): Optional timeout for each result.
+
+        Returns:
+            list[Any]: Ordered results.
+        """
+        futures = [self._submit(self._owner(key), fn) for key, fn in calls]
+        return [f.result(timeout=timeout) for f in futures]
+
+    # ---------------------------
+    # Arena lifecycle
+    # ---------------------------
+
+    def load_arena(
+        self,
+        level_asset_path: str,
+        anchor: Transform,
+        make_visible: bool = True,
+        endpoint: str | None = None,
+        refresh: bool = True,
+    ) -> str:
+        """
+        Load an arena on the least-loaded instance (or on ``endpoint``).
+
+        Args:
+            level_asset_path (str): Level asset to stream in.
+            anchor (Transform): Arena anchor in the target instance's world.
+            make_visible (bool): Initial visibility.
+            endpoint (str | None): Force placement on this endpoint.
+            refresh (bool): Re-query ``list_arenas`` before choosing.
+
+        Returns:
+            str: Arena GUID string, or ``""`` on failure (including when no
+                instance is healthy).
+        """
+        if endpoint is not None:
+            state = next((s for s in self._states if s.endpoint == endpoint), None)
+            if state is None:
+                raise ValueError(f"[TongSimCluster] unknown endpoint: {endpoint}")
+        else:
+            if refresh:
+                self.refresh_load()
+            state = min(self._states, key=self._score)
+            if not state.healthy:
+                _logger.error("[TongSimCluster] no healthy instance to place on.")
+                return ""
+
+        arena_id = self._submit(
+            state,
+            lambda conn: UnaryAPI.load_arena(
+                conn, level_asset_path, anchor, make_visible=make_visible
+            ),
+        ).result()
+        if arena_id:
+            state.arenas.add(arena_id)
+            self._claim(arena_id, state)
+            _logger.debug(f"[TongSimCluster] arena {arena_id} -> {state.endpoint}")
+        return arena_id
+
+    def destroy_arena(self, arena_id: str) -> bool:
+        """Destroy an arena on its owning instance and forget its routes."""
+        state = self._owner(arena_id)
+        ok = self.call(arena_id, UnaryAPI.destroy_arena, arena_id)
+        if ok:
+            state.arenas.discard(arena_id)
+            with self._owners_lock:
+                self._owners.pop(arena_id, None)
+        return ok
+
+    def spawn_actor_in_arena(
+        self, arena_id: str, class_path: str, local_transform: Transform
+    ) -> dict | None:
+        """
+        Spawn an actor in an arena and register the actor id for routing.
+
+        Returns:
+            dict | None: Dictionary with ``id``, ``name`` and ``class_path``.
+        """
+        state = self._owner(arena_id)
+        spawned = self.call(
+            arena_id,
+            UnaryAPI.spawn_actor_in_arena,
+            arena_id,
+            class_path,
+            local_transform,
+        )
+        if spawned:
+            self._claim(spawned["id"], state)
+            state.num_actors += 1
+        return spawned
+
+    # ---------------------------
+    # Throughput
+    # ---------------------------
+
+    def mark_step(self, count: int = 1) -> None:
+        """Record ``count`` completed environment steps for throughput stats."""
+        with self._steps_lock:
+            self._steps += count
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot per-instance load and aggregate throughput.
+
+        Rates are averaged over the interval since the previous ``stats`` call
+        (or since construction).
+
+        Returns:
+            dict: ``endpoints`` (per-endpoint ``arenas``, ``num_actors``,
+                ``latency_ms``, ``calls``, ``errors``, ``healthy``) plus
+                aggregate ``steps``, ``steps_per_sec`` and ``calls_per_sec``.
+        """
+        now = time.perf_counter()
+        with self._steps_lock:
+            steps = self._steps
+        calls = sum(s.calls for s in self._states)
+        last_t, last_steps, last_calls = self._last_stats
+        self._last_stats = (now, steps, calls)
+        dt = max(now - last_t, 1e-9)
+
+        return {
+            "endpoints": {
+                s.endpoint: {
+                    "arenas": len(s.arenas),
+                    "num_actors": s.num_actors,
+                    "latency_ms": s.latency_s * 1000.0,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "healthy": s.healthy,
+                }
+                for s in self._states
+            },
+            "steps": steps,
+            "steps_per_sec": (steps - last_steps) / dt,
+            "calls_per_sec": (calls - last_calls) / dt,
+        }
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+
+    def close(self):
+        """Release every WorldContext owned by the cluster."""
+        if getattr(self, "_closed", False):
+            return
+        self._closed = True
+        for state in self._states:
+            state.context.release()
+
+    def __enter__(self):
+        """Support ``with`` statements."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support ``with`` statements."""
+        self.close()
@@ -1,13 +1,82 @@
+from .actor_id import ACTOR_IDS, ActorId, ActorIdRegistry
+from .actor_table import ActorStateTable
 from .bidi_stream import BidiStream, BidiStreamReader, BidiStreamWriter
 from .capture_api import CaptureAPI
+from .capture_batch import FrameSet, FrameSetAssembler
+from .capture_codec import FrameDecoder, decode_exr, decode_jpeg
+from .capture_control import AdaptiveCaptureController, CaptureBounds
+from .capture_frame import CaptureFrame
+from .capture_pool import CameraPool
+from .capture_stream import DropPolicy, FrameStream
+from .coalesce import ActorReadCoalescer, Coalescer
+from .control_stream import ActionBatch, ControlStream
 from .core import GrpcConnection
+from .line_trace import LineTraceHits
+from .metrics import RpcMetrics, render_metrics, to_prometheus
+from .policy import (
+    CircuitBreaker,
+    HedgePolicy,
+    MethodPolicy,
+    RetryPolicy,
+    RpcPolicy,
+    deadline,
+    with_deadline,
+)
+from .pool import ChannelPool, PooledStub, PoolStrategy
+from .spawned import SpawnedActors
+from .transform_array import (
+    array_to_proto_transforms,
+    array_to_transforms,
+    proto_transforms_to_array,
+    transforms_to_array,
+)
 from .unary_api import UnaryAPI
+from .world_mirror import WorldStateMirror
 
 __all__ = [
+    "ACTOR_IDS",
+    "ActionBatch",
+    "ActorId",
+    "ActorIdRegistry",
+    "ActorReadCoalescer",
+    "ActorStateTable",
+    "AdaptiveCaptureController",
     "BidiStream",
     "BidiStreamReader",
     "BidiStreamWriter",
+    "CameraPool",
     "CaptureAPI",
+    "CaptureBounds",
+    "CaptureFrame",
+    "ChannelPool",
+    "CircuitBreaker",
+    "Coalescer",
+    "ControlStream",
+    "DropPolicy",
+    "FrameDecoder",
+    "FrameSet",
+    "FrameSetAssembler",
+    "FrameStream",
     "GrpcConnection",
+    "HedgePolicy",
+    "LineTraceHits",
+    "MethodPolicy",
+    "PoolStrategy",
+    "PooledStub",
+    "RetryPolicy",
+    "RpcMetrics",
+    "RpcPolicy",
+    "SpawnedActors",
     "UnaryAPI",
+    "WorldStateMirror",
+    "array_to_proto_transforms",
+    "array_to_transforms",
+    "deadline",
+    "decode_exr",
+    "decode_jpeg",
+    "proto_transforms_to_array",
+    "render_metrics",
+    "to_prometheus",
+    "transforms_to_array",
+    "with_deadline",
 ]
@@ -0,0 +1,208 @@
+"""
+connection.grpc.actor_id
+
+Interned actor identities.
+
+Every request addresses actors by ``ObjectId`` (16 FGuid bytes) while user
+code mostly holds canonical GUID strings, so each call used to parse the
+string and build a fresh message, and each response formatted the bytes back.
+``ActorIdRegistry`` does that work once per actor: it maps FGuid bytes and
+string spellings to one ``ActorId`` that carries both forms, a cached
+``ObjectId`` message and a small integer handle. The registry is bounded:
+beyond ``max_size`` ids the least recently used one is forgotten.
+
+Exports:
+- ActorId: interned identity of one actor
+- ActorIdRegistry: bidirectional bytes/string/handle index
+- ACTOR_IDS: registry shared by the SDK wrappers
+"""
+
+import contextlib
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from tongsim_lite_protobuf.object_pb2 import ObjectId
+
+__all__ = ["ACTOR_IDS", "ActorId", "ActorIdRegistry"]
+
+
+def _fguid_to_text(guid: bytes) -> str:
+    """
+    Convert Unreal FGuid (16 bytes; first 3 fields little-endian) to canonical
+    GUID string: 8-4-4-4-12 uppercase hex.
+
+    Layout (Windows/MS GUID):
+      Data1[4] LE, Data2[2] LE, Data3[2] LE, Data4[8] BE(as-is)
+    """
+    d1 = guid[0:4][::-1]  # LE -> BE
+    d2 = guid[4:6][::-1]
+    d3 = guid[6:8][::-1]
+    d4 = guid[8:10]  # as-is
+    d5 = guid[10:16]  # as-is
+    return f"{d1.hex()}-{d2.hex()}-{d3.hex()}-{d4.hex()}-{d5.hex()}".upper()
+
+
+def _text_to_fguid(text: str) -> bytes:
+    """
+    Convert canonical GUID string (8-4-4-4-12) to Unreal FGuid bytes
+    with first 3 fields little-endian; ``b""`` when it cannot be parsed.
+    """
+    try:
+        raw = bytes.fromhex(text.replace("-", "").strip())
+    except ValueError:
+        return b""
+    if len(raw) != 16:
+        return b""
+    # raw = [Data1(4) | Data2(2) | Data3(2) | Data4(8)] all BE
+    return raw[0:4][::-1] + raw[4:6][::-1] + raw[6:8][::-1] + raw[8:16]
+
+
+class ActorId:
+    """
+    Interned identity of one actor; obtain instances from an ``ActorIdRegistry``.
+
+    Attributes:
+        guid: FGuid bytes in wire order.
+        text: Canonical uppercase GUID string.
+        handle: Small integer, unique within the registry that created it.
+        object_id: Cached ``ObjectId`` message. Treat it as read-only; it is
+            copied into requests (``CopyFrom`` or constructor arguments).
+    """
+
+    __slots__ = ("guid", "handle", "object_id", "text")
+
+    def __init__(self, guid: bytes, handle: int):
+        self.guid = guid
+        self.text = _fguid_to_text(guid)
+        self.handle = handle
+        self.object_id = ObjectId(guid=guid)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"ActorId({self.text!r}, handle={self.handle})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ActorId):
+            return self.guid == other.guid
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.guid)
+
+
+class ActorIdRegistry:
+    """
+    Bidirectional index of ``ActorId`` by FGuid bytes, string and handle.
+
+    Lookups of known ids are single dictionary hits; only the first sighting
+    of an actor parses or formats its GUID. Beyond ``max_size`` ids the least
+    recently used one is evicted. Handles are never reused, so the handle of
+    an evicted id raises ``KeyError`` in ``from_handle`` instead of naming
+    another actor; interning the id again assigns a new handle.
+    """
+
+    def __init__(self, max_size: int = 1 << 16):
+        """
+        Args:
+            max_size: Ids kept before the least recently used is evicted.
+        """
+        self._max_size = max_size
+        self._by_guid: OrderedDict[bytes, ActorId] = OrderedDict()
+        self._by_text: dict[str, ActorId] = {}
+        self._by_handle: dict[int, ActorId] = {}
+        # Non-canonical spellings seen by ``from_text``, dropped on eviction.
+        self._aliases: dict[bytes, list[str]] = {}
+        self._handles = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_guid)
+
+    def _touch(self, guid: bytes) -> None:
+        # Another thread may have evicted it since the lookup.
+        with contextlib.suppress(KeyError):
+            self._by_guid.move_to_end(guid)
+
+    def _evict(self) -> None:
+        while len(self._by_guid) > self._max_size:
+            guid, old = self._by_guid.popitem(last=False)
+            del self._by_handle[old.handle]
+            self._by_text.pop(old.text, None)
+            for alias in self._aliases.pop(guid, ()):
+                self._by_text.pop(alias, None)
+
+    def from_guid(self, guid: bytes) -> ActorId:
+        """``ActorId`` of 16 FGuid bytes (e.g. ``ObjectId.guid`` of a response)."""
+        found = self._by_guid.get(guid)
+        if found is not None:
+            self._touch(guid)
+            return found
+        if len(guid) != 16:
+            raise ValueError("actor_id must be 16-byte FGuid or canonical GUID string.")
+        with self._lock:
+            found = self._by_guid.get(guid)
+            if found is None:
+                found = ActorId(guid, next(self._handles))
+                self._by_handle[found.handle] = found
+                self._by_guid[guid] = found
+                self._by_text[found.text] = found
+                self._evict()
+        return found
+
+    def from_text(self, text: str) -> ActorId:
+        """``ActorId`` of a GUID string (any case, with or without dashes)."""
+        found = self._by_text.get(text)
+        if found is not None:
+            self._touch(found.guid)
+            return found
+        found = self.from_guid(_text_to_fguid(text))
+        if text != found.text:
+            # Remember this spelling too, so lower-case ids hit the fast path.
+            with self._lock:
+                if self._by_guid.get(found.guid) is found:
+                    self._by_text[text] = found
+                    self._aliases.setdefault(found.guid, []).append(text)
+        return found
+
+    def from_handle(self, handle: int) -> ActorId:
+        """``ActorId`` assigned ``handle``; ``KeyError`` once it was evicted."""
+        return self._by_handle[handle]
+
+    def intern(self, actor_id: Any) -> ActorId:
+        """
+        Resolve any accepted actor id form to its ``ActorId``.
+
+        Args:
+            actor_id: ``ActorId``, FGuid bytes, GUID string or
+                ``{"guid": <bytes|str>}``.
+        """
+        if isinstance(actor_id, ActorId):
+            return actor_id
+        if isinstance(actor_id, str):
+            return self.from_text(actor_id)
+        if isinstance(actor_id, bytes | bytearray):
+            return self.from_guid(bytes(actor_id))
+        if isinstance(actor_id, dict):
+            return self.intern(actor_id.get("guid", b""))
+        raise ValueError("actor_id must be 16-byte FGuid or canonical GUID string.")
+
+    def handles(self, actor_ids: Any) -> NDArray[np.int32]:
+        """Handles of several ids as an ``int32`` array."""
+        return np.fromiter((self.intern(a).handle for a in actor_ids), dtype=np.int32)
+
+    def clear(self) -> None:
+        """Forget every id; ``from_handle`` rejects previously returned handles."""
+        with self._lock:
+            self._by_guid = OrderedDict()
+            self._by_text = {}
+            self._by_handle = {}
+            self._aliases = {}
+
+
+ACTOR_IDS = ActorIdRegistry()
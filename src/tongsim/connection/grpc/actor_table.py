@@ -0,0 +1,270 @@
+"""
+connection.grpc.actor_table
+
+Columnar decoding of ``ActorState`` messages.
+
+``UnaryAPI.query_info`` builds one dictionary with five ``Vector3`` objects
+per actor, which dominates the cost of whole-scene queries. ``ActorStateTable``
+decodes the same messages in a single pass into NumPy columns and only builds
+the dictionary form for rows that are actually looked at.
+
+Exports:
+- ActorStateTable: column-oriented actor states with row views on demand
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from tongsim_lite_protobuf.demo_rl_pb2 import ActorState
+
+from tongsim.math import Vector3
+
+from .actor_id import ACTOR_IDS, ActorId
+
+__all__ = ["ActorStateTable"]
+
+
+def _id_columns(
+    states: Sequence[ActorState],
+) -> tuple[NDArray[np.object_], NDArray[np.int32]]:
+    texts: list[str] = []
+    handles = np.full(len(states), -1, dtype=np.int32)
+    for i, s in enumerate(states):
+        guid = s.object_info.id.guid
+        if len(guid) == 16:
+            actor = ACTOR_IDS.from_guid(guid)
+            texts.append(actor.text)
+            handles[i] = actor.handle
+        else:
+            texts.append(guid.hex().upper())
+    return _object_array(texts), handles
+
+
+def _float_rows(states: Sequence[ActorState]) -> NDArray[np.float32]:
+    # location | forward | right | bbox min | bbox max | speed, one row per actor.
+    return np.array(
+        [
+            (
+                (loc := s.location).x,
+                loc.y,
+                loc.z,
+                (fwd := s.unit_forward_vector).x,
+                fwd.y,
+                fwd.z,
+                (right := s.unit_right_vector).x,
+                right.y,
+                right.z,
+                (lo := s.bounding_box.min_vertex).x,
+                lo.y,
+                lo.z,
+                (hi := s.bounding_box.max_vertex).x,
+                hi.y,
+                hi.z,
+                s.current_speed,
+            )
+            for s in states
+        ],
+        dtype=np.float32,
+    ).reshape(-1, 16)
+
+
+def _object_array(values: Iterable[str]) -> NDArray[np.object_]:
+    values = list(values)
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+class ActorStateTable:
+    """
+    Column-oriented actor states (one row per actor).
+
+    Vector columns are ``(N, 3)`` ``float32`` arrays, the precision used on the
+    wire; string columns are ``object`` arrays. GUID strings come from
+    ``ACTOR_IDS``, so equal ids share one ``str`` across tables, and
+    ``handles`` holds the matching ``ActorId`` handles.
+
+    Indexing with an integer returns the same dictionary ``query_info``
+    produces for that actor; slices, index arrays and boolean masks return a
+    sub-table (NumPy indexing rules apply: slices are views, masks copy).
+
+    Attributes:
+        ids: Canonical GUID strings.
+        handles: ``int32`` ``ActorId`` handles (``-1`` for malformed GUIDs).
+        names / class_paths / tags: Object metadata.
+        location / forward / right: World location and unit basis vectors.
+        bbox_min / bbox_max: World-space bounding box corners.
+        speed: Current speed (``float32``).
+        destroyed: Whether the actor is pending destruction (``bool``).
+    """
+
+    __slots__ = (
+        "_index",
+        "bbox_max",
+        "bbox_min",
+        "class_paths",
+        "destroyed",
+        "forward",
+        "handles",
+        "ids",
+        "location",
+        "names",
+        "right",
+        "speed",
+        "tags",
+    )
+
+    def __init__(
+        self,
+        ids: NDArray[np.object_],
+        handles: NDArray[np.int32],
+        names: NDArray[np.object_],
+        class_paths: NDArray[np.object_],
+        tags: NDArray[np.object_],
+        location: NDArray[np.float32],
+        forward: NDArray[np.float32],
+        right: NDArray[np.float32],
+        bbox_min: NDArray[np.float32],
+        bbox_max: NDArray[np.float32],
+        speed: NDArray[np.float32],
+        destroyed: NDArray[np.bool_],
+    ):
+        self.ids = ids
+        self.handles = handles
+        self.names = names
+        self.class_paths = class_paths
+        self.tags = tags
+        self.location = location
+        self.forward = forward
+        self.right = right
+        self.bbox_min = bbox_min
+        self.bbox_max = bbox_max
+        self.speed = speed
+        self.destroyed = destroyed
+        self._index: dict[str, int] | None = None
+
+    # ---------------------------
+    # Construction
+    # ---------------------------
+
+    @classmethod
+    def from_protos(cls, states: Sequence[ActorState]) -> "ActorStateTable":
+        """Decode ``ActorState`` messages (e.g. ``DemoRLState.actor_states``)."""
+        floats = _float_rows(states)
+        infos = [s.object_info for s in states]
+        ids, handles = _id_columns(states)
+        return cls(
+            ids=ids,
+            handles=handles,
+            names=_object_array(i.name for i in infos),
+            class_paths=_object_array(i.class_path for i in infos),
+            tags=_object_array(s.tag for s in states),
+            location=floats[:, 0:3],
+            forward=floats[:, 3:6],
+            right=floats[:, 6:9],
+            bbox_min=floats[:, 9:12],
+            bbox_max=floats[:, 12:15],
+            speed=floats[:, 15],
+            destroyed=np.fromiter(
+                (s.destroyed for s in states), dtype=np.bool_, count=len(states)
+            ),
+        )
+
+    @classmethod
+    def from_hits(
+        cls, states: Sequence[ActorState]
+    ) -> tuple["ActorStateTable", NDArray[np.int32]]:
+        """
+        Decode actor states that may repeat (e.g. one per trace hit).
+
+        Returns:
+            tuple: ``(table, index)`` where ``table`` holds each distinct actor
+                once and ``table[index[i]]`` is the actor of ``states[i]``.
+        """
+        rows: dict[bytes, int] = {}
+        unique: list[ActorState] = []
+        index = np.empty(len(states), dtype=np.int32)
+        for i, state in enumerate(states):
+            guid = state.object_info.id.guid
+            row = rows.get(guid)
+            if row is None:
+                row = rows[guid] = len(unique)
+                unique.append(state)
+            index[i] = row
+        return cls.from_protos(unique), index
+
+    @classmethod
+    def empty(cls) -> "ActorStateTable":
+        """A table with no rows."""
+        return cls.from_protos([])
+
+    # ---------------------------
+    # Access
+    # ---------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, int | np.integer):
+            return self.row(int(key))
+        return ActorStateTable(
+            ids=self.ids[key],
+            handles=self.handles[key],
+            names=self.names[key],
+            class_paths=self.class_paths[key],
+            tags=self.tags[key],
+            location=self.location[key],
+            forward=self.forward[key],
+            right=self.right[key],
+            bbox_min=self.bbox_min[key],
+            bbox_max=self.bbox_max[key],
+            speed=self.speed[key],
+            destroyed=self.destroyed[key],
+        )
+
+    def __repr__(self) -> str:
+        return f"ActorStateTable(rows={len(self)})"
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Row ``i`` in the dictionary format returned by ``query_info``."""
+        return {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "class_path": self.class_paths[i],
+            "location": Vector3(*self.location[i].tolist()),
+            "unit_forward_vector": Vector3(*self.forward[i].tolist()),
+            "unit_right_vector": Vector3(*self.right[i].tolist()),
+            "bounding_box": {
+                "min": Vector3(*self.bbox_min[i].tolist()),
+                "max": Vector3(*self.bbox_max[i].tolist()),
+            },
+            "tag": self.tags[i],
+            "destroyed": bool(self.destroyed[i]),
+            "current_speed": float(self.speed[i]),
+        }
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Every row as a dictionary (the ``query_info`` format)."""
+        return list(self)
+
+    def index_of(self, actor_id: ActorId | str) -> int:
+        """Row of ``actor_id`` (``ActorId`` or GUID string), or ``-1`` when absent."""
+        if self._index is None:
+            self._index = {actor: i for i, actor in enumerate(self.ids.tolist())}
+        key = actor_id.text if isinstance(actor_id, ActorId) else actor_id.upper()
+        return self._index.get(key, -1)
+
+    def lookup(self, actor_ids: Iterable[ActorId | str]) -> NDArray[np.int32]:
+        """Rows of several actors at once (``-1`` for unknown ids)."""
+        return np.fromiter((self.index_of(a) for a in actor_ids), dtype=np.int32)
+
+    def with_tag(self, tag: str) -> "ActorStateTable":
+        """Sub-table of the actors whose tag equals ``tag``."""
+        return self[self.tags == tag]
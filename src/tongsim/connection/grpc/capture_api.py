@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
 from typing import Any
 
+import grpc
+import grpc.aio
+
 from tongsim.math import Transform
 from tongsim_lite_protobuf import capture_pb2, capture_pb2_grpc, common_pb2, object_pb2
 
+from .capture_batch import FrameSet, FrameSetAssembler
+from .capture_codec import FrameDecoder
+from .capture_frame import CaptureFrame
+from .capture_stream import DropPolicy, FrameStream
 from .core import GrpcConnection
-from .utils import proto_to_sdk, safe_async_rpc, sdk_to_proto
+from .utils import safe_async_rpc, sdk_to_proto
 
 
 def _transform_to_proto(transform: Transform) -> common_pb2.Transform:
@@ -44,34 +53,6 @@ def _dict_to_params(params: dict[str, Any]) -> capture_pb2.CaptureCameraParams:
     return msg
 
 
-def _frame_to_dict(frame: capture_pb2.CaptureFrame) -> dict[str, Any]:
-    out: dict[str, Any] = {
-        "camera_id": frame.camera_id.guid,
-        "frame_id": frame.frame_id,
-        "game_time": frame.game_time_seconds,
-        "gpu_ready": frame.gpu_ready_timestamp,
-        "width": frame.width,
-        "height": frame.height,
-        "world_pose": proto_to_sdk(frame.world_pose),
-        "intrinsics": {
-            "fx": frame.intrinsics.fx,
-            "fy": frame.intrinsics.fy,
-            "cx": frame.intrinsics.cx,
-            "cy": frame.intrinsics.cy,
-        },
-        "has_color": frame.has_color,
-        "has_depth": frame.has_depth,
-        "depth_near": frame.depth_near,
-        "depth_far": frame.depth_far,
-        "depth_mode": frame.depth_mode,
-    }
-    if frame.has_color:
-        out["rgba8"] = frame.rgba8
-    if frame.has_depth:
-        out["depth_r32"] = frame.depth_r32
-    return out
-
-
 class CaptureAPI:
     """Async helpers bridging gRPC capture service."""
 
@@ -188,7 +169,21 @@ class CaptureAPI:
         include_color: bool = True,
         include_depth: bool = True,
         timeout_seconds: float = 0.5,
-    ) -> dict[str, Any] | None:
+        decoder: FrameDecoder | None = None,
+    ) -> CaptureFrame | None:
+        """
+        Capture one frame synchronously.
+
+        Args:
+            decoder: Decodes JPEG / EXR buffers of compressed cameras on its
+                worker pool, off the event loop.
+
+        Returns:
+            CaptureFrame | None: The frame, with lazy ``rgb`` / ``bgra`` /
+            ``depth`` views, ``intrinsics`` and ``world_pose`` matrices; it
+            also answers the dictionary keys of earlier versions
+            (``frame["rgba8"]``, ``frame.get("depth_r32")``).
+        """
         stub = conn.get_stub(capture_pb2_grpc.CaptureServiceStub)
         req = capture_pb2.CaptureSnapshotRequest(
             camera_id=object_pb2.ObjectId(guid=camera_id),
@@ -197,7 +192,126 @@ class CaptureAPI:
             timeout_seconds=timeout_seconds,
         )
         resp = await stub.CaptureSnapshot(req)
-        return _frame_to_dict(resp)
+        if decoder is not None:
+            return await decoder.decode(CaptureFrame(resp))
+        return CaptureFrame(resp)
+
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def capture_snapshot_batch(
+        conn: GrpcConnection,
+        camera_ids: Sequence[bytes],
+        *,
+        include_color: bool = True,
+        include_depth: bool = True,
+        timeout_seconds: float = 0.5,
+        assembler: FrameSetAssembler | None = None,
+        decoder: FrameDecoder | None = None,
+    ) -> FrameSet | None:
+        """
+        Capture one frame of every camera in the same render tick.
+
+        One ``CaptureSnapshotBatch`` call returns all views rendered at one
+        game time. Against a server without it, the cameras are captured
+        with concurrent ``CaptureSnapshot`` calls; those views are usually
+        not from the same tick, which ``FrameSet.aligned`` reports.
+
+        Args:
+            camera_ids: Cameras to capture, in output order.
+            timeout_seconds: Server-side wait for the readback.
+            assembler: Reuse one across calls to also detect cameras that
+                return a frame already seen (``FrameSet.stale``).
+            decoder: Decodes compressed views concurrently on its pool.
+
+        Returns:
+            FrameSet | None: One ``CaptureFrame`` per camera with
+            ``game_time``, ``render_tick`` and alignment diagnostics.
+        """
+        camera_ids = [bytes(c) for c in camera_ids]
+        if assembler is None:
+            assembler = FrameSetAssembler(camera_ids)
+        stub = conn.get_stub(capture_pb2_grpc.CaptureServiceStub)
+        frames = None
+        render_tick = 0
+        if conn.supports("CaptureSnapshotBatch"):
+            req = capture_pb2.CaptureSnapshotBatchRequest(
+                camera_ids=[object_pb2.ObjectId(guid=c) for c in camera_ids],
+                include_color=include_color,
+                include_depth=include_depth,
+                timeout_seconds=timeout_seconds,
+            )
+            try:
+                resp = await stub.CaptureSnapshotBatch(req)
+                frames, render_tick = list(resp.frames), resp.render_tick
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                conn.mark_unsupported("CaptureSnapshotBatch")
+        if frames is None:
+            frames = await asyncio.gather(
+                *(
+                    stub.CaptureSnapshot(
+                        capture_pb2.CaptureSnapshotRequest(
+                            camera_id=object_pb2.ObjectId(guid=c),
+                            include_color=include_color,
+                            include_depth=include_depth,
+                            timeout_seconds=timeout_seconds,
+                        )
+                    )
+                    for c in camera_ids
+                )
+            )
+        views = [CaptureFrame(f) for f in frames]
+        if decoder is not None:
+            views = await asyncio.gather(*(decoder.decode(v) for v in views))
+        return assembler.assemble(views, render_tick)
+
+    @staticmethod
+    def stream_frames(
+        conn: GrpcConnection,
+        camera_ids: bytes | Sequence[bytes],
+        qps: float = 0.0,
+        *,
+        include_color: bool = True,
+        include_depth: bool = True,
+        buffer_size: int = 4,
+        policy: DropPolicy | str = DropPolicy.DROP_OLDEST,
+        decoder: FrameDecoder | None = None,
+    ) -> FrameStream:
+        """
+        Stream frames of one or more cameras continuously.
+
+        Use the result as an async context manager and iterate it, or poll
+        ``latest()``::
+
+            async with CaptureAPI.stream_frames(conn, [cam], qps=30) as frames:
+                async for frame in frames:
+                    ...
+
+        Args:
+            camera_ids: Capture camera id, or several.
+            qps: Frames per second per camera; ``0`` keeps each camera's
+                configured rate.
+            include_color: Stream the color buffer.
+            include_depth: Stream the depth buffer.
+            buffer_size: Frames buffered per camera.
+            policy: ``"drop_oldest"``, ``"drop_newest"`` or ``"block"`` when a
+                camera's buffer is full.
+            decoder: Decodes compressed frames as they are consumed.
+
+        Returns:
+            FrameStream: Not yet started; ``async with`` starts and closes it.
+        """
+        return FrameStream(
+            conn,
+            camera_ids,
+            qps,
+            include_color=include_color,
+            include_depth=include_depth,
+            buffer_size=buffer_size,
+            policy=policy,
+            decoder=decoder,
+        )
 
     @staticmethod
     @safe_async_rpc(default=None)
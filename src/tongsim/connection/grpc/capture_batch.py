@@ -0,0 +1,219 @@
+"""
+connection.grpc.capture_batch
+
+Synchronized multi-camera frames.
+
+Capturing N views with N ``CaptureSnapshot`` calls costs N round trips and
+renders every view at a different game time, which breaks stereo matching
+and multi-view fusion. ``CaptureSnapshotBatch`` renders all cameras in one
+tick; ``FrameSetAssembler`` turns its response (or frames from a
+``FrameStream``) into a ``FrameSet`` and checks that the views really belong
+together:
+
+- every frame carries the same game time (within ``tolerance_s``)
+- every camera delivered a new ``frame_id`` (not a repeated readback)
+- the spread of ``gpu_ready_timestamp`` is reported as ``gpu_ready_spread``
+
+Exports:
+- FrameSet: one frame per camera, with alignment diagnostics
+- FrameSetAssembler: builds and validates ``FrameSet`` objects
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .capture_frame import CaptureFrame
+
+__all__ = ["FrameSet", "FrameSetAssembler"]
+
+
+class FrameSet:
+    """
+    Frames of several cameras captured together, in camera order.
+
+    Index by position or by camera id: ``views[0]``, ``views[camera_id]``.
+    """
+
+    __slots__ = (
+        "aligned",
+        "camera_ids",
+        "frames",
+        "game_time",
+        "game_time_spread",
+        "gpu_ready_spread",
+        "render_tick",
+        "stale",
+    )
+
+    def __init__(
+        self,
+        frames: Sequence[CaptureFrame],
+        render_tick: int = 0,
+        tolerance_s: float = 1e-4,
+        stale: Sequence[bytes] = (),
+    ):
+        self.frames = list(frames)
+        self.camera_ids = [f.camera_id for f in self.frames]
+        self.render_tick = render_tick
+        times = [f.game_time for f in self.frames]
+        ready = [f.gpu_ready for f in self.frames]
+        self.game_time = min(times, default=0.0)
+        self.game_time_spread = max(times, default=0.0) - self.game_time
+        self.gpu_ready_spread = max(ready, default=0.0) - min(ready, default=0.0)
+        self.stale = list(stale)
+        self.aligned = self.game_time_spread <= tolerance_s and not self.stale
+
+    def __repr__(self) -> str:
+        return (
+            f"FrameSet(cameras={len(self.frames)}, game_time={self.game_time:.4f}, "
+            f"aligned={self.aligned})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __iter__(self) -> Iterator[CaptureFrame]:
+        return iter(self.frames)
+
+    def __getitem__(self, key: int | bytes) -> CaptureFrame:
+        if isinstance(key, bytes | bytearray):
+            try:
+                return self.frames[self.camera_ids.index(bytes(key))]
+            except ValueError:
+                raise KeyError(key) from None
+        return self.frames[key]
+
+    def stack(self, attr: str = "rgb") -> NDArray[Any]:
+        """
+        Stack one image of every view into a ``(N, H, W[, C])`` array.
+
+        Args:
+            attr: ``"rgb"``, ``"bgra"`` or ``"depth"``. All views must have
+                the same resolution. This copies the pixel data once.
+        """
+        images = [getattr(f, attr) for f in self.frames]
+        if any(image is None for image in images):
+            raise ValueError(f"[FrameSet] not every view has {attr!r}.")
+        return np.stack(images)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "render_tick": self.render_tick,
+            "game_time": self.game_time,
+            "game_time_spread": self.game_time_spread,
+            "gpu_ready_spread": self.gpu_ready_spread,
+            "aligned": self.aligned,
+        }
+
+
+class FrameSetAssembler:
+    """
+    Build ``FrameSet`` objects for a fixed list of cameras and validate them.
+
+    ``assemble`` orders the frames of one batch response; ``add`` collects
+    frames arriving one by one (for example from ``FrameStream``) and returns
+    a ``FrameSet`` once every camera has delivered a frame of the same game
+    time. The assembler remembers the last ``frame_id`` per camera, so a
+    camera that returns the same frame twice is reported in ``stale``.
+    """
+
+    def __init__(
+        self,
+        camera_ids: Sequence[bytes],
+        tolerance_s: float = 1e-4,
+        max_pending: int = 8,
+    ):
+        """
+        Args:
+            camera_ids: Cameras of every set, in output order.
+            tolerance_s: Largest game-time difference between views that
+                still counts as the same tick.
+            max_pending: Incomplete game times ``add`` keeps before
+                discarding the oldest.
+        """
+        self._camera_ids = [bytes(c) for c in camera_ids]
+        self._order = {c: i for i, c in enumerate(self._camera_ids)}
+        self._tolerance = tolerance_s
+        self._max_pending = max_pending
+        self._last_frame_id: dict[bytes, int] = {}
+        # (game time, frames by camera) of incomplete sets, oldest first.
+        self._pending: list[tuple[float, dict[bytes, CaptureFrame]]] = []
+        self._assembled = 0
+        self._misaligned = 0
+        self._incomplete = 0
+
+    @property
+    def camera_ids(self) -> list[bytes]:
+        return list(self._camera_ids)
+
+    def assemble(
+        self, frames: Sequence[CaptureFrame], render_tick: int = 0
+    ) -> FrameSet:
+        """
+        Order one frame per camera and validate their alignment.
+
+        Raises:
+            ValueError: If a camera is missing or unknown.
+        """
+        by_camera = {f.camera_id: f for f in frames}
+        missing = [c.hex() for c in self._camera_ids if c not in by_camera]
+        unknown = [c.hex() for c in by_camera if c not in self._order]
+        if missing or unknown or len(frames) != len(self._camera_ids):
+            raise ValueError(
+                f"[FrameSetAssembler] expected one frame per camera; missing "
+                f"{missing}, unexpected {unknown}, got {len(frames)} frames."
+            )
+        ordered = [by_camera[c] for c in self._camera_ids]
+        stale = []
+        for frame in ordered:
+            last = self._last_frame_id.get(frame.camera_id)
+            if last is not None and frame.frame_id <= last:
+                stale.append(frame.camera_id)
+            else:
+                self._last_frame_id[frame.camera_id] = frame.frame_id
+        out = FrameSet(ordered, render_tick, self._tolerance, stale)
+        self._assembled += 1
+        if not out.aligned:
+            self._misaligned += 1
+        return out
+
+    def add(self, frame: CaptureFrame) -> FrameSet | None:
+        """
+        Collect one frame; return the completed ``FrameSet`` if it finishes one.
+
+        Completing a game time discards every older incomplete one.
+        """
+        if frame.camera_id not in self._order:
+            return None
+        group = None
+        for pending_time, frames in self._pending:
+            if abs(pending_time - frame.game_time) <= self._tolerance:
+                group = frames
+                break
+        if group is None:
+            group = {}
+            self._pending.append((frame.game_time, group))
+            self._pending.sort(key=lambda item: item[0])
+        group[frame.camera_id] = frame
+        if len(group) == len(self._camera_ids):
+            index = next(i for i, (_, g) in enumerate(self._pending) if g is group)
+            self._incomplete += index
+            del self._pending[: index + 1]
+            return self.assemble(list(group.values()))
+        if len(self._pending) > self._max_pending:
+            self._pending.pop(0)
+            self._incomplete += 1
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """Counters: ``assembled`` sets, ``misaligned`` sets, ``incomplete`` ticks dropped, ``pending``."""
+        return {
+            "assembled": self._assembled,
+            "misaligned": self._misaligned,
+            "incomplete": self._incomplete,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,338 @@
+"""
+connection.grpc.capture_codec
+
+Off-loop decoding of compressed capture frames.
+
+With ``rgb_codec = CAPTURE_RGB_CODEC_JPEG`` / ``depth_codec =
+CAPTURE_DEPTH_CODEC_EXR`` the server sends compressed buffers, which cuts
+bandwidth several-fold but leaves a decode per frame to the client. Decoding
+inline would run on the event-loop thread (stalling every RPC on the
+connection) or on the policy thread. ``FrameDecoder`` runs the decoders on a
+thread or process pool and writes into pooled output buffers:
+
+- threads suit OpenCV / Pillow, which release the GIL while decoding
+- processes suit decoders that hold the GIL; output buffers then live in
+  shared memory, so decoded pixels are not pickled back
+- a buffer is reused once nothing references it any more (every array
+  handed out is a view of it), so steady-state decoding allocates nothing
+
+Decoders take ``(data, out)`` and fill ``out`` in place; ``decode_jpeg``
+(OpenCV or Pillow) and ``decode_exr`` (OpenCV or OpenEXR) are the defaults.
+Both libraries are optional and imported on first use.
+
+Exports:
+- FrameDecoder: pooled asynchronous decoder for ``CaptureFrame`` objects
+- decode_jpeg: JPEG -> ``(H, W, 4)`` BGRA uint8
+- decode_exr: single-channel EXR -> ``(H, W)`` float32
+"""
+
+import asyncio
+import importlib
+import io
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .capture_frame import CaptureFrame
+
+__all__ = ["FrameDecoder", "decode_exr", "decode_jpeg"]
+
+Decoder = Callable[[bytes, NDArray[Any]], None]
+
+
+def _import_optional(name: str) -> ModuleType | None:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _check_shape(decoded: NDArray[Any], out: NDArray[Any], codec: str) -> None:
+    if decoded.shape[:2] != out.shape[:2]:
+        raise ValueError(
+            f"[FrameDecoder] {codec} image is {decoded.shape[1]}x{decoded.shape[0]}, "
+            f"frame says {out.shape[1]}x{out.shape[0]}."
+        )
+
+
+def decode_jpeg(data: bytes, out: NDArray[np.uint8]) -> None:
+    """Decode JPEG ``data`` into the ``(H, W, 4)`` BGRA array ``out`` (alpha 255)."""
+    cv2 = _import_optional("cv2")
+    if cv2 is not None:
+        bgr = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise ValueError("[FrameDecoder] OpenCV could not decode the JPEG.")
+        _check_shape(bgr, out, "JPEG")
+        out[..., :3] = bgr
+    else:
+        pil = _import_optional("PIL.Image")
+        if pil is None:
+            raise ImportError("Decoding JPEG frames needs opencv-python or pillow.")
+        with pil.open(io.BytesIO(data)) as img:
+            rgb = np.asarray(img.convert("RGB"))
+        _check_shape(rgb, out, "JPEG")
+        out[..., :3] = rgb[..., ::-1]
+    out[..., 3] = 255
+
+
+def _exr_channel(channels: list[str]) -> str:
+    for name in ("R", "Z", "Y"):
+        if name in channels:
+            return name
+    return sorted(channels)[0]
+
+
+def decode_exr(data: bytes, out: NDArray[np.float32]) -> None:
+    """Decode the depth channel of EXR ``data`` into the ``(H, W)`` float32 ``out``."""
+    # OpenCV only reads EXR when enabled before it is first imported.
+    os.environ.setdefault("OPENCV_IO_ENABLE_OPENEXR", "1")
+    cv2 = _import_optional("cv2")
+    if cv2 is not None:
+        image = cv2.imdecode(
+            np.frombuffer(data, dtype=np.uint8),
+            cv2.IMREAD_ANYDEPTH | cv2.IMREAD_ANYCOLOR,
+        )
+        if image is not None:
+            _check_shape(image, out, "EXR")
+            # Multi-channel EXR decodes as BGR; depth sits in R.
+            out[...] = image[..., 2] if image.ndim == 3 else image
+            return
+    openexr = _import_optional("OpenEXR")
+    imath = _import_optional("Imath")
+    if openexr is None or imath is None:
+        raise ImportError(
+            "Decoding EXR frames needs opencv-python (OPENCV_IO_ENABLE_OPENEXR=1) "
+            "or OpenEXR."
+        )
+    exr = openexr.InputFile(io.BytesIO(data))
+    try:
+        window = exr.header()["dataWindow"]
+        width = window.max.x - window.min.x + 1
+        height = window.max.y - window.min.y + 1
+        channel = _exr_channel(list(exr.header()["channels"]))
+        raw = exr.channel(channel, imath.PixelType(imath.PixelType.FLOAT))
+    finally:
+        exr.close()
+    image = np.frombuffer(raw, dtype=np.float32).reshape(height, width)
+    _check_shape(image, out, "EXR")
+    out[...] = image
+
+
+# Shared-memory buffers a pool worker process has attached, by name.
+_ATTACHED: dict[str, SharedMemory] = {}
+
+
+def _decode_shared(
+    decoder: Decoder, data: bytes, name: str, shape: tuple[int, ...], dtype: str
+) -> None:
+    """Process-pool entry point: decode into the parent's shared buffer ``name``."""
+    shm = _ATTACHED.get(name)
+    if shm is None:
+        shm = _ATTACHED[name] = SharedMemory(name=name)
+    decoder(data, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+_Entry = tuple[NDArray[Any], SharedMemory | None]
+
+
+def _refs(entry: _Entry) -> int:
+    return sys.getrefcount(entry[0])
+
+
+# References to a buffer only the pool holds, as seen through ``_refs``.
+_IDLE_REFS = _refs((np.empty(0), None))
+
+
+class _BufferPool:
+    """
+    Output buffers keyed by shape and dtype.
+
+    A buffer is free when the pool holds the only reference to it: arrays
+    handed out are views whose ``base`` is the buffer, so any array (or view
+    of one) the caller still keeps marks it busy.
+    """
+
+    def __init__(self, shared: bool, max_idle: int):
+        self._shared = shared
+        self._max_idle = max_idle
+        self._buffers: dict[tuple[tuple[int, ...], str], list[_Entry]] = {}
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, shape: tuple[int, ...], dtype: str) -> _Entry:
+        with self._lock:
+            entries = self._buffers.setdefault((shape, dtype), [])
+            idle = [e for e in entries if _refs(e) <= _IDLE_REFS]
+            for extra in idle[self._max_idle :]:
+                entries.remove(extra)
+                self._release(extra)
+            if idle:
+                self.reused += 1
+                return idle[0]
+            shm = None
+            if self._shared:
+                size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                shm = SharedMemory(create=True, size=max(size, 1))
+                array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            else:
+                array = np.empty(shape, dtype=dtype)
+            entries.append((array, shm))
+            self.allocated += 1
+            return array, shm
+
+    @staticmethod
+    def _release(entry: _Entry) -> None:
+        shm = entry[1]
+        if shm is not None:
+            shm.unlink()
+
+    def close(self) -> None:
+        with self._lock:
+            for entries in self._buffers.values():
+                for entry in entries:
+                    self._release(entry)
+            self._buffers.clear()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._buffers.values())
+
+
+class FrameDecoder:
+    """
+    Decode compressed ``CaptureFrame`` buffers on a worker pool.
+
+    Usage::
+
+        decoder = FrameDecoder(workers=4)
+        frame = await CaptureAPI.capture_snapshot(conn, cam, decoder=decoder)
+        frame.rgb, frame.depth      # decoded arrays, not JPEG/EXR bytes
+        ...
+        decoder.close()
+
+    Frames that are not compressed pass through unchanged. Decoded arrays
+    live in pooled buffers: keep a copy (``np.array(frame.rgb)``) if a frame
+    must outlive many later decodes, otherwise just drop it and the buffer is
+    reused.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        use_processes: bool = False,
+        max_idle_buffers: int = 8,
+        color_decoder: Decoder = decode_jpeg,
+        depth_decoder: Decoder = decode_exr,
+        executor: Executor | None = None,
+    ):
+        """
+        Args:
+            workers: Size of the pool created when ``executor`` is not given.
+            use_processes: Decode in worker processes with shared-memory
+                output buffers instead of threads. Decoders must then be
+                picklable module-level functions.
+            max_idle_buffers: Free buffers kept per shape; more are released.
+            color_decoder: ``(data, out)`` filling an ``(H, W, 4)`` BGRA array.
+            depth_decoder: ``(data, out)`` filling an ``(H, W)`` float32 array.
+            executor: Existing pool to use; the decoder does not shut it down.
+        """
+        if executor is None:
+            pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            executor = pool_cls(max_workers=workers)
+            self._owns_executor = True
+        else:
+            use_processes = isinstance(executor, ProcessPoolExecutor)
+            self._owns_executor = False
+        self._executor = executor
+        self._shared = use_processes
+        self._buffers = _BufferPool(use_processes, max_idle_buffers)
+        self._color_decoder = color_decoder
+        self._depth_decoder = depth_decoder
+        self._decoded = 0
+        self._decode_s = 0.0
+
+    async def _run(
+        self, decoder: Decoder, data: bytes, shape: tuple[int, ...], dtype: str
+    ) -> NDArray[Any]:
+        out, shm = self._buffers.acquire(shape, dtype)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        if shm is not None:
+            await loop.run_in_executor(
+                self._executor, _decode_shared, decoder, data, shm.name, shape, dtype
+            )
+        else:
+            await loop.run_in_executor(self._executor, decoder, data, out)
+        self._decode_s += time.perf_counter() - start
+        self._decoded += 1
+        return out[...]
+
+    async def decode_color(
+        self, data: bytes, width: int, height: int
+    ) -> NDArray[np.uint8]:
+        """Decode a compressed color buffer into an ``(H, W, 4)`` BGRA array."""
+        return await self._run(self._color_decoder, data, (height, width, 4), "u1")
+
+    async def decode_depth(
+        self, data: bytes, width: int, height: int
+    ) -> NDArray[np.float32]:
+        """Decode a compressed depth buffer into an ``(H, W)`` float32 array."""
+        return await self._run(self._depth_decoder, data, (height, width), "<f4")
+
+    async def decode(self, frame: CaptureFrame) -> CaptureFrame:
+        """
+        Decode the compressed buffers of ``frame``.
+
+        Returns:
+            CaptureFrame: ``frame`` itself when nothing is compressed,
+            otherwise a frame over the same message whose ``bgra`` / ``rgb``
+            / ``depth`` are the decoded arrays.
+        """
+        color = frame.has_color and frame.color_codec != 0
+        depth = frame.has_depth and frame.depth_codec != 0
+        if not color and not depth:
+            return frame
+        w, h = frame.width, frame.height
+        bgra, depth_image = await asyncio.gather(
+            self.decode_color(frame.color_bytes, w, h) if color else _none(),
+            self.decode_depth(frame.depth_bytes, w, h) if depth else _none(),
+        )
+        return CaptureFrame(frame.proto, bgra=bgra, depth=depth_image)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters: ``decoded`` buffers, ``mean_decode_ms``, pool ``buffers`` / ``allocated`` / ``reused``."""
+        return {
+            "decoded": self._decoded,
+            "mean_decode_ms": self._decode_s / self._decoded * 1e3
+            if self._decoded
+            else 0.0,
+            "buffers": len(self._buffers),
+            "allocated": self._buffers.allocated,
+            "reused": self._buffers.reused,
+            "processes": self._shared,
+        }
+
+    def close(self) -> None:
+        """Shut the owned pool down and release shared-memory buffers."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._buffers.close()
+
+    def __enter__(self) -> "FrameDecoder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+async def _none() -> None:
+    return None
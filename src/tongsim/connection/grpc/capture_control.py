@@ -0,0 +1,380 @@
+"""
+connection.grpc.capture_control
+
+Closed-loop tuning of capture cameras towards a target frame latency.
+
+A camera asked for more than the renderer (or the JPEG / EXR encoder) can
+deliver builds up a server-side queue, visible as ``queue_count`` /
+``compressed_queue_count`` in ``CaptureAPI.get_status``, and every queued
+frame adds to the latency of the next snapshot. ``AdaptiveCaptureController``
+watches both signals per camera and moves one knob per step through
+``update_camera_params``, staying inside the user's ``CaptureBounds``:
+
+- over target (or queue building up): lower ``qps``, then ``jpeg_quality``,
+  then the resolution; each multiplicatively
+- well under target with empty queues: restore in the reverse order, each
+  additively, so the camera returns to full quality before full rate
+
+Knobs a camera does not use are skipped (``qps`` on snapshot-only cameras,
+``jpeg_quality`` unless ``rgb_codec`` is JPEG). The controller is opt-in: it
+only acts while its ``run`` coroutine is scheduled, typically with
+``WorldContext.async_task``. Every decision is counted and exposed through
+``stats`` / ``metrics``; ``to_prometheus`` renders the latter.
+
+Exports:
+- CaptureBounds: per-camera limits of the tuned parameters
+- AdaptiveCaptureController: the controller task
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from tongsim.logger import get_logger
+from tongsim_lite_protobuf import capture_pb2
+
+from .capture_api import CaptureAPI
+from .capture_codec import FrameDecoder
+from .capture_frame import CaptureFrame
+from .core import GrpcConnection
+
+__all__ = ["AdaptiveCaptureController", "CaptureBounds"]
+
+_logger = get_logger("gRPC")
+
+# Snapshot latencies kept per camera between two control steps.
+_WINDOW = 64
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureBounds:
+    """
+    Range the controller may move a camera's parameters in.
+
+    ``None`` upper bounds default to the parameters the camera was added
+    with, so the controller never raises a camera above its configuration.
+    """
+
+    min_qps: float = 1.0
+    max_qps: float | None = None
+    min_jpeg_quality: int = 40
+    max_jpeg_quality: int | None = None
+    min_scale: float = 0.5
+    """Smallest resolution, as a fraction of the configured width / height."""
+    max_scale: float = 1.0
+
+
+class _Camera:
+    """Controller state of one camera."""
+
+    __slots__ = (
+        "bounds",
+        "decisions",
+        "last_action",
+        "latencies",
+        "latency_s",
+        "params",
+        "qps",
+        "quality",
+        "queue",
+        "scale",
+        "size",
+    )
+
+    def __init__(self, params: dict[str, Any], bounds: CaptureBounds):
+        self.params = dict(params)
+        self.size = (int(params["width"]), int(params["height"]))
+        qps = float(params.get("qps", 0.0))
+        quality = int(params.get("jpeg_quality", 0))
+        # Snapshot-only cameras keep ``qps = 0``; only JPEG has a quality.
+        max_qps = bounds.max_qps if bounds.max_qps is not None else qps
+        max_quality = (
+            bounds.max_jpeg_quality
+            if bounds.max_jpeg_quality is not None
+            else quality or 90
+        )
+        if params.get("rgb_codec") != capture_pb2.CAPTURE_RGB_CODEC_JPEG:
+            max_quality = 0
+        self.bounds = CaptureBounds(
+            min_qps=min(bounds.min_qps, max_qps),
+            max_qps=max_qps,
+            min_jpeg_quality=min(bounds.min_jpeg_quality, max_quality),
+            max_jpeg_quality=max_quality,
+            min_scale=min(bounds.min_scale, bounds.max_scale),
+            max_scale=bounds.max_scale,
+        )
+        self.qps = min(qps, max_qps)
+        self.quality = min(quality or max_quality, max_quality)
+        self.scale = bounds.max_scale
+        self.latencies: deque[float] = deque(maxlen=_WINDOW)
+        self.latency_s = 0.0
+        self.queue = 0
+        self.decisions: dict[str, int] = {}
+        self.last_action = ""
+
+    def resolution(self, scale: float) -> tuple[int, int]:
+        # Even sizes keep chroma-subsampled JPEG and the GPU readback happy.
+        width, height = self.size
+        return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+    def target_params(self) -> dict[str, Any]:
+        width, height = self.resolution(self.scale)
+        params = {**self.params, "width": width, "height": height}
+        if self.bounds.max_qps:
+            params["qps"] = self.qps
+        if self.bounds.max_jpeg_quality:
+            params["jpeg_quality"] = self.quality
+        return params
+
+    def count(self, action: str) -> None:
+        self.decisions[action] = self.decisions.get(action, 0) + 1
+        self.last_action = action
+
+
+class AdaptiveCaptureController:
+    """
+    Keep the snapshot latency of capture cameras near a target.
+
+    Usage::
+
+        ctrl = AdaptiveCaptureController(conn, target_latency_s=0.08)
+        ctrl.add_camera(cam, params, CaptureBounds(min_qps=5, min_scale=0.5))
+        task = ue.context.async_task(ctrl.run(), "capture-control")
+        ...
+        frame = await ctrl.capture_snapshot(cam)    # timed and observed
+        ...
+        task.cancel()
+
+    Latency is what the caller sees: time ``capture_snapshot`` through the
+    controller, or report it with ``observe``. A step without samples acts on
+    the queue depths alone. Resolution changes take effect on the server, so
+    frames carry the new ``width`` / ``height`` / ``intrinsics``.
+    """
+
+    def __init__(
+        self,
+        conn: GrpcConnection,
+        target_latency_s: float,
+        *,
+        interval_s: float = 1.0,
+        bounds: CaptureBounds | None = None,
+        max_queue: int = 1,
+        headroom: float = 0.6,
+        min_samples: int = 3,
+    ):
+        """
+        Args:
+            conn: Connection the cameras live on.
+            target_latency_s: Snapshot latency (p95 over a step) to stay under.
+            interval_s: Seconds between control steps.
+            bounds: Default bounds of cameras added without their own.
+            max_queue: Server-side frames (raw plus compressed) tolerated per
+                camera before it is treated as overloaded.
+            headroom: Restore quality only while the latency is below
+                ``headroom * target_latency_s``.
+            min_samples: Latency samples a step needs to judge the latency.
+        """
+        if target_latency_s <= 0:
+            raise ValueError(f"target_latency_s must be > 0, got {target_latency_s}.")
+        self._conn = conn
+        self._target_s = target_latency_s
+        self._interval_s = interval_s
+        self._bounds = bounds or CaptureBounds()
+        self._max_queue = max_queue
+        self._headroom = headroom
+        self._min_samples = min_samples
+        self._cameras: dict[bytes, _Camera] = {}
+        self._steps = 0
+
+    # ---------------------------
+    # Cameras
+    # ---------------------------
+
+    def add_camera(
+        self,
+        camera_id: bytes,
+        params: dict[str, Any],
+        bounds: CaptureBounds | None = None,
+    ) -> None:
+        """
+        Put a camera under control.
+
+        Args:
+            camera_id: Camera to tune.
+            params: Its full parameters, as given to ``create_camera``.
+                ``update_camera_params`` replaces every field, so the
+                controller re-sends them with each change.
+            bounds: Limits for this camera; the controller's default otherwise.
+        """
+        if "width" not in params or "height" not in params:
+            raise ValueError("[capture-control] params need 'width' and 'height'.")
+        self._cameras[camera_id] = _Camera(params, bounds or self._bounds)
+
+    def remove_camera(self, camera_id: bytes) -> None:
+        """Stop tuning a camera; its current parameters are left in place."""
+        self._cameras.pop(camera_id, None)
+
+    def params(self, camera_id: bytes) -> dict[str, Any]:
+        """Parameters the controller currently wants for a camera."""
+        return self._cameras[camera_id].target_params()
+
+    # ---------------------------
+    # Latency
+    # ---------------------------
+
+    def observe(self, camera_id: bytes, latency_s: float) -> None:
+        """Report the end-to-end latency of one snapshot of a camera."""
+        camera = self._cameras.get(camera_id)
+        if camera is not None:
+            camera.latencies.append(latency_s)
+
+    async def capture_snapshot(
+        self,
+        camera_id: bytes,
+        *,
+        include_color: bool = True,
+        include_depth: bool = True,
+        timeout_seconds: float = 0.5,
+        decoder: FrameDecoder | None = None,
+    ) -> CaptureFrame | None:
+        """``CaptureAPI.capture_snapshot``, timed and fed to ``observe``."""
+        start = time.perf_counter()
+        frame = await CaptureAPI.capture_snapshot(
+            self._conn,
+            camera_id,
+            include_color=include_color,
+            include_depth=include_depth,
+            timeout_seconds=timeout_seconds,
+            decoder=decoder,
+        )
+        # A failed snapshot took at least this long, so it still counts.
+        self.observe(camera_id, time.perf_counter() - start)
+        return frame
+
+    # ---------------------------
+    # Control
+    # ---------------------------
+
+    def _decide(self, camera: _Camera, latency_s: float | None, queue: int) -> str:
+        """Move one knob of ``camera`` and name the move, or return ``""``."""
+        b = camera.bounds
+        over = queue > self._max_queue or (
+            latency_s is not None and latency_s > self._target_s
+        )
+        if over:
+            if camera.qps > b.min_qps:
+                camera.qps = max(b.min_qps, round(camera.qps * 0.7, 1))
+                return "qps_down"
+            if camera.quality > b.min_jpeg_quality:
+                camera.quality = max(b.min_jpeg_quality, camera.quality - 15)
+                return "quality_down"
+            if camera.scale > b.min_scale:
+                camera.scale = max(b.min_scale, camera.scale * 0.75)
+                return "resolution_down"
+            return "saturated"
+        if queue or latency_s is None or latency_s > self._headroom * self._target_s:
+            return ""
+        if camera.scale < b.max_scale:
+            camera.scale = min(b.max_scale, camera.scale + 0.1)
+            return "resolution_up"
+        if camera.quality < (b.max_jpeg_quality or 0):
+            camera.quality = min(b.max_jpeg_quality, camera.quality + 5)
+            return "quality_up"
+        if camera.qps < (b.max_qps or 0):
+            camera.qps = min(b.max_qps, round(camera.qps + 0.1 * b.max_qps, 1))
+            return "qps_up"
+        return ""
+
+    async def _step_camera(self, camera_id: bytes, camera: _Camera) -> None:
+        status = await CaptureAPI.get_status(self._conn, camera_id)
+        if status is not None:
+            camera.queue = status["queue_count"] + status["compressed_queue_count"]
+        samples = sorted(camera.latencies)
+        camera.latencies.clear()
+        latency_s = None
+        if len(samples) >= self._min_samples:
+            latency_s = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+            camera.latency_s = latency_s
+        if status is None and latency_s is None:
+            return
+        state = (camera.qps, camera.quality, camera.scale)
+        action = self._decide(camera, latency_s, camera.queue)
+        if not action:
+            return
+        if action != "saturated":
+            after = camera.target_params()
+            if not await CaptureAPI.update_camera_params(self._conn, camera_id, after):
+                # Keep the state in line with what the server still runs.
+                camera.qps, camera.quality, camera.scale = state
+                action = "update_failed"
+            else:
+                _logger.info(
+                    f"[capture-control] {camera_id.hex()[:8]} {action}: "
+                    f"qps={after.get('qps', 0):.1f} "
+                    f"jpeg_quality={after.get('jpeg_quality', 0)} "
+                    f"{after['width']}x{after['height']} "
+                    f"(latency={camera.latency_s * 1e3:.1f} ms, queue={camera.queue})"
+                )
+        camera.count(action)
+
+    async def step(self) -> None:
+        """Run one control step over every camera."""
+        self._steps += 1
+        cameras = list(self._cameras.items())
+        await asyncio.gather(*(self._step_camera(cid, cam) for cid, cam in cameras))
+
+    async def run(self) -> None:
+        """Run control steps every ``interval_s`` until cancelled."""
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.step()
+            except Exception as e:
+                _logger.warning(f"[capture-control] step failed: {e!r}")
+            await asyncio.sleep(
+                max(0.0, self._interval_s - (time.perf_counter() - started))
+            )
+
+    # ---------------------------
+    # Metrics
+    # ---------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Controller state per camera (keyed by the hex camera id).
+
+        Returns:
+            dict: ``target_latency_s``, ``steps`` and ``cameras`` with each
+                camera's current ``qps`` / ``jpeg_quality`` / ``width`` /
+                ``height``, last ``latency_s`` (p95) and ``queue``, the
+                ``decisions`` counters and the ``last_action``.
+        """
+        cameras = {}
+        for camera_id, camera in self._cameras.items():
+            params = camera.target_params()
+            cameras[camera_id.hex()] = {
+                "qps": float(params.get("qps", 0.0)),
+                "jpeg_quality": int(params.get("jpeg_quality", 0)),
+                "width": params["width"],
+                "height": params["height"],
+                "latency_s": camera.latency_s,
+                "queue": camera.queue,
+                "decisions": dict(camera.decisions),
+                "last_action": camera.last_action,
+            }
+        return {
+            "target_latency_s": self._target_s,
+            "steps": self._steps,
+            "cameras": cameras,
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        ``stats`` in the shape of ``GrpcConnection.metrics``.
+
+        ``to_prometheus(ctrl.metrics())`` renders the controller alone;
+        ``to_prometheus({**conn.metrics(), **ctrl.metrics()})`` renders both.
+        """
+        return {"endpoint": self._conn.endpoint, "capture_control": self.stats()}
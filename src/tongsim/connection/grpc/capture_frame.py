@@ -0,0 +1,337 @@
+"""
+connection.grpc.capture_frame
+
+Lazy, copy-free access to captured frames.
+
+A ``CaptureFrame`` message carries the color buffer as BGRA8 bytes and the
+depth buffer as packed little-endian float32. ``CaptureFrame`` keeps the
+message and exposes NumPy views over those buffers on first access, so a
+consumer that only needs depth never materialises the color bytes and none
+of the image accessors copy pixel data.
+
+Cameras created with ``rgb_codec = CAPTURE_RGB_CODEC_JPEG`` or
+``depth_codec = CAPTURE_DEPTH_CODEC_EXR`` deliver compressed buffers instead;
+``color_codec`` / ``depth_codec`` report this, and ``FrameDecoder``
+(``capture_codec``) turns such frames into ones whose image accessors return
+the decoded arrays.
+
+Exports:
+- CaptureFrame: captured frame with lazy image, intrinsics and pose arrays
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from tongsim.math import Transform
+from tongsim_lite_protobuf import capture_pb2
+
+from .transform_array import proto_transforms_to_array
+from .utils import proto_to_sdk
+
+__all__ = ["CaptureFrame"]
+
+_KEYS = (
+    "camera_id",
+    "frame_id",
+    "game_time",
+    "gpu_ready",
+    "width",
+    "height",
+    "world_pose",
+    "intrinsics",
+    "has_color",
+    "has_depth",
+    "depth_near",
+    "depth_far",
+    "depth_mode",
+    "rgba8",
+    "depth_r32",
+)
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_EXR_MAGIC = b"\x76\x2f\x31\x01"
+
+
+def _pose_matrix(row: NDArray[np.float32]) -> NDArray[np.float64]:
+    """``(10,)`` location / quaternion / scale row -> ``(4, 4)`` affine matrix."""
+    w, x, y, z = (float(v) for v in row[3:7])
+    rotation = np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    out = np.eye(4)
+    out[:3, :3] = rotation * row[7:10]
+    out[:3, 3] = row[0:3]
+    return out
+
+
+class CaptureFrame:
+    """
+    One captured frame with lazy NumPy views over its buffers.
+
+    Image accessors wrap the buffers received from the server without
+    copying; the arrays are read-only (``np.array(frame.rgb)`` for a
+    writable copy). Color is stored in Unreal's BGRA8 order, so ``rgb`` is a
+    strided view with reversed channels: pass ``bgra`` to libraries that take
+    BGRA (OpenCV, Pillow's ``"BGRA"`` raw mode) to avoid any conversion.
+
+    For code written against the dictionary returned by earlier versions,
+    ``frame["rgba8"]``, ``frame.get("depth_r32")`` and ``to_dict()`` return
+    the same keys and values as before (``"world_pose"`` as a ``Transform``,
+    ``"intrinsics"`` as a dict).
+    """
+
+    __slots__ = (
+        "_bgra",
+        "_color",
+        "_depth",
+        "_depth_buffer",
+        "_intrinsics",
+        "_msg",
+        "_pose",
+        "_transform",
+    )
+
+    def __init__(
+        self,
+        msg: capture_pb2.CaptureFrame,
+        bgra: NDArray[np.uint8] | None = None,
+        depth: NDArray[np.float32] | None = None,
+    ):
+        """
+        Args:
+            msg: Frame message received from the server.
+            bgra: Decoded ``(H, W, 4)`` color image, for compressed color.
+            depth: Decoded ``(H, W)`` depth image, for compressed depth.
+        """
+        self._msg = msg
+        self._color: bytes | None = None
+        self._depth_buffer: bytes | None = None
+        self._bgra = bgra
+        self._depth = depth
+        self._intrinsics: NDArray[np.float64] | None = None
+        self._pose: NDArray[np.float64] | None = None
+        self._transform: Transform | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"CaptureFrame(frame_id={self.frame_id}, size={self.width}x{self.height}, "
+            f"color={self.has_color}, depth={self.has_depth})"
+        )
+
+    # ----------------------------------------------------------------- metadata
+
+    @property
+    def proto(self) -> capture_pb2.CaptureFrame:
+        """Underlying protobuf message."""
+        return self._msg
+
+    @property
+    def camera_id(self) -> bytes:
+        return self._msg.camera_id.guid
+
+    @property
+    def frame_id(self) -> int:
+        return self._msg.frame_id
+
+    @property
+    def game_time(self) -> float:
+        return self._msg.game_time_seconds
+
+    @property
+    def gpu_ready(self) -> float:
+        return self._msg.gpu_ready_timestamp
+
+    @property
+    def width(self) -> int:
+        return self._msg.width
+
+    @property
+    def height(self) -> int:
+        return self._msg.height
+
+    @property
+    def has_color(self) -> bool:
+        return self._msg.has_color
+
+    @property
+    def has_depth(self) -> bool:
+        return self._msg.has_depth
+
+    @property
+    def depth_near(self) -> float:
+        return self._msg.depth_near
+
+    @property
+    def depth_far(self) -> float:
+        return self._msg.depth_far
+
+    @property
+    def depth_mode(self) -> int:
+        """``CaptureDepthMode`` the depth buffer is encoded with."""
+        return self._msg.depth_mode
+
+    # ------------------------------------------------------------------ buffers
+
+    @property
+    def color_codec(self) -> int:
+        """``CaptureRgbCodec`` of the color buffer (``NONE`` for raw BGRA8)."""
+        if self.has_color and self.color_bytes.startswith(_JPEG_MAGIC):
+            return capture_pb2.CAPTURE_RGB_CODEC_JPEG
+        return capture_pb2.CAPTURE_RGB_CODEC_NONE
+
+    @property
+    def depth_codec(self) -> int:
+        """``CaptureDepthCodec`` of the depth buffer (``NONE`` for raw float32)."""
+        if self.has_depth and self.depth_bytes.startswith(_EXR_MAGIC):
+            return capture_pb2.CAPTURE_DEPTH_CODEC_EXR
+        return capture_pb2.CAPTURE_DEPTH_CODEC_NONE
+
+    @property
+    def decoded(self) -> bool:
+        """Whether no buffer is left compressed (images are usable)."""
+        return (self._bgra is not None or self.color_codec == 0) and (
+            self._depth is not None or self.depth_codec == 0
+        )
+
+    @property
+    def color_bytes(self) -> bytes:
+        """Color buffer as received: raw BGRA8 or JPEG (empty without color)."""
+        if self._color is None:
+            self._color = self._msg.rgba8 if self._msg.has_color else b""
+        return self._color
+
+    @property
+    def depth_bytes(self) -> bytes:
+        """Depth buffer as received: raw float32 or EXR (empty without depth)."""
+        if self._depth_buffer is None:
+            self._depth_buffer = self._msg.depth_r32 if self._msg.has_depth else b""
+        return self._depth_buffer
+
+    def _image(
+        self, buffer: bytes, dtype: str, channels: int, codec: int
+    ) -> NDArray[Any]:
+        if codec != 0:
+            raise ValueError(
+                f"[CaptureFrame] frame {self.frame_id} holds a compressed buffer; "
+                f"decode it with FrameDecoder (or pass decoder= to CaptureAPI)."
+            )
+        h, w = self.height, self.width
+        count = h * w * channels
+        values = np.frombuffer(buffer, dtype=dtype)
+        if values.size != count:
+            raise ValueError(
+                f"[CaptureFrame] frame {self.frame_id}: buffer holds {values.size} "
+                f"values, expected {count} for {w}x{h}x{channels}."
+            )
+        return values.reshape((h, w, channels) if channels > 1 else (h, w))
+
+    @property
+    def bgra(self) -> NDArray[np.uint8] | None:
+        """``(H, W, 4)`` uint8 view of the color buffer, ``None`` without color."""
+        if self._bgra is None and self.has_color:
+            self._bgra = self._image(self.color_bytes, "u1", 4, self.color_codec)
+        return self._bgra
+
+    @property
+    def rgb(self) -> NDArray[np.uint8] | None:
+        """``(H, W, 3)`` RGB view of the color buffer (strided, no copy)."""
+        bgra = self.bgra
+        return None if bgra is None else bgra[..., 2::-1]
+
+    @property
+    def alpha(self) -> NDArray[np.uint8] | None:
+        """``(H, W)`` view of the alpha channel."""
+        bgra = self.bgra
+        return None if bgra is None else bgra[..., 3]
+
+    @property
+    def depth(self) -> NDArray[np.float32] | None:
+        """``(H, W)`` float32 view of the depth buffer, ``None`` without depth."""
+        if self._depth is None and self.has_depth:
+            self._depth = self._image(self.depth_bytes, "<f4", 1, self.depth_codec)
+        return self._depth
+
+    # ------------------------------------------------------------------ geometry
+
+    @property
+    def intrinsics(self) -> NDArray[np.float64]:
+        """
+        ``(3, 3)`` pinhole matrix ``[[fx, 0, cx], [0, fy, cy], [0, 0, 1]]``.
+
+        ``u = fx * y / x + cx`` and ``v = -fy * z / x + cy`` for a point
+        ``(x, y, z)`` in Unreal camera space (X forward, Y right, Z up).
+        """
+        if self._intrinsics is None:
+            k = self._msg.intrinsics
+            self._intrinsics = np.array(
+                [[k.fx, 0.0, k.cx], [0.0, k.fy, k.cy], [0.0, 0.0, 1.0]]
+            )
+        return self._intrinsics
+
+    @property
+    def world_pose(self) -> NDArray[np.float64]:
+        """
+        ``(4, 4)`` camera-to-world matrix (scale, rotate, translate).
+
+        Maps homogeneous points in Unreal camera space (X forward, Y right,
+        Z up, centimeters) to world space: ``world = pose @ [x, y, z, 1]``.
+        """
+        if self._pose is None:
+            row = proto_transforms_to_array([self._msg.world_pose])[0]
+            self._pose = _pose_matrix(row)
+        return self._pose
+
+    @property
+    def transform(self) -> Transform:
+        """Camera world pose as a ``Transform``."""
+        if self._transform is None:
+            self._transform = proto_to_sdk(self._msg.world_pose)
+        return self._transform
+
+    # ------------------------------------------------------- dictionary access
+
+    def _legacy(self, key: str) -> Any:
+        if key == "world_pose":
+            return self.transform
+        if key == "intrinsics":
+            k = self._msg.intrinsics
+            return {"fx": k.fx, "fy": k.fy, "cx": k.cx, "cy": k.cy}
+        if key == "rgba8":
+            return self.color_bytes
+        if key == "depth_r32":
+            return self.depth_bytes
+        return getattr(self, key)
+
+    def keys(self) -> list[str]:
+        """Keys of the dictionary form (buffers only when present)."""
+        return [
+            key
+            for key in _KEYS
+            if (key != "rgba8" or self.has_color)
+            and (key != "depth_r32" or self.has_depth)
+        ]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.keys():
+            raise KeyError(key)
+        return self._legacy(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._legacy(key) if key in self.keys() else default
+
+    def to_dict(self) -> dict[str, Any]:
+        """Dictionary form with the keys returned by earlier versions."""
+        return {key: self._legacy(key) for key in self.keys()}
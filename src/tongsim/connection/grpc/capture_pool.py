@@ -0,0 +1,347 @@
+"""
+connection.grpc.capture_pool
+
+Reuse of capture cameras across episodes.
+
+Creating a capture camera allocates its render targets on the UE side, and
+an episode that creates and destroys its cameras pays for that plus two RPCs
+every time. ``CameraPool`` hands out idle cameras instead and only creates
+one when none fits:
+
+- cameras are keyed by the parameters that size their render targets
+  (resolution, color source / format, depth and codec settings); other
+  parameters (``fov_degrees``, ``qps``, ``jpeg_quality`` ...) are updated in
+  place when an idle camera differs
+- a reused camera is moved with ``set_camera_pose`` / ``attach_camera``
+- idle cameras are destroyed least recently used first beyond ``max_idle``
+- ``warm`` creates cameras ahead of time, e.g. one per arena before the
+  first episode
+
+There is no detach RPC: a camera released while attached stays attached, so
+it is only handed out again to an ``acquire`` that attaches it.
+
+Exports:
+- CameraPool: pool of capture cameras on one connection
+"""
+
+import asyncio
+import contextlib
+import itertools
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import Any
+
+from tongsim.logger import get_logger
+from tongsim.math import Transform
+from tongsim_lite_protobuf import capture_pb2
+
+from .capture_api import CaptureAPI, _dict_to_params
+from .core import GrpcConnection
+
+__all__ = ["CameraPool"]
+
+_logger = get_logger("gRPC")
+
+# Parameters that size or format the camera's render targets.
+_SIGNATURE_FIELDS = (
+    "width",
+    "height",
+    "color_source",
+    "color_format",
+    "enable_depth",
+    "depth_mode",
+    "rgb_codec",
+    "depth_codec",
+)
+
+_Key = tuple[tuple[Any, ...], bool]
+
+
+def _signature(params: capture_pb2.CaptureCameraParams) -> tuple[Any, ...]:
+    return tuple(getattr(params, name) for name in _SIGNATURE_FIELDS)
+
+
+class _Pooled:
+    __slots__ = ("attached", "params")
+
+    def __init__(self, params: capture_pb2.CaptureCameraParams, attached: bool):
+        self.params = params
+        self.attached = attached
+
+    @property
+    def key(self) -> _Key:
+        return _signature(self.params), self.attached
+
+
+class CameraPool:
+    """
+    Capture cameras reused across episodes.
+
+    Usage::
+
+        pool = CameraPool(conn, max_idle=16)
+        await pool.warm(params, count=8)          # one per arena, up front
+        for episode in range(n):
+            cam = await pool.acquire(params, transform=pose)
+            ...
+            await pool.release(cam)
+        await pool.close()
+
+    or, per episode::
+
+        async with pool.camera(params, transform=pose) as cam:
+            frame = await CaptureAPI.capture_snapshot(conn, cam)
+
+    Stop any stream of a camera before releasing it; capturing cameras
+    reject parameter updates.
+    """
+
+    def __init__(self, conn: GrpcConnection, max_idle: int = 16, name_prefix: str = ""):
+        """
+        Args:
+            conn: Connection the cameras are created on.
+            max_idle: Idle cameras kept; the least recently used beyond it
+                are destroyed on ``release``.
+            name_prefix: ``capture_name`` prefix of created cameras; empty
+                lets the server name them.
+        """
+        self._conn = conn
+        self._max_idle = max_idle
+        self._name_prefix = name_prefix
+        self._idle: OrderedDict[bytes, _Pooled] = OrderedDict()
+        self._in_use: dict[bytes, _Pooled] = {}
+        # Advanced before the create RPC, so concurrent creations differ.
+        self._names = itertools.count()
+        self._counters = dict.fromkeys(
+            ("created", "reused", "updated", "destroyed", "failed"), 0
+        )
+
+    # ---------------------------
+    # Acquire / release
+    # ---------------------------
+
+    def _take_idle(self, key: _Key) -> tuple[bytes, _Pooled] | None:
+        # Most recently released first: its state is the freshest on the server.
+        for camera_id in reversed(self._idle):
+            if self._idle[camera_id].key == key:
+                return camera_id, self._idle.pop(camera_id)
+        return None
+
+    async def _create(
+        self,
+        msg: capture_pb2.CaptureCameraParams,
+        params: dict[str, Any],
+        transform: Transform | None,
+        attach_parent: bytes | None,
+        attach_socket: str,
+        keep_world: bool,
+    ) -> tuple[bytes, _Pooled] | None:
+        name = None
+        if self._name_prefix:
+            name = f"{self._name_prefix}_{next(self._names)}"
+        camera_id = await CaptureAPI.create_camera(
+            self._conn,
+            transform=transform if transform is not None else Transform(),
+            params=params,
+            capture_name=name,
+            attach_parent=attach_parent,
+            attach_socket=attach_socket,
+            keep_world=keep_world,
+        )
+        if camera_id is None:
+            self._counters["failed"] += 1
+            return None
+        self._counters["created"] += 1
+        return camera_id, _Pooled(msg, attach_parent is not None)
+
+    async def _reuse(
+        self,
+        camera_id: bytes,
+        pooled: _Pooled,
+        msg: capture_pb2.CaptureCameraParams,
+        params: dict[str, Any],
+        transform: Transform | None,
+        attach_parent: bytes | None,
+        attach_socket: str,
+        keep_world: bool,
+    ) -> bool:
+        if pooled.params != msg:
+            if not await CaptureAPI.update_camera_params(self._conn, camera_id, params):
+                return False
+            pooled.params = msg
+            self._counters["updated"] += 1
+        if transform is not None and not await CaptureAPI.set_camera_pose(
+            self._conn, camera_id, transform
+        ):
+            return False
+        if attach_parent is None:
+            return True
+        return await CaptureAPI.attach_camera(
+            self._conn, camera_id, attach_parent, attach_socket, keep_world
+        )
+
+    async def acquire(
+        self,
+        params: dict[str, Any],
+        *,
+        transform: Transform | None = None,
+        attach_parent: bytes | None = None,
+        attach_socket: str = "",
+        keep_world: bool = True,
+    ) -> bytes | None:
+        """
+        Hand out a camera with ``params``, reusing an idle one when possible.
+
+        Args:
+            params: Camera parameters, as for ``create_camera``.
+            transform: World pose; ``None`` keeps a reused camera where it is
+                (new cameras start at the origin).
+            attach_parent: Actor to attach the camera to.
+            attach_socket: Socket on the parent.
+            keep_world: Keep the world pose when attaching.
+
+        Returns:
+            bytes | None: Camera id, or ``None`` if no camera could be created.
+        """
+        msg = _dict_to_params(params)
+        key = (_signature(msg), attach_parent is not None)
+        while (idle := self._take_idle(key)) is not None:
+            camera_id, pooled = idle
+            if await self._reuse(
+                camera_id,
+                pooled,
+                msg,
+                params,
+                transform,
+                attach_parent,
+                attach_socket,
+                keep_world,
+            ):
+                self._counters["reused"] += 1
+                self._in_use[camera_id] = pooled
+                return camera_id
+            # Most likely destroyed with its level; forget it and try the next.
+            _logger.warning(
+                f"[CameraPool] dropping camera {camera_id.hex()[:8]} that "
+                "could not be reused."
+            )
+            self._counters["failed"] += 1
+            await CaptureAPI.destroy_camera(self._conn, camera_id)
+        created = await self._create(
+            msg, params, transform, attach_parent, attach_socket, keep_world
+        )
+        if created is None:
+            return None
+        camera_id, pooled = created
+        self._in_use[camera_id] = pooled
+        return camera_id
+
+    async def release(self, camera_id: bytes) -> None:
+        """Return a camera to the pool and trim the idle cameras to ``max_idle``."""
+        pooled = self._in_use.pop(camera_id, None)
+        if pooled is None:
+            raise KeyError(f"[CameraPool] camera {camera_id.hex()} is not in use.")
+        self._idle[camera_id] = pooled
+        await self.trim()
+
+    @contextlib.asynccontextmanager
+    async def camera(
+        self,
+        params: dict[str, Any],
+        *,
+        transform: Transform | None = None,
+        attach_parent: bytes | None = None,
+        attach_socket: str = "",
+        keep_world: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """``acquire`` a camera for the block and ``release`` it afterwards."""
+        camera_id = await self.acquire(
+            params,
+            transform=transform,
+            attach_parent=attach_parent,
+            attach_socket=attach_socket,
+            keep_world=keep_world,
+        )
+        if camera_id is None:
+            raise RuntimeError("[CameraPool] could not create a capture camera.")
+        try:
+            yield camera_id
+        finally:
+            await self.release(camera_id)
+
+    # ---------------------------
+    # Sizing
+    # ---------------------------
+
+    async def warm(
+        self, params: dict[str, Any], count: int, transform: Transform | None = None
+    ) -> int:
+        """
+        Create cameras up front until ``count`` idle ones match ``params``.
+
+        Cameras are created concurrently. Keep ``max_idle`` at least as large
+        as the warmed total, or the next ``release`` trims them again.
+
+        Returns:
+            int: Number of cameras created.
+        """
+        msg = _dict_to_params(params)
+        key = (_signature(msg), False)
+        missing = count - sum(1 for p in self._idle.values() if p.key == key)
+        if missing <= 0:
+            return 0
+        created = await asyncio.gather(
+            *(
+                self._create(msg, params, transform, None, "", True)
+                for _ in range(missing)
+            )
+        )
+        made = [c for c in created if c is not None]
+        for camera_id, pooled in made:
+            # Warmed cameras count as least recently used.
+            self._idle[camera_id] = pooled
+            self._idle.move_to_end(camera_id, last=False)
+        return len(made)
+
+    async def trim(self, max_idle: int | None = None) -> int:
+        """
+        Destroy idle cameras, least recently used first, beyond ``max_idle``.
+
+        Args:
+            max_idle: Idle cameras to keep; the pool's ``max_idle`` by default.
+
+        Returns:
+            int: Number of cameras destroyed.
+        """
+        keep = self._max_idle if max_idle is None else max_idle
+        victims = []
+        while len(self._idle) > keep:
+            camera_id, _ = self._idle.popitem(last=False)
+            victims.append(camera_id)
+        if victims:
+            await asyncio.gather(
+                *(CaptureAPI.destroy_camera(self._conn, cid) for cid in victims)
+            )
+            self._counters["destroyed"] += len(victims)
+        return len(victims)
+
+    async def close(self) -> None:
+        """Destroy every idle and in-use camera of the pool."""
+        victims = [*self._idle, *self._in_use]
+        self._idle.clear()
+        self._in_use.clear()
+        await asyncio.gather(
+            *(CaptureAPI.destroy_camera(self._conn, cid) for cid in victims)
+        )
+        self._counters["destroyed"] += len(victims)
+
+    def stats(self) -> dict[str, int]:
+        """Counters: ``created`` / ``reused`` / ``updated`` / ``destroyed`` / ``failed`` cameras, plus ``idle`` and ``in_use``."""
+        return {
+            **self._counters,
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+        }
+
+    def __len__(self) -> int:
+        return len(self._idle) + len(self._in_use)
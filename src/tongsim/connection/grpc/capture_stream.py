@@ -0,0 +1,423 @@
+"""
+connection.grpc.capture_stream
+
+Continuous capture over one server-streaming call.
+
+``CaptureService.StreamFrames`` pushes frames of several cameras at their
+capture rate, so a vision policy no longer pays one ``CaptureSnapshot`` round
+trip (and its timeout) per frame. ``FrameStream`` reads the stream into a
+bounded ring buffer per camera:
+
+- ``drop_oldest``: a full ring discards its oldest frame (freshest data wins)
+- ``drop_newest``: a full ring discards the incoming frame
+- ``block``: the reader stops draining the stream until there is room, and
+  HTTP/2 flow control pushes back on the server
+
+``latest()`` always returns the most recent frame received per camera,
+independent of what has been consumed, for control loops that only care
+about the current observation. Frame ids increase per camera; a jump is
+counted as ``gaps`` (frames the server skipped) separately from frames
+dropped locally.
+
+Against a server without ``StreamFrames`` the stream falls back to polling
+``CaptureSnapshot`` at the requested rate.
+
+With a ``FrameDecoder``, compressed frames (JPEG / EXR cameras) are decoded
+as they are consumed, on the decoder's pool; frames a ring drops are never
+decoded.
+
+Exports:
+- DropPolicy: what a full ring buffer does with new frames
+- FrameStream: streaming session with per-camera ring buffers
+"""
+
+import asyncio
+import contextlib
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from enum import StrEnum
+from typing import Any
+
+import grpc
+import grpc.aio
+
+from tongsim.logger import get_logger
+from tongsim_lite_protobuf import capture_pb2, capture_pb2_grpc, object_pb2
+
+from .capture_codec import FrameDecoder
+from .capture_frame import CaptureFrame
+from .core import GrpcConnection
+
+__all__ = ["DropPolicy", "FrameStream"]
+
+_logger = get_logger("gRPC")
+
+
+class DropPolicy(StrEnum):
+    """What a full per-camera ring buffer does with an incoming frame."""
+
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest queued frame to make room."""
+    DROP_NEWEST = "drop_newest"
+    """Discard the incoming frame (``latest()`` still sees it)."""
+    BLOCK = "block"
+    """Stop reading the stream until the consumer frees a slot."""
+
+
+class _CameraRing:
+    """Queued frames and counters of one camera."""
+
+    __slots__ = (
+        "blocked_s",
+        "delivered",
+        "dropped",
+        "first_at",
+        "frames",
+        "gaps",
+        "last_at",
+        "last_frame_id",
+        "latest",
+        "latest_seq",
+        "received",
+        "reordered",
+    )
+
+    def __init__(self):
+        self.frames: deque[CaptureFrame] = deque()
+        self.latest: CaptureFrame | None = None
+        self.latest_seq = -1
+        self.last_frame_id: int | None = None
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.gaps = 0
+        self.reordered = 0
+        self.blocked_s = 0.0
+        self.first_at = 0.0
+        self.last_at = 0.0
+
+    def account(self, frame_id: int) -> None:
+        last = self.last_frame_id
+        if last is not None:
+            if frame_id > last + 1:
+                self.gaps += frame_id - last - 1
+            elif frame_id <= last:
+                self.reordered += 1
+        if last is None or frame_id > last:
+            self.last_frame_id = frame_id
+
+    def stats(self) -> dict[str, Any]:
+        span = self.last_at - self.first_at
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "gaps": self.gaps,
+            "reordered": self.reordered,
+            "queued": len(self.frames),
+            "last_frame_id": self.last_frame_id,
+            "fps": (self.received - 1) / span if span > 0 else 0.0,
+            "blocked_s": self.blocked_s,
+        }
+
+
+class FrameStream:
+    """
+    Frames of one or more capture cameras, streamed into bounded ring buffers.
+
+    Usage::
+
+        async with CaptureAPI.stream_frames(conn, [cam_a, cam_b], qps=30) as frames:
+            async for frame in frames:          # cameras in turn
+                policy.observe(frame.rgb)
+
+    or, in a control loop that only wants the freshest observation::
+
+        async with CaptureAPI.stream_frames(conn, cam, qps=30) as frames:
+            while running:
+                frame = frames.latest(cam)      # never waits
+                ...
+
+    With ``DropPolicy.BLOCK`` one slow camera stalls the whole stream, since
+    all cameras share the call.
+    """
+
+    def __init__(
+        self,
+        conn: GrpcConnection,
+        camera_ids: bytes | Sequence[bytes],
+        qps: float = 0.0,
+        *,
+        include_color: bool = True,
+        include_depth: bool = True,
+        buffer_size: int = 4,
+        policy: DropPolicy | str = DropPolicy.DROP_OLDEST,
+        decoder: FrameDecoder | None = None,
+        name: str = "FrameStream",
+    ):
+        """
+        Args:
+            conn: Connection to the UE server.
+            camera_ids: Capture camera id, or several.
+            qps: Frames per second per camera; ``0`` keeps each camera's
+                configured ``qps`` (snapshot fallback: as fast as possible).
+            include_color: Stream the color buffer.
+            include_depth: Stream the depth buffer.
+            buffer_size: Frames each camera's ring buffer holds.
+            policy: What a full ring buffer does with a new frame.
+            decoder: Decodes compressed frames returned by ``get`` and
+                iteration (``latest()`` returns them as received).
+            name: Name used in logs.
+        """
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be >= 1, got {buffer_size}.")
+        if isinstance(camera_ids, bytes | bytearray):
+            camera_ids = [camera_ids]
+        self._conn = conn
+        self._camera_ids = [bytes(c) for c in camera_ids]
+        self._qps = float(qps)
+        self._include_color = include_color
+        self._include_depth = include_depth
+        self._capacity = buffer_size
+        self._policy = DropPolicy(policy)
+        self._decoder = decoder
+        self._name = name
+        self._rings: dict[bytes, _CameraRing] = {
+            c: _CameraRing() for c in self._camera_ids
+        }
+        self._changed = asyncio.Condition()
+        self._seq = itertools.count()
+        self._turn = -1
+        self._call: grpc.aio.UnaryStreamCall | None = None
+        self._read_task: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+        self._done = False
+        self._closing = False
+        self._streaming = False
+
+    async def start(self) -> None:
+        """Open the stream and start the reader."""
+        if self._read_task is not None:
+            raise RuntimeError(f"[{self._name}] already started.")
+        self._read_task = asyncio.get_running_loop().create_task(
+            self._read_loop(), name=f"[{self._name}] reader"
+        )
+
+    async def __aenter__(self) -> "FrameStream":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    # ---------------------------
+    # Reader
+    # ---------------------------
+
+    def _ring(self, camera_id: bytes) -> _CameraRing:
+        ring = self._rings.get(camera_id)
+        if ring is None:
+            _logger.warning(f"[{self._name}] frame from unrequested camera.")
+            ring = self._rings[camera_id] = _CameraRing()
+        return ring
+
+    async def _push(self, frame: CaptureFrame) -> None:
+        ring = self._ring(frame.camera_id)
+        now = time.monotonic()
+        if not ring.received:
+            ring.first_at = now
+        ring.last_at = now
+        ring.received += 1
+        ring.account(frame.frame_id)
+        ring.latest, ring.latest_seq = frame, next(self._seq)
+        async with self._changed:
+            if len(ring.frames) >= self._capacity:
+                if self._policy is DropPolicy.DROP_NEWEST:
+                    ring.dropped += 1
+                    return
+                if self._policy is DropPolicy.DROP_OLDEST:
+                    ring.frames.popleft()
+                    ring.dropped += 1
+                else:
+                    start = time.monotonic()
+                    await self._changed.wait_for(
+                        lambda: len(ring.frames) < self._capacity or self._closing
+                    )
+                    ring.blocked_s += time.monotonic() - start
+            ring.frames.append(frame)
+            self._changed.notify_all()
+
+    async def _read_loop(self) -> None:
+        try:
+            if self._conn.supports("StreamFrames"):
+                try:
+                    await self._read_stream()
+                    self._error = ConnectionError(
+                        f"[{self._name}] stream closed by server."
+                    )
+                    return
+                except grpc.aio.AioRpcError as e:
+                    if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                        raise
+                    self._conn.mark_unsupported("StreamFrames")
+                    self._streaming = False
+            _logger.info(
+                f"[{self._name}] StreamFrames unavailable; polling CaptureSnapshot."
+            )
+            await asyncio.gather(*(self._poll(c) for c in self._camera_ids))
+        except asyncio.CancelledError:
+            self._error = ConnectionError(f"[{self._name}] stream closed.")
+            raise
+        except Exception as e:
+            _logger.warning(f"[{self._name}] reader stopped: {e}")
+            self._error = e
+        finally:
+            self._done = True
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def _read_stream(self) -> None:
+        stub = self._conn.get_stub(capture_pb2_grpc.CaptureServiceStub)
+        req = capture_pb2.StreamFramesRequest(
+            camera_ids=[object_pb2.ObjectId(guid=c) for c in self._camera_ids],
+            qps=self._qps,
+            include_color=self._include_color,
+            include_depth=self._include_depth,
+        )
+        self._call = stub.StreamFrames(req)
+        self._streaming = True
+        async for msg in self._call:
+            await self._push(CaptureFrame(msg))
+
+    async def _poll(self, camera_id: bytes) -> None:
+        stub = self._conn.get_stub(capture_pb2_grpc.CaptureServiceStub)
+        period = 1.0 / self._qps if self._qps > 0 else 0.0
+        req = capture_pb2.CaptureSnapshotRequest(
+            camera_id=object_pb2.ObjectId(guid=camera_id),
+            include_color=self._include_color,
+            include_depth=self._include_depth,
+            timeout_seconds=max(0.5, 2.0 * period),
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            try:
+                await self._push(CaptureFrame(await stub.CaptureSnapshot(req)))
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+                    raise
+                _logger.debug(f"[{self._name}] snapshot timed out; retrying.")
+            deadline = max(deadline + period, loop.time())
+            await asyncio.sleep(deadline - loop.time())
+
+    # ---------------------------
+    # Consumer side
+    # ---------------------------
+
+    def _has_frames(self, camera_id: bytes | None) -> bool:
+        if camera_id is None:
+            return any(ring.frames for ring in self._rings.values())
+        ring = self._rings.get(camera_id)
+        return ring is not None and bool(ring.frames)
+
+    def _next_ring(self, camera_id: bytes | None) -> _CameraRing | None:
+        if camera_id is not None:
+            ring = self._rings.get(camera_id)
+            return ring if ring is not None and ring.frames else None
+        # Serve cameras in turn: with drop_oldest the ring consumed last keeps
+        # the oldest head, so picking the oldest frame would starve the rest.
+        rings = list(self._rings.values())
+        for step in range(1, len(rings) + 1):
+            ring = rings[(self._turn + step) % len(rings)]
+            if ring.frames:
+                self._turn = (self._turn + step) % len(rings)
+                return ring
+        return None
+
+    async def get(self, camera_id: bytes | None = None) -> CaptureFrame:
+        """
+        Remove and return the oldest queued frame of a camera.
+
+        Args:
+            camera_id: Only take frames of this camera; ``None`` takes the
+                next camera with queued frames, cameras in turn.
+
+        Raises:
+            ConnectionError | grpc.aio.AioRpcError: Once the stream has ended
+                and every queued frame has been consumed.
+        """
+        if self._read_task is None:
+            raise RuntimeError(f"[{self._name}] not started.")
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self._done or self._has_frames(camera_id)
+            )
+            ring = self._next_ring(camera_id)
+            if ring is None:
+                raise self._error
+            frame = ring.frames.popleft()
+            ring.delivered += 1
+            self._changed.notify_all()
+        if self._decoder is not None:
+            return await self._decoder.decode(frame)
+        return frame
+
+    async def frames(self) -> AsyncIterator[CaptureFrame]:
+        """
+        Iterate frames of all cameras, one camera after another.
+
+        Ends quietly after ``aclose``; a stream that failed raises its error.
+        """
+        while True:
+            try:
+                yield await self.get()
+            except Exception:
+                if self._closing:
+                    return
+                raise
+
+    def __aiter__(self) -> AsyncIterator[CaptureFrame]:
+        return self.frames()
+
+    def latest(self, camera_id: bytes | None = None) -> CaptureFrame | None:
+        """
+        Most recent frame received, without waiting or consuming it.
+
+        Args:
+            camera_id: Camera to look at; ``None`` picks the most recent frame
+                of any camera.
+        """
+        if camera_id is not None:
+            ring = self._rings.get(camera_id)
+            return ring.latest if ring is not None else None
+        ring = max(self._rings.values(), key=lambda r: r.latest_seq, default=None)
+        return ring.latest if ring is not None else None
+
+    @property
+    def streaming(self) -> bool:
+        """``True`` when frames come from ``StreamFrames`` (not snapshot polling)."""
+        return self._streaming
+
+    def stats(self) -> dict[bytes, dict[str, Any]]:
+        """
+        Per-camera counters.
+
+        ``received`` frames arrived, ``delivered`` were consumed via
+        ``get``/iteration, ``dropped`` were discarded by the ring buffer,
+        ``gaps`` counts frame ids the server skipped, ``reordered`` frames
+        arrived with a non-increasing id; plus ``queued``, ``last_frame_id``,
+        the measured ``fps`` and ``blocked_s`` spent waiting under ``block``.
+        """
+        return {camera_id: ring.stats() for camera_id, ring in self._rings.items()}
+
+    async def aclose(self) -> None:
+        """Cancel the stream and stop the reader; queued frames stay readable."""
+        self._closing = True
+        if self._call is not None:
+            self._call.cancel()
+        if self._read_task is not None:
+            self._read_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._read_task
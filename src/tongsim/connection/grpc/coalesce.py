@@ -0,0 +1,241 @@
+"""
+connection.grpc.coalesce
+
+Request coalescing for per-actor reads.
+
+Agent loops typically ``asyncio.gather`` one ``get_actor_transform`` per
+actor every step. ``Coalescer`` collects single-key reads issued within a
+short window (by default: the same event-loop tick) and resolves all of them
+from one batched fetch, so N concurrent reads cost one round trip.
+
+``ActorReadCoalescer`` applies this to the ``DemoRLService`` reads of one
+connection:
+
+- transforms are merged into ``BatchGetActorTransforms``; when the server
+  does not implement it, the batch is fanned out as concurrent unary
+  ``GetActorTransform`` calls instead (the pre-batching behaviour);
+- states are merged into ``BatchGetActorStates`` the same way, falling back
+  to concurrent ``GetActorState`` calls.
+
+Exports:
+- Coalescer: generic key -> value read coalescing
+- ActorReadCoalescer: per-connection transform/state read coalescing
+- actor_read_coalescer: get (or create) the coalescer of a connection
+"""
+
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+import grpc
+import grpc.aio
+from tongsim_lite_protobuf.common_pb2 import Transform as ProtoTransform
+from tongsim_lite_protobuf.demo_rl_pb2 import (
+    ActorState,
+    BatchGetActorStatesRequest,
+    BatchGetActorTransformsRequest,
+    GetActorStateRequest,
+    GetActorTransformRequest,
+)
+from tongsim_lite_protobuf.demo_rl_pb2_grpc import DemoRLServiceStub
+
+from .actor_id import ActorId
+from .core import GrpcConnection
+
+__all__ = ["ActorReadCoalescer", "Coalescer", "actor_read_coalescer"]
+
+
+class Coalescer[K: Hashable, V]:
+    """
+    Merge concurrent ``get(key)`` calls into batched ``fetch(keys)`` calls.
+
+    A batch is flushed ``window_s`` after its first key arrives (``0`` means
+    at the next event-loop iteration, which catches everything started by one
+    ``asyncio.gather``) or as soon as it holds ``max_batch`` distinct keys.
+    Duplicate keys in a batch are fetched once.
+
+    ``fetch`` returns one value per key, in order; a value that is an
+    exception is raised to that key's callers only. If ``fetch`` itself
+    raises, every caller of the batch sees the error.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[list[K]], Awaitable[Sequence[V | BaseException]]],
+        window_s: float = 0.0,
+        max_batch: int = 256,
+    ):
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._fetch = fetch
+        self._pending: dict[K, list[asyncio.Future[V]]] = {}
+        self._timer: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._requests = 0
+        self._batches = 0
+        self._keys = 0
+
+    async def get(self, key: K) -> V:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[V] = loop.create_future()
+        self._requests += 1
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.window_s > 0:
+                self._timer = loop.call_later(self.window_s, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self._batches += 1
+        self._keys += len(batch)
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, list[asyncio.Future[V]]]) -> None:
+        keys = list(batch)
+        try:
+            values = await self._fetch(keys)
+        except asyncio.CancelledError:
+            for waiters in batch.values():
+                for future in waiters:
+                    future.cancel()
+            raise
+        except BaseException as e:
+            values = [e] * len(keys)
+        for key, value in zip(keys, values, strict=True):
+            for future in batch[key]:
+                if future.done():
+                    continue  # The caller gave up (cancelled) meanwhile.
+                if isinstance(value, BaseException):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+
+    def stats(self) -> dict[str, float]:
+        """``requests``, ``batches``, distinct ``keys`` fetched and ``mean_batch`` size."""
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "keys": self._keys,
+            "mean_batch": self._requests / self._batches if self._batches else 0.0,
+        }
+
+
+class ActorReadCoalescer:
+    """
+    Coalesces ``GetActorTransform`` / ``GetActorState`` reads of one connection.
+
+    Attributes:
+        enabled: When ``False``, ``UnaryAPI`` issues one unary RPC per read.
+        timeout: Per-RPC timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        conn: GrpcConnection,
+        window_s: float = 0.0,
+        max_batch: int = 256,
+        timeout: float = 2.0,
+    ):
+        # Weak: the registry below is keyed by the connection.
+        self._conn = weakref.ref(conn)
+        self.enabled = True
+        self.timeout = timeout
+        self.transforms: Coalescer[ActorId, ProtoTransform | None] = Coalescer(
+            self._fetch_transforms, window_s, max_batch
+        )
+        self.states: Coalescer[ActorId, ActorState | None] = Coalescer(
+            self._fetch_states, window_s, max_batch
+        )
+
+    @property
+    def window_s(self) -> float:
+        return self.transforms.window_s
+
+    @window_s.setter
+    def window_s(self, value: float) -> None:
+        self.transforms.window_s = self.states.window_s = value
+
+    def _connection(self) -> GrpcConnection:
+        conn = self._conn()
+        if conn is None:
+            raise RuntimeError("[ActorReadCoalescer] connection is gone.")
+        return conn
+
+    async def _fetch_transforms(
+        self, actors: list[ActorId]
+    ) -> list[ProtoTransform | BaseException | None]:
+        conn = self._connection()
+        stub = conn.get_stub(DemoRLServiceStub)
+        if len(actors) > 1 and conn.supports("BatchGetActorTransforms"):
+            req = BatchGetActorTransformsRequest(
+                actor_ids=[a.object_id for a in actors]
+            )
+            try:
+                resp = await stub.BatchGetActorTransforms(req, timeout=self.timeout)
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                conn.mark_unsupported("BatchGetActorTransforms")
+            else:
+                return [r.transform if r.found else None for r in resp.results]
+
+        async def one(actor: ActorId) -> ProtoTransform:
+            req = GetActorTransformRequest(actor_id=actor.object_id)
+            return (await stub.GetActorTransform(req, timeout=self.timeout)).transform
+
+        return await asyncio.gather(*(one(a) for a in actors), return_exceptions=True)
+
+    async def _fetch_states(
+        self, actors: list[ActorId]
+    ) -> list[ActorState | BaseException | None]:
+        conn = self._connection()
+        stub = conn.get_stub(DemoRLServiceStub)
+        if len(actors) > 1 and conn.supports("BatchGetActorStates"):
+            req = BatchGetActorStatesRequest(actor_ids=[a.object_id for a in actors])
+            try:
+                resp = await stub.BatchGetActorStates(req, timeout=self.timeout)
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                conn.mark_unsupported("BatchGetActorStates")
+            else:
+                return [r.actor_state if r.found else None for r in resp.results]
+
+        async def one(actor: ActorId) -> ActorState | None:
+            req = GetActorStateRequest(actor_id=actor.object_id)
+            return (await stub.GetActorState(req, timeout=self.timeout)).actor_state
+
+        return await asyncio.gather(*(one(a) for a in actors), return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Coalescing counters per read kind."""
+        return {
+            "transforms": self.transforms.stats(),
+            "states": self.states.stats(),
+        }
+
+
+_coalescers: weakref.WeakKeyDictionary[GrpcConnection, ActorReadCoalescer] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def actor_read_coalescer(conn: GrpcConnection) -> ActorReadCoalescer:
+    """The ``ActorReadCoalescer`` of ``conn``, created on first use."""
+    coalescer = _coalescers.get(conn)
+    if coalescer is None:
+        coalescer = _coalescers[conn] = ActorReadCoalescer(conn)
+    return coalescer
@@ -0,0 +1,416 @@
+"""
+connection.grpc.control_stream
+
+High-frequency control over one long-lived bidirectional stream
+(``ControlService.ControlStream``) instead of one unary RPC per action.
+
+- ``ActionBatch`` builds a typed batch of moves, teleports and traces.
+- ``ControlStream`` writes batches, tags each with a request id and matches
+  the server's results back to the caller.
+- Flow control: at most ``max_in_flight`` batches may await a result; further
+  ``send`` calls wait for a slot. Results nobody is awaiting go to a bounded
+  queue; when it is full the reader stops draining the stream, so HTTP/2 flow
+  control pushes back on the server instead of buffering without limit.
+- A ``request`` that times out (or is cancelled) abandons its id: its window
+  slot is freed at once and a late result is dropped, so timeouts neither
+  fill the queue nor shrink the window.
+
+Exports:
+- ActionBatch: batch builder
+- ControlStream: stream session with request-id correlation
+- ControlStreamReader / ControlStreamWriter: codec on top of ``BidiStream``
+"""
+
+import asyncio
+import contextlib
+import itertools
+from collections.abc import AsyncIterator
+from typing import Any
+
+import grpc.aio
+
+from tongsim.logger import get_logger
+from tongsim.math import Transform, Vector3
+from tongsim.type.rl_demo import RLDemoOrientationMode
+from tongsim_lite_protobuf import control_pb2, control_pb2_grpc
+
+from .bidi_stream import BidiStream, BidiStreamReader, BidiStreamWriter
+from .core import GrpcConnection
+from .unary_api import _actor_state_to_dict, _to_object_id
+from .utils import proto_to_sdk, sdk_to_proto
+
+__all__ = [
+    "ActionBatch",
+    "ControlStream",
+    "ControlStreamReader",
+    "ControlStreamWriter",
+]
+
+_logger = get_logger("gRPC")
+
+
+class ActionBatch:
+    """
+    Ordered list of actions executed by the server in the same tick.
+
+    Example::
+
+        batch = (
+            ActionBatch()
+            .move(agent_id, target, speed_uu_per_sec=300.0)
+            .teleport(box_id, Transform(location=Vector3(0, 0, 50)))
+            .trace(start, end, object_types=[CollisionObjectType.OBJECT_WORLD_STATIC])
+        )
+    """
+
+    __slots__ = ("_actions", "kinds")
+
+    def __init__(self):
+        self._actions: list[control_pb2.Action] = []
+        self.kinds: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def move(
+        self,
+        actor_id: bytes | str | dict,
+        target_location: Vector3,
+        orientation_mode: RLDemoOrientationMode = RLDemoOrientationMode.ORIENTATION_KEEP_CURRENT,
+        given_forward: Vector3 | None = None,
+        speed_uu_per_sec: float | None = None,
+        tolerance_uu: float | None = None,
+    ) -> "ActionBatch":
+        """Move toward ``target_location`` for this tick (does not wait for arrival)."""
+        action = control_pb2.Action()
+        move = action.move
+        move.actor_id.CopyFrom(_to_object_id(actor_id))
+        move.target_location.CopyFrom(sdk_to_proto(target_location))
+        move.orientation_mode = orientation_mode
+        if (
+            orientation_mode == RLDemoOrientationMode.ORIENTATION_GIVEN
+            and given_forward is not None
+        ):
+            move.given_orientation.CopyFrom(sdk_to_proto(given_forward))
+        if speed_uu_per_sec is not None:
+            move.speed_uu_per_sec = float(speed_uu_per_sec)
+        if tolerance_uu is not None:
+            move.tolerance_uu = float(tolerance_uu)
+        return self._append(action, "move")
+
+    def teleport(
+        self, actor_id: bytes | str | dict, transform: Transform
+    ) -> "ActionBatch":
+        """Set the actor's world transform."""
+        action = control_pb2.Action()
+        action.teleport.actor_id.CopyFrom(_to_object_id(actor_id))
+        action.teleport.transform.CopyFrom(sdk_to_proto(transform))
+        return self._append(action, "teleport")
+
+    def trace(
+        self,
+        start: Vector3,
+        end: Vector3,
+        object_types: list[int],
+        trace_complex: bool | None = None,
+        actors_to_ignore: list[bytes | str | dict] | None = None,
+    ) -> "ActionBatch":
+        """Single line trace by object type (see ``single_line_trace_by_object``)."""
+        action = control_pb2.Action()
+        job = action.trace.job
+        job.start.CopyFrom(sdk_to_proto(start))
+        job.end.CopyFrom(sdk_to_proto(end))
+        job.object_types.extend(int(ot) for ot in object_types)
+        if trace_complex is not None:
+            job.trace_complex = bool(trace_complex)
+        for ig in actors_to_ignore or []:
+            job.actors_to_ignore.add().CopyFrom(_to_object_id(ig))
+        return self._append(action, "trace")
+
+    def _append(self, action: control_pb2.Action, kind: str) -> "ActionBatch":
+        self._actions.append(action)
+        self.kinds.append(kind)
+        return self
+
+    def to_proto(self, request_id: int) -> control_pb2.ActionBatch:
+        return control_pb2.ActionBatch(request_id=request_id, actions=self._actions)
+
+
+def _decode_result(r: Any) -> dict:
+    item: dict[str, Any] = {"success": bool(r.success), "message": r.message}
+    kind = r.WhichOneof("kind")
+    if kind == "move":
+        item["current_location"] = proto_to_sdk(r.move.current_location)
+        item["hit_actor"] = (
+            _actor_state_to_dict(r.move.hit_result.hit_actor)
+            if r.move.HasField("hit_result")
+            else None
+        )
+    elif kind == "trace":
+        item["blocking_hit"] = bool(r.trace.blocking_hit)
+        item["distance"] = float(r.trace.distance)
+        item["impact_point"] = proto_to_sdk(r.trace.impact_point)
+        if r.trace.HasField("actor_state"):
+            item["actor_state"] = _actor_state_to_dict(r.trace.actor_state)
+    return item
+
+
+class ControlStreamWriter(BidiStreamWriter):
+    """Encode ``(request_id, ActionBatch)`` into ``ActionBatch`` protos."""
+
+    def _encode(self, request_id: int, batch: ActionBatch) -> control_pb2.ActionBatch:
+        return batch.to_proto(request_id)
+
+
+class ControlStreamReader(BidiStreamReader[tuple[int, list[dict]] | None]):
+    """Decode ``ActionBatchResult`` into ``(request_id, [result dict, ...])``."""
+
+    async def read(self) -> tuple[int, list[dict]] | None:
+        """Read one result; ``None`` once the server has closed the stream."""
+        grpc_resp = await self._stream.read()
+        if grpc_resp is grpc.aio.EOF:
+            return None
+        return self._decode(grpc_resp)
+
+    def _decode(
+        self, grpc_resp: control_pb2.ActionBatchResult
+    ) -> tuple[int, list[dict]]:
+        return int(grpc_resp.request_id), [_decode_result(r) for r in grpc_resp.results]
+
+
+class ControlStream:
+    """
+    Bidirectional control session on ``ControlService.ControlStream``.
+
+    Usage::
+
+        async with ControlStream(conn) as ctl:
+            results = await ctl.request(ActionBatch().move(agent, goal))
+
+    Each result list is aligned with the batch's actions; every entry has
+    ``success``/``message`` plus ``current_location``/``hit_actor`` for moves
+    or ``blocking_hit``/``distance``/``impact_point``/``actor_state`` for
+    traces.
+    """
+
+    def __init__(
+        self,
+        conn: GrpcConnection,
+        max_in_flight: int = 8,
+        result_queue_size: int = 64,
+        name: str = "ControlStream",
+    ):
+        """
+        Args:
+            conn: Connection to the UE server.
+            max_in_flight: Batches that may await a result at once; ``send``
+                waits for a free slot beyond that.
+            result_queue_size: Capacity of the queue for results consumed via
+                ``results()``/``next_result()``.
+            name: Name used in logs.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}.")
+        stub = conn.get_stub(control_pb2_grpc.ControlServiceStub)
+        self._stream: BidiStream = BidiStream(lambda: stub.ControlStream(), name=name)
+        self._writer = ControlStreamWriter(self._stream)
+        self._reader = ControlStreamReader(self._stream)
+        self._name = name
+        self._window = asyncio.Semaphore(max_in_flight)
+        self._write_lock = asyncio.Lock()  # grpc.aio allows one pending write.
+        self._max_in_flight = max_in_flight
+        # ``None`` marks the end of the stream.
+        self._queue: asyncio.Queue[tuple[int, list[dict]] | None] = asyncio.Queue(
+            maxsize=result_queue_size
+        )
+        self._outstanding: set[int] = set()
+        # Ids increase and are never reused, so an issued id that is no longer
+        # outstanding belongs to a ``request`` that gave up; its late result is
+        # dropped. Nothing is kept per abandoned id, so a server that never
+        # answers cannot grow any state here.
+        self._last_id = 0
+        self._waiters: dict[int, asyncio.Future[list[dict]]] = {}
+        self._ids = itertools.count(1)
+        self._read_task: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+        self._closing = False
+        self._sent = 0
+        self._completed = 0
+        self._window_waits = 0
+        self._abandoned = 0
+        self._late = 0
+
+    async def start(self) -> None:
+        """Open the stream and start the result reader."""
+        await self._stream.start()
+        self._read_task = asyncio.get_running_loop().create_task(
+            self._read_loop(), name=f"[{self._name}] reader"
+        )
+
+    async def __aenter__(self) -> "ControlStream":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _read_loop(self) -> None:
+        try:
+            while (item := await self._reader.read()) is not None:
+                request_id, results = item
+                if request_id not in self._outstanding:
+                    if request_id <= self._last_id:
+                        self._late += 1
+                        continue
+                    _logger.warning(
+                        f"[{self._name}] unexpected request id {request_id}"
+                    )
+                    continue
+                self._outstanding.discard(request_id)
+                self._completed += 1
+                self._window.release()
+                waiter = self._waiters.pop(request_id, None)
+                if waiter is not None:
+                    if not waiter.done():
+                        waiter.set_result(results)
+                else:
+                    # Blocks when full: the stream is no longer drained and
+                    # HTTP/2 flow control throttles the server.
+                    await self._queue.put((request_id, results))
+            self._error = ConnectionError(f"[{self._name}] stream closed by server.")
+        except asyncio.CancelledError:
+            self._error = ConnectionError(f"[{self._name}] stream closed.")
+            raise
+        except Exception as e:
+            _logger.warning(f"[{self._name}] reader stopped: {e}")
+            self._error = e
+        finally:
+            for waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(self._error)
+            self._waiters.clear()
+            with contextlib.suppress(asyncio.QueueFull):
+                self._queue.put_nowait(None)
+
+    def _check_open(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._read_task is None:
+            raise RuntimeError(f"[{self._name}] not started.")
+
+    async def send(self, batch: ActionBatch) -> int:
+        """
+        Write a batch without waiting for its result.
+
+        Waits while ``max_in_flight`` batches are outstanding (backpressure).
+        The result is delivered to ``results()`` / ``next_result()``.
+
+        Returns:
+            int: Request id assigned to the batch.
+        """
+        return await self._send(batch, waiter=None)
+
+    async def request(
+        self, batch: ActionBatch, timeout: float | None = None
+    ) -> list[dict]:
+        """
+        Write a batch and wait for its correlated result.
+
+        Args:
+            batch: Actions to execute.
+            timeout: Optional wait for the result, in seconds. On timeout the
+                batch's window slot is freed and its late result discarded.
+
+        Returns:
+            list[dict]: One result per action, in batch order.
+        """
+        future: asyncio.Future[list[dict]] = asyncio.get_running_loop().create_future()
+        request_id = await self._send(batch, waiter=future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (TimeoutError, asyncio.CancelledError):
+            self._abandon(request_id)
+            raise
+        finally:
+            self._waiters.pop(request_id, None)
+
+    def _abandon(self, request_id: int) -> None:
+        if request_id not in self._outstanding:
+            return  # The result already arrived.
+        self._outstanding.discard(request_id)
+        self._abandoned += 1
+        self._window.release()
+
+    async def _send(
+        self, batch: ActionBatch, waiter: asyncio.Future[list[dict]] | None
+    ) -> int:
+        self._check_open()
+        if self._window.locked():
+            self._window_waits += 1
+        await self._window.acquire()
+        request_id = self._last_id = next(self._ids)
+        self._outstanding.add(request_id)
+        if waiter is not None:
+            self._waiters[request_id] = waiter
+        try:
+            async with self._write_lock:
+                self._check_open()
+                if not await self._writer.write(request_id, batch):
+                    raise ConnectionError(f"[{self._name}] write failed.")
+        except BaseException:
+            self._outstanding.discard(request_id)
+            self._waiters.pop(request_id, None)
+            self._window.release()
+            raise
+        self._sent += 1
+        return request_id
+
+    async def next_result(self) -> tuple[int, list[dict]]:
+        """
+        Return the next ``(request_id, results)`` not claimed by ``request``.
+
+        Raises:
+            ConnectionError | grpc.aio.AioRpcError: Once the stream has ended
+                and every queued result has been consumed.
+        """
+        item = await self._queue.get()
+        if item is None:
+            self._queue.put_nowait(None)  # Keep waking later readers.
+            raise self._error
+        return item
+
+    async def results(self) -> AsyncIterator[tuple[int, list[dict]]]:
+        """
+        Iterate ``(request_id, results)`` for batches written with ``send``.
+
+        Ends quietly after ``aclose``; a stream that failed raises its error.
+        """
+        while True:
+            try:
+                yield await self.next_result()
+            except Exception:
+                if self._closing:
+                    return
+                raise
+
+    def stats(self) -> dict[str, int]:
+        """Counters: ``sent``, ``completed``, ``in_flight``, ``queued``, ``window_waits``, ``abandoned``, ``late_dropped``."""
+        return {
+            "sent": self._sent,
+            "completed": self._completed,
+            "in_flight": len(self._outstanding),
+            "max_in_flight": self._max_in_flight,
+            "queued": self._queue.qsize(),
+            "window_waits": self._window_waits,
+            "abandoned": self._abandoned,
+            "late_dropped": self._late,
+        }
+
+    async def aclose(self) -> None:
+        """Half-close the stream, stop the reader and fail pending requests."""
+        self._closing = True
+        await self._stream.aclose()
+        if self._read_task is not None:
+            self._read_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._read_task
@@ -5,50 +5,290 @@ Provides a thin wrapper around gRPC.aio channels and service stubs via
 ``GrpcConnection``.
 
 Highlights:
-- Discover service stubs dynamically through ``iter_all_grpc_stubs``.
+- Resolve service stubs through the static registry (``grpc_stub_registry``)
+  and instantiate each one lazily on first use.
 - Offer a uniform interface for retrieving and closing stub instances.
+- Optionally spread calls over a pool of channels (``pool_size > 1``).
+- Apply the per-method retry/hedge/deadline/breaker policy to unary calls.
+- Record per-method latency, payload size, in-flight and status metrics.
+- Warm channels up front (``connect``), keep them alive with HTTP/2 pings and
+  rebuild a channel that stays in ``TRANSIENT_FAILURE`` (for example after a
+  UE restart) without recreating the connection.
 """
 
-from typing import TypeVar
+import asyncio
+import time
+from typing import Any, Final, TypeVar
 
+import grpc
 import grpc.aio
 
 from tongsim.logger import get_logger
 
-from .utils import iter_all_grpc_stubs
+from .metrics import RpcMetrics
+from .policy import PolicyInterceptor, RpcPolicy
+from .pool import ChannelPool, PooledStub, PoolStrategy
+from .utils import grpc_stub_registry
 
 _logger = get_logger("gRPC")
 
 T = TypeVar("T")  # Help type-checking for get_stub callers.
 
+_MESSAGE_LIMIT_BYTES: Final[int] = 100 * 1024 * 1024
+_MAX_RECONNECT_BACKOFF_MS: Final[int] = 2000
+"""gRPC's default (120 s) would leave training stalled long after UE is back."""
+
 
 class GrpcConnection:
     """
     Lazily instantiate gRPC stubs and provide unified access plus teardown.
+
+    Stubs are created on the first ``get_stub`` call for their service, so
+    building a connection does not import or reflect over the protocol
+    package.
+
+    With ``pool_size > 1`` the connection holds several channels to the same
+    endpoint and ``get_stub`` returns a ``PooledStub`` that picks a channel per
+    call, so hundreds of concurrent RPCs are not serialised on one HTTP/2
+    connection.
     """
 
-    def __init__(self, endpoint: str = "localhost:5726"):
+    def __init__(
+        self,
+        endpoint: str = "localhost:5726",
+        pool_size: int = 1,
+        pool_strategy: PoolStrategy | str = PoolStrategy.LEAST_LOADED,
+        policy: RpcPolicy | None = None,
+        keepalive_s: float | None = 300.0,
+        rebuild_after_s: float = 10.0,
+    ):
+        """
+        Args:
+            endpoint: gRPC endpoint of the UE server, for example "localhost:5726".
+            pool_size: Number of channels to open. ``1`` keeps the classic
+                single-channel behaviour.
+            pool_strategy: Channel selection strategy when ``pool_size > 1``
+                (``"least_loaded"`` or ``"round_robin"``).
+            policy: Retry/hedge/breaker configuration for unary calls. ``None``
+                uses ``RpcPolicy()`` (retries for idempotent reads, hedging
+                for per-step reads, breaker after 5 transport failures).
+            keepalive_s: Interval of HTTP/2 keepalive pings while calls are in
+                flight, so a dead server is noticed during hour-long moves.
+                The default matches gRPC servers' minimum accepted ping
+                interval; ``None`` disables keepalive.
+            rebuild_after_s: A channel stuck in ``TRANSIENT_FAILURE`` this
+                long is replaced by a fresh one (and its stubs rebuilt) once
+                ``connect`` has started state monitoring.
+        """
         self._endpoint = endpoint
-        self._channel: grpc.aio.Channel | None = grpc.aio.insecure_channel(
+        self._policy = PolicyInterceptor(policy, endpoint=endpoint)
+        self._metrics = RpcMetrics()
+        self._rebuild_after_s = rebuild_after_s
+        self._watchers: list[asyncio.Task[None]] = []
+        options: list[tuple[str, int]] = [
+            ("grpc.max_send_message_length", _MESSAGE_LIMIT_BYTES),
+            ("grpc.max_receive_message_length", _MESSAGE_LIMIT_BYTES),
+            ("grpc.max_reconnect_backoff_ms", _MAX_RECONNECT_BACKOFF_MS),
+        ]
+        if keepalive_s is not None:
+            options += [
+                ("grpc.keepalive_time_ms", int(keepalive_s * 1000)),
+                ("grpc.keepalive_timeout_ms", 20_000),
+                ("grpc.keepalive_permit_without_calls", 0),
+                ("grpc.http2.max_pings_without_data", 0),
+            ]
+        self._pool: ChannelPool | None = ChannelPool(
             self._endpoint,
-            options=[
-                ("grpc.max_send_message_length", 100 * 1024 * 1024),
-                ("grpc.max_receive_message_length", 100 * 1024 * 1024),
-            ],
+            size=pool_size,
+            options=options,
+            strategy=pool_strategy,
+            # Metrics first: latency as seen by the caller, retries included.
+            interceptors=[self._metrics, self._policy],
         )
         self._stubs: dict[type[object], object] = {}
-        self._initialize()
+        self._unsupported: set[str] = set()
+
+    def _create_stub(self, stub_cls: type[T]) -> T:
+        """Instantiate ``stub_cls`` for this connection (pool-aware)."""
+        name = stub_cls.__name__
+        if grpc_stub_registry().get(name) != stub_cls.__module__:
+            raise ValueError(f"[GrpcConnection] Stub {name} not found.")
+        try:
+            _logger.debug(f"GrpcConnection instantiate stub: {name}")
+            if self._pool.size > 1:
+                return PooledStub(self._pool, stub_cls)
+            return stub_cls(self._pool.channels[0])
+        except Exception as e:
+            raise RuntimeError(
+                f"GrpcConnection failed to instantiate stub: {name}. {e}"
+            ) from e
+
+    @property
+    def endpoint(self) -> str:
+        """Endpoint this connection is bound to."""
+        return self._endpoint
+
+    @property
+    def pool_size(self) -> int:
+        """Number of channels held by this connection (0 once closed)."""
+        return self._pool.size if self._pool else 0
+
+    def channel_stats(self) -> list[dict[str, int]]:
+        """
+        Per-channel call accounting.
+
+        Returns:
+            list[dict[str, int]]: One entry per channel with ``in_flight`` and
+                ``total_calls``. Only pooled connections (``pool_size > 1``)
+                track calls; a single-channel connection reports zeros.
+        """
+        return self._pool.stats() if self._pool else []
+
+    def supports(self, method: str) -> bool:
+        """
+        Whether ``method`` (short RPC name) may be implemented by the server.
+
+        Optional batch RPCs are tried first and recorded with
+        ``mark_unsupported`` when the server answers ``UNIMPLEMENTED``, so
+        callers fall back to per-item calls without paying for the probe again.
+        """
+        return method not in self._unsupported
+
+    def mark_unsupported(self, method: str) -> None:
+        """Remember that the server does not implement ``method``."""
+        if method not in self._unsupported:
+            self._unsupported.add(method)
+            _logger.info(
+                f"[GrpcConnection {self._endpoint}] {method} is not implemented "
+                "by the server; using the per-item fallback."
+            )
+
+    def channel_states(self) -> list[str]:
+        """Connectivity state name per channel (``"READY"``, ``"IDLE"`` ...)."""
+        if not self._pool:
+            return []
+        return [ch.get_state().name for ch in self._pool.channels]
+
+    async def connect(self, timeout: float = 5.0, watch: bool = True) -> bool:
+        """
+        Pre-connect every channel so the first RPC does not pay TCP/HTTP2 setup.
 
-    def _initialize(self):
-        """Load and instantiate all gRPC stubs from the API protocol package."""
-        for _service_name, stub_cls in iter_all_grpc_stubs():
+        Args:
+            timeout: Maximum wait in seconds for all channels to become ready;
+                ``0`` only starts connecting without waiting.
+            watch: Start monitoring channel state so stuck channels are rebuilt.
+
+        Returns:
+            bool: ``True`` if every channel is ready. ``False`` after the
+                timeout; channels keep connecting in the background and calls
+                still work once the server is up.
+        """
+        if self._pool is None:
+            raise RuntimeError("[GrpcConnection] connection is closed.")
+        if watch and not self._watchers:
+            self._watchers = [
+                asyncio.get_running_loop().create_task(
+                    self._watch_channel(i),
+                    name=f"[GrpcConnection {self._endpoint}] watch channel {i}",
+                )
+                for i in range(self._pool.size)
+            ]
+
+        if timeout <= 0:
+            states = [ch.get_state(try_to_connect=True) for ch in self._pool.channels]
+            return all(st is grpc.ChannelConnectivity.READY for st in states)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(ch.channel_ready() for ch in self._pool.channels)),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            _logger.warning(
+                f"[GrpcConnection {self._endpoint}] not ready after {timeout:.1f}s; "
+                "continuing, calls will connect lazily."
+            )
+            return False
+        _logger.debug(
+            f"[GrpcConnection {self._endpoint}] {self._pool.size} channel(s) ready "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return True
+
+    async def _watch_channel(self, index: int) -> None:
+        """Follow one channel's state; rebuild it if it stays failed too long."""
+        failing_since: float | None = None
+        while self._pool is not None:
+            channel = self._pool.channels[index]
+            state = channel.get_state()
+            if state is grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+                failing_since = failing_since or time.monotonic()
+                if time.monotonic() - failing_since >= self._rebuild_after_s:
+                    _logger.warning(
+                        f"[GrpcConnection {self._endpoint}] channel {index} failing "
+                        f"for {self._rebuild_after_s:.0f}s; rebuilding."
+                    )
+                    await self._rebuild_channel(index)
+                    failing_since = None
+                    continue
+            elif state is grpc.ChannelConnectivity.SHUTDOWN:
+                return
+            elif state is grpc.ChannelConnectivity.READY and failing_since:
+                _logger.info(
+                    f"[GrpcConnection {self._endpoint}] channel {index} reconnected."
+                )
+                failing_since = None
+
+            wait_s = self._rebuild_after_s if failing_since else None
             try:
-                _logger.debug(f"GrpcConnection instantiate stub: {_service_name}")
-                self._stubs[stub_cls] = stub_cls(self._channel)
-            except Exception as e:
-                raise RuntimeError(
-                    f"GrpcConnection failed to instantiate stub: {_service_name}. {e}"
-                ) from e
+                await asyncio.wait_for(channel.wait_for_state_change(state), wait_s)
+            except TimeoutError:
+                continue
+            new_state = channel.get_state()
+            _logger.debug(
+                f"[GrpcConnection {self._endpoint}] channel {index}: "
+                f"{state.name} -> {new_state.name}"
+            )
+
+    async def _rebuild_channel(self, index: int) -> None:
+        if self._pool is None:
+            return
+        channel = await self._pool.rebuild(index)
+        if self._pool.size == 1:
+            self._stubs.clear()  # Plain stubs are bound to the old channel.
+        channel.get_state(try_to_connect=True)
+
+    def policy_stats(self) -> dict:
+        """
+        Decisions taken by the call policy (retries, hedges, breaker, deadlines).
+
+        Returns:
+            dict: See ``PolicyInterceptor.stats``.
+        """
+        return self._policy.stats()
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Snapshot of the client-side RPC metrics of this connection.
+
+        Returns:
+            dict: ``endpoint``, ``since`` (epoch seconds of the sample window),
+                ``methods`` (see ``RpcMetrics.snapshot``), ``policy`` (see
+                ``policy_stats``) and ``channels`` (see ``channel_stats``).
+                JSON-serialisable; ``to_prometheus`` renders it as text.
+        """
+        return {
+            "endpoint": self._endpoint,
+            "since": self._metrics.started_at,
+            "methods": self._metrics.snapshot(),
+            "policy": self._policy.stats(),
+            "channels": self.channel_stats(),
+        }
+
+    def reset_metrics(self) -> None:
+        """Start a new metrics sample window."""
+        self._metrics.reset()
 
     def __enter__(self):
         raise RuntimeError("GrpcConnection must be used with 'async'")
@@ -65,14 +305,19 @@ class GrpcConnection:
                 ``ExampleServiceStub``).
 
         Returns:
-            T: Stub instance typed to ``stub_cls``.
+            T: Stub instance typed to ``stub_cls``. For pooled connections this
+                is a ``PooledStub`` exposing the same RPC methods.
         """
-        if stub_cls not in self._stubs:
-            raise ValueError(f"[GrpcConnection] Stub {stub_cls.__name__} not found.")
-        return self._stubs[stub_cls]
+        stub = self._stubs.get(stub_cls)
+        if stub is None:
+            if self._pool is None:
+                raise RuntimeError("[GrpcConnection] connection is closed.")
+            stub = self._create_stub(stub_cls)
+            self._stubs[stub_cls] = stub
+        return stub
 
     def __del__(self):
-        if self._channel:
+        if self._pool:
             _logger.error("GrpcConnection was not properly closed.")
 
     async def __aenter__(self):
@@ -82,9 +327,18 @@ class GrpcConnection:
         await self.aclose()
 
     async def aclose(self):
-        """Close the gRPC channel and release all cached stubs."""
-        if self._channel:
-            await self._channel.close()
-            self._channel = None
+        """Close the gRPC channel(s) and release all cached stubs."""
+        pool, self._pool = self._pool, None
+        if pool:
+            await pool.aclose()
             _logger.debug(f"[GrpcConnection {self._endpoint}] closed channel")
+        # Closing the channels ends the watchers' pending state watches; let
+        # them return instead of cancelling, or those watches complete after
+        # the loop is gone and gRPC reports "Event loop is closed".
+        if self._watchers:
+            _, pending = await asyncio.wait(self._watchers, timeout=1.0)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._watchers, return_exceptions=True)
+            self._watchers.clear()
         self._stubs.clear()
@@ -0,0 +1,389 @@
+"""
+connection.grpc.metrics
+
+Client-side RPC metrics collected by a ``grpc.aio`` interceptor.
+
+For every RPC method the interceptor records a latency histogram (reported
+as p50/p95/p99), request/response payload sizes, the number of calls in
+flight and a count per final status code. Latency is measured around the
+whole call as the caller sees it, including retries and hedges made by the
+``PolicyInterceptor`` underneath.
+
+Snapshots are plain dictionaries (JSON-serialisable); ``to_prometheus``
+renders one in the Prometheus text exposition format and ``render_metrics``
+picks between that and JSON.
+
+Exports:
+- LatencyHistogram: log-bucketed latency histogram with quantile estimates
+- RpcMetrics: per-method metric store plus the interceptor feeding it
+- to_prometheus: render a ``GrpcConnection.metrics()`` snapshot
+- render_metrics: render a snapshot as Prometheus text or JSON
+"""
+
+import asyncio
+import json
+import math
+import threading
+import time
+from typing import Any, Final, Literal
+
+import grpc
+import grpc.aio
+
+__all__ = ["LatencyHistogram", "RpcMetrics", "render_metrics", "to_prometheus"]
+
+_BUCKET_BASE_S: Final[float] = 1e-4
+_BUCKET_GROWTH: Final[float] = 2**0.25
+_NUM_BUCKETS: Final[int] = 100  # Up to ~55 min, plus the overflow bucket.
+_LOG_GROWTH: Final[float] = math.log(_BUCKET_GROWTH)
+_QUANTILES: Final[tuple[tuple[str, float], ...]] = (
+    ("p50", 0.50),
+    ("p95", 0.95),
+    ("p99", 0.99),
+)
+
+
+def _method_name(method: str | bytes) -> str:
+    if isinstance(method, bytes):
+        method = method.decode()
+    return method.rsplit("/", 1)[-1]
+
+
+def _byte_size(message: Any) -> int:
+    byte_size = getattr(message, "ByteSize", None)
+    return byte_size() if byte_size is not None else 0
+
+
+class LatencyHistogram:
+    """
+    Geometric-bucket latency histogram (bucket width ~19 %, 0.1 ms - 55 min).
+
+    Quantiles are interpolated inside the bucket, so estimates are within one
+    bucket width of the exact value at a fixed memory cost.
+    """
+
+    __slots__ = ("count", "counts", "max_s", "sum_s")
+
+    def __init__(self):
+        self.counts: list[int] = [0] * (_NUM_BUCKETS + 1)
+        self.count: int = 0
+        self.sum_s: float = 0.0
+        self.max_s: float = 0.0
+
+    @staticmethod
+    def _upper_bound(index: int) -> float:
+        return _BUCKET_BASE_S * _BUCKET_GROWTH**index
+
+    def observe(self, seconds: float) -> None:
+        if seconds <= _BUCKET_BASE_S:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log(seconds / _BUCKET_BASE_S) / _LOG_GROWTH),
+                _NUM_BUCKETS,
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimated ``q``-quantile in seconds (``0.0`` when empty)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = 0.0 if index == 0 else self._upper_bound(index - 1)
+                upper = min(self._upper_bound(index), self.max_s)
+                return lower + (upper - lower) * max(rank - seen, 0.0) / n
+            seen += n
+        return self.max_s
+
+    def summary(self) -> dict[str, float]:
+        """``count``, ``sum_s``, ``mean_ms``, ``max_ms`` and p50/p95/p99 in ms."""
+        out: dict[str, float] = {
+            "count": self.count,
+            "sum_s": self.sum_s,
+            "mean_ms": self.sum_s / self.count * 1000.0 if self.count else 0.0,
+            "max_ms": self.max_s * 1000.0,
+        }
+        for label, q in _QUANTILES:
+            out[f"{label}_ms"] = self.quantile(q) * 1000.0
+        return out
+
+
+class _MethodMetrics:
+    __slots__ = (
+        "calls",
+        "codes",
+        "in_flight",
+        "kind",
+        "latency",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self, kind: str, in_flight: int = 0):
+        self.kind = kind
+        self.calls: int = 0
+        self.in_flight: int = in_flight
+        self.codes: dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.request_bytes: int = 0
+        self.response_bytes: int = 0
+
+    def finish(self, elapsed_s: float, code: grpc.StatusCode) -> None:
+        self.in_flight -= 1
+        self.latency.observe(elapsed_s)
+        self.codes[code.name] = self.codes.get(code.name, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        errors = {c: n for c, n in self.codes.items() if c != "OK"}
+        return {
+            "kind": self.kind,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "errors": sum(errors.values()),
+            "codes": dict(self.codes),
+            "latency": self.latency.summary(),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class RpcMetrics(
+    grpc.aio.UnaryUnaryClientInterceptor, grpc.aio.UnaryStreamClientInterceptor
+):
+    """
+    Per-method RPC metrics, recorded by acting as a client interceptor.
+
+    Install it first in the channel's interceptor list so latency covers the
+    whole call as seen by the caller. Unary-stream calls record latency until
+    the stream ends and the request size only; bidirectional streams are not
+    intercepted (they would pay an extra queue hop per message).
+    """
+
+    def __init__(self):
+        self._methods: dict[str, _MethodMetrics] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def _method(self, name: str, kind: str) -> _MethodMetrics:
+        metrics = self._methods.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._methods.setdefault(name, _MethodMetrics(kind))
+        return metrics
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        name = _method_name(client_call_details.method)
+        metrics = self._method(name, "unary")
+        metrics.calls += 1
+        metrics.in_flight += 1
+        metrics.request_bytes += _byte_size(request)
+        start = time.perf_counter()
+        code = grpc.StatusCode.UNKNOWN
+        try:
+            response = await (await continuation(client_call_details, request))
+        except grpc.aio.AioRpcError as e:
+            code = e.code()
+            raise
+        except asyncio.CancelledError:
+            code = grpc.StatusCode.CANCELLED
+            raise
+        else:
+            code = grpc.StatusCode.OK
+            # Looked up again: ``reset`` may have started a new window meanwhile.
+            self._method(name, "unary").response_bytes += _byte_size(response)
+            return response
+        finally:
+            self._method(name, "unary").finish(time.perf_counter() - start, code)
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        name = _method_name(client_call_details.method)
+        metrics = self._method(name, "stream")
+        metrics.calls += 1
+        metrics.in_flight += 1
+        metrics.request_bytes += _byte_size(request)
+        start = time.perf_counter()
+        try:
+            call = await continuation(client_call_details, request)
+        except BaseException:
+            metrics.finish(time.perf_counter() - start, grpc.StatusCode.UNKNOWN)
+            raise
+
+        async def _record() -> None:
+            code = await call.code()
+            self._method(name, "stream").finish(time.perf_counter() - start, code)
+
+        call.add_done_callback(lambda _call: asyncio.ensure_future(_record()))
+        return call
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-method metrics: ``{method: {kind, calls, in_flight, errors, codes, latency, request_bytes, response_bytes}}``."""
+        with self._lock:
+            items = list(self._methods.items())
+        return {name: m.snapshot() for name, m in sorted(items)}
+
+    def reset(self) -> None:
+        """
+        Drop every recorded sample and start a new window.
+
+        Calls still in flight carry over: the new window counts them in
+        ``in_flight`` and records their latency and status when they finish.
+        """
+        with self._lock:
+            self._methods = {
+                name: _MethodMetrics(m.kind, in_flight=m.in_flight)
+                for name, m in self._methods.items()
+                if m.in_flight > 0
+            }
+        self._started_at = time.time()
+
+    @property
+    def started_at(self) -> float:
+        """Wall-clock time (``time.time()``) of the first sample window."""
+        return self._started_at
+
+
+# ---------------------------
+# Exposition
+# ---------------------------
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Exposition:
+    """Accumulates metric families in the Prometheus text format."""
+
+    def __init__(self, prefix: str, endpoint: str):
+        self._prefix = prefix
+        self._endpoint = endpoint
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        full = f"{self._prefix}_{name}"
+        self.lines.append(f"# HELP {full} {help_text}")
+        self.lines.append(f"# TYPE {full} {kind}")
+        return full
+
+    def sample(self, name: str, value: float, **labels: str) -> None:
+        lb = ",".join(
+            f'{k}="{_escape(str(v))}"'
+            for k, v in {"endpoint": self._endpoint, **labels}.items()
+        )
+        self.lines.append(f"{name}{{{lb}}} {value:.9g}")
+
+
+def _method_families(out: _Exposition, methods: dict[str, Any]) -> None:
+    name = out.family("latency_seconds", "summary", "Client-side RPC latency.")
+    for method, m in methods.items():
+        lat = m["latency"]
+        for label, q in _QUANTILES:
+            out.sample(
+                name, lat[f"{label}_ms"] / 1000.0, method=method, quantile=str(q)
+            )
+        out.sample(f"{name}_sum", lat["sum_s"], method=method)
+        out.sample(f"{name}_count", lat["count"], method=method)
+
+    name = out.family("calls_total", "counter", "RPCs finished, by status code.")
+    for method, m in methods.items():
+        for code, n in m["codes"].items():
+            out.sample(name, n, method=method, code=code)
+
+    for metric, key, kind, help_text in (
+        ("in_flight", "in_flight", "gauge", "RPCs currently in flight."),
+        ("request_bytes_total", "request_bytes", "counter", "Request payload bytes."),
+        (
+            "response_bytes_total",
+            "response_bytes",
+            "counter",
+            "Response payload bytes.",
+        ),
+    ):
+        name = out.family(metric, kind, help_text)
+        for method, m in methods.items():
+            out.sample(name, m[key], method=method)
+
+
+def _policy_families(out: _Exposition, policy: dict[str, Any]) -> None:
+    name = out.family("policy_decisions_total", "counter", "Call policy decisions.")
+    for method, counters in policy["methods"].items():
+        for decision, n in counters.items():
+            out.sample(name, n, method=method, decision=decision)
+    name = out.family("breaker_open", "gauge", "1 while the circuit breaker is open.")
+    out.sample(name, int(policy["breaker"]["state"] == "open"))
+
+
+def _capture_control_families(out: _Exposition, control: dict[str, Any]) -> None:
+    cameras = control["cameras"]
+    name = out.family(
+        "capture_target_latency_seconds", "gauge", "Capture controller latency target."
+    )
+    out.sample(name, control["target_latency_s"])
+    for metric, key, help_text in (
+        ("capture_qps", "qps", "Capture rate set by the controller."),
+        ("capture_jpeg_quality", "jpeg_quality", "JPEG quality set by the controller."),
+        ("capture_width", "width", "Capture width set by the controller."),
+        ("capture_height", "height", "Capture height set by the controller."),
+        ("capture_latency_seconds", "latency_s", "p95 snapshot latency last step."),
+        ("capture_queue", "queue", "Server-side queued frames last step."),
+    ):
+        name = out.family(metric, "gauge", help_text)
+        for camera, c in cameras.items():
+            out.sample(name, c[key], camera=camera)
+    name = out.family(
+        "capture_decisions_total", "counter", "Capture controller decisions."
+    )
+    for camera, c in cameras.items():
+        for action, n in c["decisions"].items():
+            out.sample(name, n, camera=camera, action=action)
+
+
+def to_prometheus(snapshot: dict[str, Any], prefix: str = "tongsim_rpc") -> str:
+    """
+    Render a ``GrpcConnection.metrics()`` snapshot as Prometheus text.
+
+    Args:
+        snapshot: Dictionary returned by ``GrpcConnection.metrics()``,
+            optionally merged with ``AdaptiveCaptureController.metrics()``.
+        prefix: Metric name prefix.
+
+    Returns:
+        str: Text exposition format (version 0.0.4).
+    """
+    out = _Exposition(prefix, snapshot.get("endpoint", ""))
+    _method_families(out, snapshot.get("methods", {}))
+    if policy := snapshot.get("policy"):
+        _policy_families(out, policy)
+    if channels := snapshot.get("channels"):
+        name = out.family("channel_in_flight", "gauge", "RPCs in flight per channel.")
+        for i, ch in enumerate(channels):
+            out.sample(name, ch["in_flight"], channel=str(i))
+    if control := snapshot.get("capture_control"):
+        _capture_control_families(out, control)
+    return "\n".join(out.lines) + "\n"
+
+
+def render_metrics(
+    snapshot: dict[str, Any], fmt: Literal["prometheus", "json"] = "prometheus"
+) -> str:
+    """
+    Render a metrics snapshot as Prometheus text exposition or as JSON.
+
+    Args:
+        snapshot: Dictionary returned by ``GrpcConnection.metrics()``.
+        fmt: ``"prometheus"`` or ``"json"``.
+
+    Returns:
+        str: Serialised metrics.
+    """
+    if fmt == "json":
+        return json.dumps(snapshot, indent=2)
+    if fmt == "prometheus":
+        return to_prometheus(snapshot)
+    raise ValueError(f"Unsupported metrics format: {fmt!r}")
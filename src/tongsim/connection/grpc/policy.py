@@ -0,0 +1,546 @@
+"""
+connection.grpc.policy
+
+Per-method call policy for unary RPCs: retries, hedging, deadlines and a
+per-endpoint circuit breaker, applied by a ``grpc.aio`` client interceptor.
+
+Without a policy a transient ``UNAVAILABLE`` surfaces straight into
+``safe_async_rpc`` and turns into the API default (for example
+``(None, None)``), and a call issued with a 3600 s timeout can pin a worker
+for an hour. ``PolicyInterceptor`` sits below the stubs so every API wrapper
+benefits without changing its signature:
+
+- Idempotent reads are retried with full-jitter exponential backoff.
+- Latency-critical reads (``GetActorTransform`` ...) are hedged: a duplicate
+  request is sent when the first has not answered within a short delay and
+  the first successful response wins.
+- ``deadline(seconds)`` scopes a step budget; every RPC issued inside it has
+  its timeout clamped to the remaining budget.
+- A ``CircuitBreaker`` fails calls fast once the endpoint keeps failing and
+  lets a single probe through after a cool-down.
+
+Every decision is counted and exposed through ``PolicyInterceptor.stats``.
+
+Exports:
+- RetryPolicy / HedgePolicy / MethodPolicy: declarative configuration
+- RpcPolicy: method-name -> MethodPolicy table plus breaker settings
+- CircuitBreaker: per-endpoint breaker state machine
+- PolicyInterceptor: the interceptor installed on the connection channels
+- deadline / with_deadline / remaining_time: step-budget helpers
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import random
+import threading
+import time
+from collections.abc import Awaitable, Iterator, Mapping
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Final
+
+import grpc
+import grpc.aio
+
+from tongsim.logger import get_logger
+
+__all__ = [
+    "DEFAULT_METHOD_POLICIES",
+    "CircuitBreaker",
+    "CircuitState",
+    "HedgePolicy",
+    "MethodPolicy",
+    "PolicyInterceptor",
+    "RetryPolicy",
+    "RpcPolicy",
+    "deadline",
+    "remaining_time",
+    "with_deadline",
+]
+
+_logger = get_logger("gRPC")
+
+_TRANSIENT_CODES: Final[frozenset[grpc.StatusCode]] = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    }
+)
+# Transport failures only: a timeout usually reflects the caller's own budget
+# (``deadline(0.05)``), and tripping the endpoint-wide breaker on it would
+# reject the healthy calls of every other caller.
+_BREAKER_CODES: Final[frozenset[grpc.StatusCode]] = frozenset(
+    {grpc.StatusCode.UNAVAILABLE}
+)
+_NO_VERDICT_CODES: Final[frozenset[grpc.StatusCode]] = frozenset(
+    {
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.CANCELLED,
+    }
+)
+
+
+# ---------------------------
+# Deadlines
+# ---------------------------
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "tongsim_rpc_deadline", default=None
+)
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left in the current ``deadline`` scope.
+
+    Returns:
+        float | None: Remaining budget (may be negative once exceeded), or
+            ``None`` outside any scope.
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every RPC issued inside the block by a shared time budget.
+
+    Nested scopes never extend an outer budget. The budget is carried by a
+    context variable, so it follows ``await`` chains, tasks created inside the
+    block, and coroutines submitted through ``WorldContext.sync_run``.
+
+    Example::
+
+        with deadline(0.05):  # 50 ms step budget
+            ue.context.sync_run(step(conn))
+    """
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        expires_at = min(expires_at, outer)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def with_deadline[T](awaitable: Awaitable[T], seconds: float) -> T:
+    """Await ``awaitable`` inside a ``deadline(seconds)`` scope."""
+    with deadline(seconds):
+        return await awaitable
+
+
+# ---------------------------
+# Configuration
+# ---------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retry transient failures with full-jitter exponential backoff."""
+
+    max_attempts: int = 3
+    """Total attempts including the first one."""
+    initial_backoff_s: float = 0.05
+    max_backoff_s: float = 1.0
+    multiplier: float = 2.0
+    retryable_codes: frozenset[grpc.StatusCode] = _TRANSIENT_CODES
+
+    def backoff(self, retry_index: int) -> float:
+        """Sleep before retry ``retry_index`` (0-based), uniformly jittered."""
+        ceiling = min(
+            self.max_backoff_s, self.initial_backoff_s * self.multiplier**retry_index
+        )
+        return random.uniform(0.0, ceiling)
+
+
+@dataclass(frozen=True, slots=True)
+class HedgePolicy:
+    """Send duplicate requests when the first one is slow."""
+
+    max_attempts: int = 2
+    """Concurrent copies at most, including the first request."""
+    delay_s: float = 0.02
+    """Wait before sending each extra copy."""
+    max_concurrent_calls: int = 8
+    """Skip hedging while more calls of the method are in flight: under a
+    burst the extra copies would only add load and slow every call down."""
+
+
+@dataclass(frozen=True, slots=True)
+class MethodPolicy:
+    """Policy for one RPC method. Only idempotent methods should retry/hedge."""
+
+    retry: RetryPolicy | None = None
+    hedge: HedgePolicy | None = None
+    max_timeout_s: float | None = None
+    """Upper bound applied to the caller's timeout (``None`` keeps it)."""
+
+
+_READ: Final[MethodPolicy] = MethodPolicy(retry=RetryPolicy())
+_HEDGED_READ: Final[MethodPolicy] = MethodPolicy(
+    retry=RetryPolicy(), hedge=HedgePolicy()
+)
+
+DEFAULT_METHOD_POLICIES: Final[Mapping[str, MethodPolicy]] = {
+    # Latency-critical per-step reads.
+    "GetActorTransform": _HEDGED_READ,
+    "GetActorState": _HEDGED_READ,
+    "GetActorPoseLocal": _HEDGED_READ,
+    # Other side-effect-free reads.
+    "BatchGetActorTransforms": _READ,
+    "BatchGetActorStates": _READ,
+    "QueryState": _READ,
+    "QueryStateDelta": _READ,
+    "ListArenas": _READ,
+    "LocalToWorld": _READ,
+    "WorldToLocal": _READ,
+    "QueryVoxel": _READ,
+    "QueryNavigationPath": _READ,
+    "BatchSingleLineTraceByObject": _READ,
+    "BatchMultiLineTraceByObject": _READ,
+    "ListCaptureCameras": _READ,
+    "GetCaptureStatus": _READ,
+}
+"""Default table: retries for idempotent reads, hedging for per-step reads."""
+
+
+@dataclass(slots=True)
+class RpcPolicy:
+    """
+    Call policy of one connection.
+
+    Methods are keyed by their short RPC name (``"GetActorTransform"``);
+    anything not listed uses ``default`` (no retry, no hedge).
+    """
+
+    methods: Mapping[str, MethodPolicy] = field(
+        default_factory=lambda: dict(DEFAULT_METHOD_POLICIES)
+    )
+    default: MethodPolicy = MethodPolicy()
+    breaker_failure_threshold: int = 5
+    """Consecutive transport failures that open the breaker (0 disables it)."""
+    breaker_reset_timeout_s: float = 5.0
+    """Open period before a half-open probe is allowed."""
+
+    def for_method(self, method: str) -> MethodPolicy:
+        """Return the policy for a short RPC name."""
+        return self.methods.get(method, self.default)
+
+
+# ---------------------------
+# Circuit breaker
+# ---------------------------
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one endpoint.
+
+    ``CLOSED`` lets everything through; ``failure_threshold`` consecutive
+    transport failures switch to ``OPEN``, which rejects calls until
+    ``reset_timeout_s`` elapses. The next call then runs as a ``HALF_OPEN``
+    probe: success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 5.0):
+        self._threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def times_opened(self) -> int:
+        return self._times_opened
+
+    def allow(self) -> bool:
+        """Return ``True`` when a call may proceed."""
+        if self._threshold <= 0:
+            return True
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_timeout_s:
+                    return False
+                self._state = CircuitState.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._state = CircuitState.CLOSED
+
+    def abandon(self) -> None:
+        """Forget an in-flight half-open probe that ended without an answer."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        if self._threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self._threshold
+            ):
+                if self._state is not CircuitState.OPEN:
+                    self._times_opened += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+
+# ---------------------------
+# Interceptor
+# ---------------------------
+
+_COUNTERS: Final[tuple[str, ...]] = (
+    "calls",
+    "attempts",
+    "retries",
+    "hedges",
+    "hedge_wins",
+    "hedges_throttled",
+    "failures",
+    "breaker_rejected",
+    "deadline_clamped",
+    "deadline_exhausted",
+)
+
+
+def _method_name(method: str | bytes) -> str:
+    if isinstance(method, bytes):
+        method = method.decode()
+    return method.rsplit("/", 1)[-1]
+
+
+def _rpc_error(code: grpc.StatusCode, details: str) -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(
+        code, grpc.aio.Metadata(), grpc.aio.Metadata(), details=details
+    )
+
+
+class PolicyInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """
+    Apply an ``RpcPolicy`` to every unary-unary call on the channel(s).
+
+    One instance is shared by all channels of a connection, so its breaker
+    and counters are per endpoint. Streaming calls are not intercepted.
+    """
+
+    def __init__(self, policy: RpcPolicy | None = None, endpoint: str = ""):
+        self._policy = policy or RpcPolicy()
+        self._endpoint = endpoint
+        self._breaker = CircuitBreaker(
+            self._policy.breaker_failure_threshold,
+            self._policy.breaker_reset_timeout_s,
+        )
+        self._stats: dict[str, dict[str, int]] = {}
+        self._in_flight: dict[str, int] = {}
+
+    @property
+    def policy(self) -> RpcPolicy:
+        return self._policy
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def _count(self, method: str, counter: str, n: int = 1) -> None:
+        stats = self._stats.get(method)
+        if stats is None:
+            stats = self._stats[method] = dict.fromkeys(_COUNTERS, 0)
+        stats[counter] += n
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot of the policy decisions.
+
+        Returns:
+            dict: ``methods`` (per short RPC name: ``calls``, ``attempts``,
+                ``retries``, ``hedges``, ``hedge_wins``, ``hedges_throttled``,
+                ``failures``,
+                ``breaker_rejected``, ``deadline_clamped``,
+                ``deadline_exhausted``) and ``breaker`` (``state``,
+                ``times_opened``).
+        """
+        return {
+            "methods": {m: dict(c) for m, c in self._stats.items()},
+            "breaker": {
+                "state": str(self._breaker.state),
+                "times_opened": self._breaker.times_opened,
+            },
+        }
+
+    def _budget(self, method: str, details: Any, policy: MethodPolicy) -> float | None:
+        """Effective total timeout: caller timeout, policy cap and deadline."""
+        timeout = details.timeout
+        if policy.max_timeout_s is not None:
+            timeout = (
+                policy.max_timeout_s
+                if timeout is None
+                else min(timeout, policy.max_timeout_s)
+            )
+        left = remaining_time()
+        if left is not None and (timeout is None or left < timeout):
+            self._count(method, "deadline_clamped")
+            timeout = left
+        return timeout
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = _method_name(client_call_details.method)
+        self._in_flight[method] = self._in_flight.get(method, 0) + 1
+        try:
+            return await self._intercept(
+                method, continuation, client_call_details, request
+            )
+        finally:
+            self._in_flight[method] -= 1
+
+    def _hedge_for(self, method: str, policy: MethodPolicy) -> HedgePolicy | None:
+        hedge = policy.hedge
+        if hedge is not None and self._in_flight[method] > hedge.max_concurrent_calls:
+            self._count(method, "hedges_throttled")
+            return None
+        return hedge
+
+    def _record_error(self, code: grpc.StatusCode) -> None:
+        if code in _BREAKER_CODES:
+            self._breaker.record_failure()
+        elif code in _NO_VERDICT_CODES:
+            self._breaker.abandon()  # No answer either way.
+        else:
+            self._breaker.record_success()  # The endpoint did answer.
+
+    async def _intercept(self, method, continuation, client_call_details, request):
+        policy = self._policy.for_method(method)
+        self._count(method, "calls")
+
+        budget = self._budget(method, client_call_details, policy)
+        expires_at = None if budget is None else time.monotonic() + budget
+        retry = policy.retry
+        max_attempts = retry.max_attempts if retry else 1
+        hedge = self._hedge_for(method, policy)
+
+        attempt = 0
+        while True:
+            if not self._breaker.allow():
+                self._count(method, "breaker_rejected")
+                raise _rpc_error(
+                    grpc.StatusCode.UNAVAILABLE,
+                    f"circuit breaker open for {self._endpoint or 'endpoint'}",
+                )
+            timeout = None if expires_at is None else expires_at - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                self._count(method, "deadline_exhausted")
+                raise _rpc_error(
+                    grpc.StatusCode.DEADLINE_EXCEEDED,
+                    f"{method}: deadline exhausted before attempt {attempt + 1}",
+                )
+            details = client_call_details._replace(timeout=timeout)
+
+            try:
+                if hedge is not None:
+                    response = await self._hedged(
+                        method, hedge, continuation, details, request
+                    )
+                else:
+                    self._count(method, "attempts")
+                    response = await (await continuation(details, request))
+            except grpc.aio.AioRpcError as e:
+                code = e.code()
+                self._record_error(code)
+                attempt += 1
+                if (
+                    retry is None
+                    or code not in retry.retryable_codes
+                    or attempt >= max_attempts
+                ):
+                    self._count(method, "failures")
+                    raise
+                sleep_s = retry.backoff(attempt - 1)
+                if expires_at is not None and time.monotonic() + sleep_s >= expires_at:
+                    self._count(method, "failures")
+                    raise
+                self._count(method, "retries")
+                _logger.debug(
+                    f"[PolicyInterceptor] retry {method} after {code.name} "
+                    f"({attempt}/{max_attempts - 1}, sleep {sleep_s * 1000:.1f} ms)"
+                )
+                await asyncio.sleep(sleep_s)
+                continue
+            except BaseException:
+                self._breaker.abandon()
+                raise
+
+            self._breaker.record_success()
+            return response
+
+    async def _hedged(self, method, hedge, continuation, details, request):
+        """Run up to ``hedge.max_attempts`` staggered copies; first success wins."""
+
+        async def attempt():
+            self._count(method, "attempts")
+            return await (await continuation(details, request))
+
+        first = asyncio.ensure_future(attempt())
+        pending: set[asyncio.Future] = {first}
+        launched = 1
+        error: BaseException | None = None
+        try:
+            while pending:
+                wait_s = hedge.delay_s if launched < hedge.max_attempts else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_s, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    pending.add(asyncio.ensure_future(attempt()))
+                    launched += 1
+                    self._count(method, "hedges")
+                    continue
+                for fut in done:
+                    exc = fut.exception()
+                    if exc is None:
+                        if fut is not first:
+                            self._count(method, "hedge_wins")
+                        return fut.result()
+                    error = exc
+                if not (
+                    isinstance(error, grpc.aio.AioRpcError)
+                    and error.code() in _TRANSIENT_CODES
+                ):
+                    raise error
+                if not pending and launched < hedge.max_attempts:
+                    pending.add(asyncio.ensure_future(attempt()))
+                    launched += 1
+                    self._count(method, "hedges")
+            raise error
+        finally:
+            for fut in pending:
+                fut.cancel()
@@ -0,0 +1,221 @@
+"""
+connection.grpc.pool
+
+Multi-channel pooling for ``GrpcConnection``.
+
+A single ``grpc.aio`` channel multiplexes every RPC over one HTTP/2
+connection, so many concurrent long-running calls (moves, traces, spawns
+across arenas) hit the server's max-concurrent-streams limit and suffer
+head-of-line blocking. ``ChannelPool`` keeps N independent channels to the
+same endpoint and ``PooledStub`` picks one of them for every call.
+
+Exports:
+- ChannelPool: owns the channels and the per-channel in-flight accounting
+- PooledStub: stub proxy that dispatches each call to a selected channel
+- PoolStrategy: channel selection strategy
+"""
+
+import itertools
+from collections.abc import Callable, Sequence
+from enum import StrEnum
+from typing import Any
+
+import grpc.aio
+
+__all__ = ["ChannelPool", "PoolStrategy", "PooledStub"]
+
+
+class PoolStrategy(StrEnum):
+    """Channel selection strategy used by ``ChannelPool``."""
+
+    LEAST_LOADED = "least_loaded"
+    """Pick the channel with the fewest in-flight calls (ties rotate)."""
+    ROUND_ROBIN = "round_robin"
+    """Cycle through channels regardless of their load."""
+
+
+class _PooledChannel:
+    """One channel of the pool plus its stub cache and call accounting."""
+
+    __slots__ = ("channel", "in_flight", "index", "rebuilds", "stubs", "total_calls")
+
+    def __init__(self, index: int, channel: grpc.aio.Channel):
+        self.index = index
+        self.channel = channel
+        self.stubs: dict[type, object] = {}
+        self.in_flight: int = 0
+        self.total_calls: int = 0
+        self.rebuilds: int = 0
+
+
+class ChannelPool:
+    """
+    A fixed-size set of ``grpc.aio`` channels bound to one endpoint.
+
+    Each channel uses its own subchannel pool so that it owns a distinct
+    TCP/HTTP/2 connection instead of sharing the process-global one.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        size: int = 1,
+        options: Sequence[tuple[str, Any]] = (),
+        strategy: PoolStrategy | str = PoolStrategy.LEAST_LOADED,
+        interceptors: Sequence[grpc.aio.ClientInterceptor] = (),
+    ):
+        if size < 1:
+            raise ValueError(f"ChannelPool size must be >= 1, got {size}.")
+        self._endpoint = endpoint
+        self._strategy = PoolStrategy(strategy)
+        self._options = list(options)
+        self._interceptors = list(interceptors)
+        if size > 1:
+            self._options.append(("grpc.use_local_subchannel_pool", 1))
+        self._slots: list[_PooledChannel] = [
+            _PooledChannel(i, self._create_channel()) for i in range(size)
+        ]
+        self._rr = itertools.cycle(range(size))
+
+    def _create_channel(self) -> grpc.aio.Channel:
+        return grpc.aio.insecure_channel(
+            self._endpoint,
+            options=self._options,
+            interceptors=self._interceptors or None,
+        )
+
+    @property
+    def size(self) -> int:
+        """Number of channels in the pool."""
+        return len(self._slots)
+
+    @property
+    def strategy(self) -> PoolStrategy:
+        """Selection strategy used by ``select``."""
+        return self._strategy
+
+    @property
+    def channels(self) -> list[grpc.aio.Channel]:
+        """Underlying channels, in pool order."""
+        return [slot.channel for slot in self._slots]
+
+    def select(self) -> _PooledChannel:
+        """Pick the channel for the next call according to the strategy."""
+        start = next(self._rr)
+        if self._strategy is PoolStrategy.ROUND_ROBIN or len(self._slots) == 1:
+            return self._slots[start]
+
+        # Scan from a rotating start so that equally loaded channels take turns.
+        best = self._slots[start]
+        for offset in range(1, len(self._slots)):
+            slot = self._slots[(start + offset) % len(self._slots)]
+            if slot.in_flight < best.in_flight:
+                best = slot
+        return best
+
+    def stub_for(self, slot: _PooledChannel, stub_cls: type) -> Any:
+        """Return (and cache) the ``stub_cls`` instance bound to ``slot``'s channel."""
+        stub = slot.stubs.get(stub_cls)
+        if stub is None:
+            stub = stub_cls(slot.channel)
+            slot.stubs[stub_cls] = stub
+        return stub
+
+    def acquire(self, slot: _PooledChannel) -> None:
+        slot.in_flight += 1
+        slot.total_calls += 1
+
+    def release(self, slot: _PooledChannel) -> None:
+        slot.in_flight -= 1
+
+    def in_flight(self) -> list[int]:
+        """In-flight call count per channel."""
+        return [slot.in_flight for slot in self._slots]
+
+    def stats(self) -> list[dict[str, int]]:
+        """Per-channel accounting snapshot (``in_flight``, ``total_calls``, ``rebuilds``)."""
+        return [
+            {
+                "in_flight": slot.in_flight,
+                "total_calls": slot.total_calls,
+                "rebuilds": slot.rebuilds,
+            }
+            for slot in self._slots
+        ]
+
+    async def rebuild(self, index: int) -> grpc.aio.Channel:
+        """
+        Replace the channel at ``index`` with a fresh one and drop its stubs.
+
+        The old channel is closed immediately; calls still running on it fail
+        with ``CANCELLED``. Pooled stubs pick up the new channel on their next
+        call.
+
+        Returns:
+            grpc.aio.Channel: The new channel.
+        """
+        slot = self._slots[index]
+        old = slot.channel
+        slot.channel = self._create_channel()
+        slot.stubs.clear()
+        slot.rebuilds += 1
+        await old.close()
+        return slot.channel
+
+    async def aclose(self) -> None:
+        """Close every channel and drop cached stubs."""
+        for slot in self._slots:
+            await slot.channel.close()
+            slot.stubs.clear()
+        self._slots.clear()
+
+
+class _PooledMethod:
+    """Callable standing in for one RPC method of a ``PooledStub``."""
+
+    __slots__ = ("_name", "_pool", "_stub_cls")
+
+    def __init__(self, pool: ChannelPool, stub_cls: type, name: str):
+        self._pool = pool
+        self._stub_cls = stub_cls
+        self._name = name
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        pool = self._pool
+        slot = pool.select()
+        method: Callable[..., Any] = getattr(
+            pool.stub_for(slot, self._stub_cls), self._name
+        )
+        pool.acquire(slot)
+        try:
+            call = method(*args, **kwargs)
+        except BaseException:
+            pool.release(slot)
+            raise
+        call.add_done_callback(lambda _call: pool.release(slot))
+        return call
+
+
+class PooledStub:
+    """
+    Stub proxy that spreads calls over the channels of a ``ChannelPool``.
+
+    Attribute access mirrors the generated stub (``stub.GetActorTransform``);
+    every invocation selects a channel, bumps its in-flight count and returns
+    the native ``grpc.aio`` call object, so awaiting, streaming and
+    cancellation behave exactly as with a plain stub.
+    """
+
+    def __init__(self, pool: ChannelPool, stub_cls: type):
+        self._pool = pool
+        self._stub_cls = stub_cls
+
+    def __getattr__(self, name: str) -> _PooledMethod:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = _PooledMethod(self._pool, self._stub_cls, name)
+        setattr(self, name, method)  # Cache so later lookups skip __getattr__.
+        return method
+
+    def __repr__(self) -> str:
+        return f"PooledStub({self._stub_cls.__name__}, channels={self._pool.size})"
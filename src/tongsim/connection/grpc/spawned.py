@@ -0,0 +1,108 @@
+"""
+connection.grpc.spawned
+
+Columnar result of bulk spawns.
+
+``UnaryAPI.spawn_actors_in_arena_bulk`` populates an arena with hundreds of
+actors per call; ``SpawnedActors`` keeps their identities as NumPy columns
+aligned with the request items instead of one dictionary per actor.
+
+Exports:
+- SpawnedActors: per-item ids, names and class paths of a bulk spawn
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from tongsim_lite_protobuf.object_pb2 import ObjectInfo
+
+from .actor_id import ACTOR_IDS, ActorId
+from .actor_table import _object_array
+
+__all__ = ["SpawnedActors"]
+
+
+class SpawnedActors:
+    """
+    Actors created by one bulk spawn, one row per requested item.
+
+    Rows of items the server could not spawn have ``success`` ``False``,
+    empty strings and handle ``-1``.
+
+    Attributes:
+        ids: Canonical GUID strings.
+        handles: ``int32`` ``ActorId`` handles.
+        names / class_paths: Object metadata reported by the server.
+        success: Whether each item was spawned (``bool``).
+    """
+
+    __slots__ = ("class_paths", "handles", "ids", "names", "success")
+
+    def __init__(
+        self,
+        ids: NDArray[np.object_],
+        handles: NDArray[np.int32],
+        names: NDArray[np.object_],
+        class_paths: NDArray[np.object_],
+        success: NDArray[np.bool_],
+    ):
+        self.ids = ids
+        self.handles = handles
+        self.names = names
+        self.class_paths = class_paths
+        self.success = success
+
+    @classmethod
+    def from_infos(cls, infos: Sequence[ObjectInfo | None]) -> "SpawnedActors":
+        """Decode one ``ObjectInfo`` per item (``None`` for failed items)."""
+        ids = [""] * len(infos)
+        names = [""] * len(infos)
+        class_paths = [""] * len(infos)
+        handles = np.full(len(infos), -1, dtype=np.int32)
+        success = np.zeros(len(infos), dtype=np.bool_)
+        for i, info in enumerate(infos):
+            if info is None or len(info.id.guid) != 16:
+                continue
+            actor = ACTOR_IDS.from_guid(info.id.guid)
+            ids[i] = actor.text
+            handles[i] = actor.handle
+            names[i] = info.name
+            class_paths[i] = info.class_path
+            success[i] = True
+        return cls(
+            _object_array(ids),
+            handles,
+            _object_array(names),
+            _object_array(class_paths),
+            success,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"SpawnedActors(items={len(self)}, failed={self.num_failed})"
+
+    def __getitem__(self, i: int) -> dict[str, Any] | None:
+        """Item ``i`` in the ``spawn_actor_in_arena`` format, or ``None`` if it failed."""
+        if not self.success[i]:
+            return None
+        return {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "class_path": self.class_paths[i],
+        }
+
+    @property
+    def num_failed(self) -> int:
+        return int(len(self) - np.count_nonzero(self.success))
+
+    def to_dicts(self) -> list[dict[str, Any] | None]:
+        """Every item as ``spawn_actor_in_arena`` would have returned it."""
+        return [self[i] for i in range(len(self))]
+
+    def actor_ids(self) -> list[ActorId]:
+        """``ActorId`` of every spawned actor, in item order (failures skipped)."""
+        return [ACTOR_IDS.from_text(t) for t in self.ids[self.success]]
@@ -0,0 +1,184 @@
+"""
+connection.grpc.transform_array
+
+Vectorized conversion between transforms and proto ``Transform`` messages.
+
+``sdk_to_proto`` / ``proto_to_sdk`` convert one ``Transform`` at a time and
+run the quaternion <-> Euler math in pure Python. The helpers here work on
+``(N, 10)`` arrays laid out as::
+
+    [loc.x, loc.y, loc.z, rot.w, rot.x, rot.y, rot.z, scale.x, scale.y, scale.z]
+
+do the rotation math for all rows with NumPy, and write the proto wire format
+from one template, so bulk teleports, spawns and pose reads cost a few array
+operations plus one parse per message. Identity rotations skip the
+trigonometry entirely.
+
+Exports:
+- transforms_to_array / array_to_transforms: ``Transform`` list <-> array
+- array_to_proto_transforms: array -> proto ``Transform`` messages
+- proto_transforms_to_array: proto ``Transform`` messages -> array
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from tongsim_lite_protobuf.common_pb2 import Transform as ProtoTransform
+
+from tongsim.math import Quaternion, Transform, Vector3
+
+__all__ = [
+    "array_to_proto_transforms",
+    "array_to_transforms",
+    "proto_transforms_to_array",
+    "transforms_to_array",
+]
+
+# ``Transform`` with location(1), rotation(2) and scale(3) present, each a
+# 3-float sub-message of fixed32 fields. Floats start at these offsets.
+_TEMPLATE = b"".join(
+    tag + b"\x0f\x0d\0\0\0\0\x15\0\0\0\0\x1d\0\0\0\0"
+    for tag in (b"\x0a", b"\x12", b"\x1a")
+)
+_FLOAT_OFFSETS = np.array([3, 8, 13, 20, 25, 30, 37, 42, 47])
+_BYTE_INDEX = (_FLOAT_OFFSETS[:, None] + np.arange(4)).ravel()
+# Length of a row without its trailing scale sub-message.
+_NO_SCALE = 34
+
+_IDENTITY = np.array([1.0, 0.0, 0.0, 0.0])
+_UNIT_SCALE = np.array([1.0, 1.0, 1.0])
+
+
+def _as_transform_rows(transforms: ArrayLike) -> NDArray[np.float64]:
+    rows = np.asarray(transforms, dtype=np.float64)
+    if rows.ndim == 1:
+        rows = rows[None, :]
+    if rows.ndim != 2 or rows.shape[1] != 10:
+        raise ValueError(f"transforms must be an (N, 10) array, got {rows.shape}.")
+    return rows
+
+
+def _quaternions_to_eulers(q: NDArray[np.float64]) -> NDArray[np.float64]:
+    """``(N, 4)`` ``w, x, y, z`` -> ``(N, 3)`` roll, pitch, yaw in degrees (UE ZYX)."""
+    out = np.zeros((len(q), 3))
+    rotated = ~np.all(q == _IDENTITY, axis=1)
+    if not rotated.any():
+        return out
+    w, x, y, z = q[rotated].T
+    out[rotated, 0] = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    out[rotated, 1] = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    out[rotated, 2] = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    out[rotated] = np.degrees(out[rotated])
+    return out
+
+
+def _eulers_to_quaternions(euler: NDArray[np.float64]) -> NDArray[np.float64]:
+    """``(N, 3)`` roll, pitch, yaw in degrees -> ``(N, 4)`` ``w, x, y, z``."""
+    out = np.tile(_IDENTITY, (len(euler), 1))
+    rotated = np.any(euler != 0.0, axis=1)
+    if not rotated.any():
+        return out
+    half = np.radians(euler[rotated]) * 0.5
+    cr, cp, cy = np.cos(half).T
+    sr, sp, sy = np.sin(half).T
+    out[rotated, 0] = cr * cp * cy + sr * sp * sy
+    out[rotated, 1] = sr * cp * cy - cr * sp * sy
+    out[rotated, 2] = cr * sp * cy + sr * cp * sy
+    out[rotated, 3] = cr * cp * sy - sr * sp * cy
+    return out
+
+
+def transforms_to_array(transforms: Sequence[Transform]) -> NDArray[np.float32]:
+    """Pack ``Transform`` objects into an ``(N, 10)`` float32 array."""
+    return np.array(
+        [
+            (
+                (loc := t.location).x,
+                loc.y,
+                loc.z,
+                (rot := t.rotation).w,
+                rot.x,
+                rot.y,
+                rot.z,
+                (scale := t.scale).x,
+                scale.y,
+                scale.z,
+            )
+            for t in transforms
+        ],
+        dtype=np.float32,
+    ).reshape(-1, 10)
+
+
+def array_to_transforms(transforms: ArrayLike) -> list[Transform]:
+    """Unpack an ``(N, 10)`` array into ``Transform`` objects."""
+    return [
+        Transform(Vector3(lx, ly, lz), Quaternion(w, x, y, z), Vector3(sx, sy, sz))
+        for lx, ly, lz, w, x, y, z, sx, sy, sz in _as_transform_rows(
+            transforms
+        ).tolist()
+    ]
+
+
+def array_to_proto_transforms(
+    transforms: ArrayLike, skip_default_scale: bool = False
+) -> list[ProtoTransform]:
+    """
+    Convert an ``(N, 10)`` array to proto ``Transform`` messages in one pass.
+
+    Args:
+        transforms: Rows of location, quaternion (``w, x, y, z``) and scale.
+        skip_default_scale (bool): Leave ``scale`` unset on rows whose scale
+            is ``(1, 1, 1)``. Only for consumers that ignore or default the
+            scale: the TongSim server applies ``scale`` as sent, and an unset
+            field reads as ``(0, 0, 0)`` there.
+
+    Returns:
+        list[ProtoTransform]: One message per row.
+    """
+    rows = _as_transform_rows(transforms)
+    floats = np.empty((len(rows), 9), dtype="<f4")
+    floats[:, 0:3] = rows[:, 0:3]
+    floats[:, 3:6] = _quaternions_to_eulers(rows[:, 3:7])
+    floats[:, 6:9] = rows[:, 7:10]
+
+    wire = np.tile(np.frombuffer(_TEMPLATE, dtype=np.uint8), (len(rows), 1))
+    wire[:, _BYTE_INDEX] = floats.view(np.uint8).reshape(len(rows), 36)
+    buffer = memoryview(wire.tobytes())
+    size = len(_TEMPLATE)
+    parse = ProtoTransform.FromString
+    if not skip_default_scale:
+        return [parse(buffer[i * size : (i + 1) * size]) for i in range(len(rows))]
+    ends = np.where(np.all(rows[:, 7:10] == _UNIT_SCALE, axis=1), _NO_SCALE, size)
+    return [
+        parse(buffer[i * size : i * size + end]) for i, end in enumerate(ends.tolist())
+    ]
+
+
+def proto_transforms_to_array(
+    transforms: Sequence[ProtoTransform],
+) -> NDArray[np.float32]:
+    """Convert proto ``Transform`` messages to an ``(N, 10)`` float32 array."""
+    fields = np.array(
+        [
+            (
+                (loc := t.location).x,
+                loc.y,
+                loc.z,
+                (rot := t.rotation).roll_deg,
+                rot.pitch_deg,
+                rot.yaw_deg,
+                (scale := t.scale).x,
+                scale.y,
+                scale.z,
+            )
+            for t in transforms
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 9)
+    out = np.empty((len(fields), 10), dtype=np.float32)
+    out[:, 0:3] = fields[:, 0:3]
+    out[:, 3:7] = _eulers_to_quaternions(fields[:, 3:6])
+    out[:, 7:10] = fields[:, 6:9]
+    return out
@@ -1,6 +1,18 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import grpc
+import grpc.aio
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from tongsim.logger import get_logger
 from tongsim.math import Transform, Vector3
 from tongsim.type.rl_demo import RLDemoHandType, RLDemoOrientationMode
 from tongsim_lite_protobuf.arena_pb2 import (
+    BatchSetActorPoseLocalRequest,
+    BatchSpawnActorsInArenaRequest,
     DestroyActorInArenaRequest,
     DestroyArenaRequest,
     GetActorPoseLocalRequest,
@@ -23,9 +35,12 @@ from tongsim_lite_protobuf.arena_pb2 import (
 )
 from tongsim_lite_protobuf.arena_pb2_grpc import ArenaServiceStub
 from tongsim_lite_protobuf.common_pb2 import Empty
+from tongsim_lite_protobuf.common_pb2 import Transform as ProtoTransform
 from tongsim_lite_protobuf.demo_rl_pb2 import (
     ActorState,
+    BatchDestroyActorsRequest,
     BatchMultiLineTraceByObjectRequest,
+    BatchSetActorTransformsRequest,
     BatchSingleLineTraceByObjectRequest,
     DemoRLState,
     DestroyActorRequest,
@@ -54,86 +69,55 @@ from tongsim_lite_protobuf.object_pb2 import ObjectId
 from tongsim_lite_protobuf.voxel_pb2 import QueryVoxelRequest, Voxel
 from tongsim_lite_protobuf.voxel_pb2_grpc import VoxelServiceStub
 
+from .actor_id import ACTOR_IDS, ActorId
+from .actor_table import ActorStateTable
+from .coalesce import ActorReadCoalescer, actor_read_coalescer
 from .core import GrpcConnection
+from .line_trace import LineTraceHits, _as_ray_endpoints, encode_line_trace_jobs
+from .spawned import SpawnedActors
+from .transform_array import (
+    array_to_proto_transforms,
+    proto_transforms_to_array,
+    transforms_to_array,
+)
 from .utils import proto_to_sdk, safe_async_rpc, sdk_to_proto
 
+_logger = get_logger("gRPC")
+
 # --------------------------
-# GUID helpers (UE FGuid LE)
+# Actor id helpers
 # --------------------------
 
 
 def _fguid_bytes_to_str(guid_bytes: bytes) -> str:
     """
-    Convert Unreal FGuid (16 bytes; first 3 fields little-endian) to canonical
-    GUID string: 8-4-4-4-12 uppercase hex.
-
-    Layout (Windows/MS GUID):
-      Data1[4] LE, Data2[2] LE, Data3[2] LE, Data4[8] BE(as-is)
+    Convert Unreal FGuid bytes to the canonical uppercase GUID string
+    (interned through ``ACTOR_IDS``; other lengths fall back to raw hex).
     """
-    if not guid_bytes:
-        return ""
     if len(guid_bytes) != 16:
         return guid_bytes.hex().upper()
+    return ACTOR_IDS.from_guid(guid_bytes).text
 
-    d1 = guid_bytes[0:4][::-1]  # LE -> BE
-    d2 = guid_bytes[4:6][::-1]
-    d3 = guid_bytes[6:8][::-1]
-    d4 = guid_bytes[8:10]  # as-is
-    d5 = guid_bytes[10:16]  # as-is
-    return f"{d1.hex()}-{d2.hex()}-{d3.hex()}-{d4.hex()}-{d5.hex()}".upper()
 
-
-def _guid_str_to_fguid_bytes(guid_str: str) -> bytes:
-    """
-    Convert canonical GUID string (8-4-4-4-12) to Unreal FGuid bytes
-    with first 3 fields little-endian.
-    """
-    if not guid_str:
-        return b""
-    s = guid_str.replace("-", "").strip()
-    if len(s) != 32:
-        # Try raw hex fallback
-        try:
-            b = bytes.fromhex(s)
-            return b if len(b) == 16 else b""
-        except Exception:
-            return b""
-
-    try:
-        raw = bytes.fromhex(s)
-        # raw = [Data1(4) | Data2(2) | Data3(2) | Data4(8)] all BE
-        d1 = raw[0:4][::-1]  # -> LE
-        d2 = raw[4:6][::-1]
-        d3 = raw[6:8][::-1]
-        d4 = raw[8:16]  # as-is
-        return d1 + d2 + d3 + d4
-    except Exception:
-        return b""
-
-
-def _to_object_id(actor_id: bytes | str | dict) -> ObjectId:
+def _to_object_id(actor_id: ActorId | bytes | str | dict) -> ObjectId:
     """
     Build ObjectId from:
+      - ActorId, or
       - bytes (len==16, UE FGuid layout), or
       - canonical GUID str "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX", or
       - dict {"guid": <bytes|str>}
-    """
-    if isinstance(actor_id, dict):
-        actor_id = actor_id.get("guid", b"")
 
-    oid = ObjectId()
-    if isinstance(actor_id, bytes | bytearray):
-        guid_bytes = bytes(actor_id)
-    elif isinstance(actor_id, str):
-        guid_bytes = _guid_str_to_fguid_bytes(actor_id)
-    else:
-        guid_bytes = b""
+    The message is cached per actor by ``ACTOR_IDS``; copy it into requests
+    and never mutate it.
+    """
+    return ACTOR_IDS.intern(actor_id).object_id
 
-    if not guid_bytes or len(guid_bytes) != 16:
-        raise ValueError("actor_id must be 16-byte FGuid or canonical GUID string.")
 
-    oid.guid = guid_bytes
-    return oid
+def _proto_transforms(transforms: Sequence[Transform] | NDArray) -> list[Any]:
+    """Proto ``Transform`` per item of a ``Transform`` list or ``(N, 10)`` array."""
+    if isinstance(transforms, np.ndarray):
+        return array_to_proto_transforms(transforms)
+    return array_to_proto_transforms(transforms_to_array(transforms))
 
 
 def _actor_state_to_dict(actor: ActorState) -> dict:
@@ -155,6 +139,138 @@ def _actor_state_to_dict(actor: ActorState) -> dict:
     }
 
 
+# Items the server accepts in one call of a batch endpoint (larger requests
+# are rejected), so bulk wrappers split their input into chunks of this size.
+BATCH_MAX_ITEMS = 256
+
+
+async def _batch_chunks(
+    conn: GrpcConnection,
+    stub: Any,
+    batch_method: str,
+    make_batch: Callable[[list[Any]], Any],
+    items: list[Any],
+    timeout: float,
+    chunk_size: int,
+) -> list[tuple[int, Any | None]] | None:
+    """
+    Send ``items`` as concurrent ``batch_method`` calls of at most ``chunk_size`` items.
+
+    Returns ``(items in chunk, response)`` in chunk order, with ``None`` as the
+    response of a chunk whose call failed (the other chunks still count), or
+    ``None`` when the server does not implement ``batch_method``.
+    """
+    if not conn.supports(batch_method):
+        return None
+    call = getattr(stub, batch_method)
+    size = max(1, min(chunk_size, BATCH_MAX_ITEMS))
+    chunks = [items[start : start + size] for start in range(0, len(items), size)]
+    replies = await asyncio.gather(
+        *(call(make_batch(chunk), timeout=timeout) for chunk in chunks),
+        return_exceptions=True,
+    )
+    errors = [r for r in replies if isinstance(r, BaseException)]
+    for e in errors:
+        if not isinstance(e, grpc.aio.AioRpcError):
+            raise e
+    # Only a server that rejected every chunk lacks the endpoint.
+    if (
+        errors
+        and len(errors) == len(replies)
+        and all(e.code() == grpc.StatusCode.UNIMPLEMENTED for e in errors)
+    ):
+        conn.mark_unsupported(batch_method)
+        return None
+    for e in errors:
+        _logger.warning(
+            f"[{batch_method}] chunk failed: {e.code().name} {e.details() or ''}"
+        )
+    return [
+        (len(chunk), None if isinstance(reply, BaseException) else reply)
+        for chunk, reply in zip(chunks, replies, strict=True)
+    ]
+
+
+async def _unary_fanout(
+    call: Callable[..., Any],
+    method: str,
+    items: list[Any],
+    timeout: float,
+    max_concurrency: int,
+) -> list[Any | None]:
+    """Send ``items`` one call each, ``max_concurrency`` at a time; ``None`` marks failures."""
+
+    async def one(item: Any) -> Any | None:
+        try:
+            return await call(item, timeout=timeout)
+        except grpc.aio.AioRpcError as e:
+            _logger.warning(f"[{method}] failed: {e.code().name} {e.details() or ''}")
+            return None
+
+    out: list[Any | None] = []
+    for start in range(0, len(items), max_concurrency):
+        chunk = items[start : start + max_concurrency]
+        out.extend(await asyncio.gather(*(one(item) for item in chunk)))
+    return out
+
+
+def _batch_results(
+    batch_method: str, chunks: list[tuple[int, Any | None]]
+) -> list[Any | None]:
+    """
+    Concatenate ``BatchItemResult`` lists of ``_batch_chunks`` responses, logging failures.
+
+    Items of a failed chunk get ``None``.
+    """
+    results = [
+        r
+        for count, resp in chunks
+        for r in (resp.results if resp is not None else [None] * count)
+    ]
+    failed = [
+        (i, "chunk failed" if r is None else r.message)
+        for i, r in enumerate(results)
+        if r is None or not r.success
+    ]
+    if failed:
+        _logger.warning(
+            f"[{batch_method}] {len(failed)}/{len(results)} items failed, "
+            f"first: #{failed[0][0]} {failed[0][1]}"
+        )
+    return results
+
+
+async def _apply_bulk(
+    conn: GrpcConnection,
+    stub_cls: type,
+    batch_method: str,
+    make_batch: Callable[[list[Any]], Any],
+    unary_method: str,
+    items: list[Any],
+    timeout: float,
+    max_concurrency: int,
+    chunk_size: int = BATCH_MAX_ITEMS,
+) -> list[bool]:
+    """
+    Send ``items`` with ``batch_method`` (chunked) and return per-item success.
+
+    When the server does not implement ``batch_method``, the items are sent
+    as ``unary_method`` calls, ``max_concurrency`` at a time.
+    """
+    stub = conn.get_stub(stub_cls)
+    chunks = await _batch_chunks(
+        conn, stub, batch_method, make_batch, items, timeout, chunk_size
+    )
+    if chunks is not None:
+        return [
+            r is not None and r.success for r in _batch_results(batch_method, chunks)
+        ]
+    replies = await _unary_fanout(
+        getattr(stub, unary_method), unary_method, items, timeout, max_concurrency
+    )
+    return [r is not None for r in replies]
+
+
 # --------------------------
 # Public gRPC unary wrappers
 # --------------------------
@@ -181,6 +297,24 @@ class UnaryAPI:
             result.append(_actor_state_to_dict(actor))
         return result
 
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def query_info_table(
+        conn: GrpcConnection, timeout: float = 2.0
+    ) -> ActorStateTable | None:
+        """
+        Columnar variant of ``query_info`` for scenes with many actors.
+
+        Decodes the snapshot into NumPy columns in one pass; ``table[i]`` gives
+        the ``query_info`` dictionary of a single row when needed.
+
+        Returns:
+            ActorStateTable | None: Every actor's state, or ``None`` on failure.
+        """
+        stub = conn.get_stub(DemoRLServiceStub)
+        resp: DemoRLState = await stub.QueryState(Empty(), timeout=timeout)
+        return ActorStateTable.from_protos(resp.actor_states)
+
     @staticmethod
     @safe_async_rpc(default=False)
     async def reset_level(conn: GrpcConnection, timeout: float = 60.0) -> bool:
@@ -243,15 +377,34 @@ class UnaryAPI:
 
         return current_location, hit_result
 
+    @staticmethod
+    def read_coalescer(conn: GrpcConnection) -> ActorReadCoalescer:
+        """
+        Coalescing settings and counters for ``get_actor_transform`` /
+        ``get_actor_state`` on ``conn``.
+
+        Reads issued in the same event-loop tick (or within ``window_s``) are
+        merged into one round trip; set ``enabled = False`` to send one RPC
+        per read, or raise ``window_s`` to merge reads spread over a step.
+        """
+        return actor_read_coalescer(conn)
+
     @staticmethod
     @safe_async_rpc(default=None)
     async def get_actor_state(conn: GrpcConnection, actor_id: str) -> dict | None:
         """
         Fetch the state of a single actor by identifier.
 
+        Concurrent calls on the same connection are coalesced into one
+        ``BatchGetActorStates`` request (see ``read_coalescer``).
+
         Returns:
             dict | None: Actor metadata dictionary, or ``None`` on failure.
         """
+        reads = actor_read_coalescer(conn)
+        if reads.enabled:
+            state = await reads.states.get(ACTOR_IDS.intern(actor_id))
+            return None if state is None else _actor_state_to_dict(state)
         stub = conn.get_stub(DemoRLServiceStub)
         req = GetActorStateRequest(actor_id=_to_object_id(actor_id))
         resp: GetActorStateResponse = await stub.GetActorState(req, timeout=2.0)
@@ -263,14 +416,53 @@ class UnaryAPI:
         """
         Retrieve an actor's world transform.
 
+        Concurrent calls on the same connection are coalesced into one
+        ``BatchGetActorTransforms`` request (see ``read_coalescer``).
+
         Returns:
             Transform | None: World transform, or ``None`` on failure.
         """
+        reads = actor_read_coalescer(conn)
+        if reads.enabled:
+            transform = await reads.transforms.get(ACTOR_IDS.intern(actor_id))
+            return None if transform is None else proto_to_sdk(transform)
         stub = conn.get_stub(DemoRLServiceStub)
         req = GetActorTransformRequest(actor_id=_to_object_id(actor_id))
         resp: GetActorTransformResponse = await stub.GetActorTransform(req, timeout=2.0)
         return proto_to_sdk(resp.transform)
 
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def get_actor_transforms_array(
+        conn: GrpcConnection, actor_ids: Sequence[ActorId | bytes | str | dict]
+    ) -> tuple[NDArray[np.float32], NDArray[np.bool_]] | None:
+        """
+        Read the world transforms of many actors as one ``(N, 10)`` array.
+
+        The reads go through the connection's read coalescer, so they are sent
+        as ``BatchGetActorTransforms`` calls of up to ``max_batch`` actors.
+
+        Returns:
+            tuple | None: ``(transforms, found)``; rows are location, quaternion
+                (``w, x, y, z``) and scale, and rows of actors that could not
+                be read are zero with ``found`` ``False``.
+        """
+        reads = actor_read_coalescer(conn)
+        results = await asyncio.gather(
+            *(reads.transforms.get(ACTOR_IDS.intern(a)) for a in actor_ids),
+            return_exceptions=True,
+        )
+        found = np.fromiter(
+            (isinstance(r, ProtoTransform) for r in results),
+            dtype=np.bool_,
+            count=len(results),
+        )
+        out = np.zeros((len(results), 10), dtype=np.float32)
+        out[found] = proto_transforms_to_array(
+            [r for r in results if isinstance(r, ProtoTransform)]
+        )
+        return out, found
+
     @staticmethod
     @safe_async_rpc(default=False)
     async def set_actor_transform(
@@ -290,6 +482,48 @@ class UnaryAPI:
         await stub.SetActorTransform(req, timeout=2.0)
         return True
 
+    @staticmethod
+    @safe_async_rpc(default=[])
+    async def set_actor_transforms_bulk(
+        conn: GrpcConnection,
+        actor_ids: Sequence[ActorId | bytes | str | dict],
+        transforms: Sequence[Transform] | NDArray,
+        timeout: float = 5.0,
+        max_concurrency: int = 64,
+    ) -> list[bool]:
+        """
+        Teleport many actors to world transforms with one ``BatchSetActorTransforms`` call.
+
+        Items are applied in order. Servers without the batch endpoint get
+        concurrent ``SetActorTransform`` calls instead.
+
+        Args:
+            actor_ids (Sequence): Actors to move.
+            transforms: World transform per actor, as ``Transform`` objects
+                or an ``(N, 10)`` array (see ``transforms_to_array``).
+            timeout (float): RPC timeout in seconds.
+            max_concurrency (int): Unary calls in flight in the fallback path.
+
+        Returns:
+            list[bool]: Success per item (empty if the request failed as a whole).
+        """
+        if len(actor_ids) != len(transforms):
+            raise ValueError("actor_ids and transforms must have the same length.")
+        items = [
+            SetActorTransformRequest(actor_id=_to_object_id(a), transform=t)
+            for a, t in zip(actor_ids, _proto_transforms(transforms), strict=True)
+        ]
+        return await _apply_bulk(
+            conn,
+            DemoRLServiceStub,
+            "BatchSetActorTransforms",
+            lambda batch: BatchSetActorTransformsRequest(items=batch),
+            "SetActorTransform",
+            items,
+            timeout,
+            max_concurrency,
+        )
+
     @staticmethod
     @safe_async_rpc(default=None)
     async def spawn_actor(
@@ -651,6 +885,78 @@ class UnaryAPI:
             "class_path": ai.class_path,
         }
 
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def spawn_actors_in_arena_bulk(
+        conn: GrpcConnection,
+        arena_id: ActorId | bytes | str | dict,
+        class_paths: str | Sequence[str],
+        local_transforms: Sequence[Transform] | NDArray,
+        timeout: float = 15.0,
+        chunk_size: int = BATCH_MAX_ITEMS,
+        max_concurrency: int = 64,
+    ) -> SpawnedActors | None:
+        """
+        Spawn many actors inside one arena with ``BatchSpawnActorsInArena``.
+
+        Items are split into chunks of at most ``chunk_size`` (capped at the
+        server limit ``BATCH_MAX_ITEMS``) that are sent concurrently. Servers
+        without the batch endpoint get concurrent ``SpawnActorInArena`` calls
+        instead.
+
+        Args:
+            arena_id: Arena to populate.
+            class_paths (str | Sequence[str]): One class path for every actor,
+                or one per actor.
+            local_transforms: Arena-local transform per actor, as ``Transform``
+                objects or an ``(N, 10)`` array.
+            timeout (float): Per-RPC timeout in seconds.
+            chunk_size (int): Items per batch call.
+            max_concurrency (int): Unary calls in flight in the fallback path.
+
+        Returns:
+            SpawnedActors | None: Ids, names and class paths aligned with the
+                items (``None`` if the request failed as a whole).
+        """
+        if isinstance(class_paths, str):
+            class_paths = [class_paths] * len(local_transforms)
+        if len(class_paths) != len(local_transforms):
+            raise ValueError("class_paths must be one path or one path per transform.")
+        arena = _to_object_id(arena_id)
+        items = [
+            SpawnActorInArenaRequest(arena_id=arena, class_path=path, local_transform=t)
+            for path, t in zip(
+                class_paths, _proto_transforms(local_transforms), strict=True
+            )
+        ]
+        stub = conn.get_stub(ArenaServiceStub)
+        chunks = await _batch_chunks(
+            conn,
+            stub,
+            "BatchSpawnActorsInArena",
+            lambda batch: BatchSpawnActorsInArenaRequest(items=batch),
+            items,
+            timeout,
+            chunk_size,
+        )
+        if chunks is not None:
+            results = _batch_results("BatchSpawnActorsInArena", chunks)
+            actors = [
+                a
+                for count, resp in chunks
+                for a in (resp.actors if resp is not None else [None] * count)
+            ]
+            return SpawnedActors.from_infos(
+                [
+                    a if r is not None and r.success else None
+                    for r, a in zip(results, actors, strict=True)
+                ]
+            )
+        replies = await _unary_fanout(
+            stub.SpawnActorInArena, "SpawnActorInArena", items, timeout, max_concurrency
+        )
+        return SpawnedActors.from_infos([r and r.actor for r in replies])
+
     @staticmethod
     @safe_async_rpc(default=False)
     async def set_actor_pose_local(
@@ -678,6 +984,68 @@ class UnaryAPI:
         )
         return True
 
+    @staticmethod
+    @safe_async_rpc(default=[])
+    async def set_actor_poses_local_bulk(
+        conn: GrpcConnection,
+        arena_id: ActorId | bytes | str | dict | Sequence[ActorId | bytes | str | dict],
+        actor_ids: Sequence[ActorId | bytes | str | dict],
+        local_transforms: Sequence[Transform] | NDArray,
+        reset_physics: bool = True,
+        timeout: float = 5.0,
+        max_concurrency: int = 64,
+    ) -> list[bool]:
+        """
+        Place many actors at arena-local transforms with one ``BatchSetActorPoseLocal`` call.
+
+        Items are applied in order. Servers without the batch endpoint get
+        concurrent ``SetActorPoseLocal`` calls instead.
+
+        Args:
+            arena_id: One arena for every item, or one arena per item (resets
+                spanning several arenas still take a single call).
+            actor_ids (Sequence): Actors to place.
+            local_transforms: Arena-local transform per actor, as ``Transform``
+                objects or an ``(N, 10)`` array.
+            reset_physics (bool): Clear velocities after teleporting.
+            timeout (float): RPC timeout in seconds.
+            max_concurrency (int): Unary calls in flight in the fallback path.
+
+        Returns:
+            list[bool]: Success per item (empty if the request failed as a whole).
+        """
+        if len(actor_ids) != len(local_transforms):
+            raise ValueError(
+                "actor_ids and local_transforms must have the same length."
+            )
+        if isinstance(arena_id, ActorId | bytes | str | dict):
+            arena_ids = [arena_id] * len(actor_ids)
+        else:
+            arena_ids = list(arena_id)
+            if len(arena_ids) != len(actor_ids):
+                raise ValueError("arena_id must be one id or one id per actor.")
+        items = [
+            SetActorPoseLocalRequest(
+                arena_id=_to_object_id(arena),
+                actor_id=_to_object_id(actor),
+                local_transform=t,
+                reset_physics=reset_physics,
+            )
+            for arena, actor, t in zip(
+                arena_ids, actor_ids, _proto_transforms(local_transforms), strict=True
+            )
+        ]
+        return await _apply_bulk(
+            conn,
+            ArenaServiceStub,
+            "BatchSetActorPoseLocal",
+            lambda batch: BatchSetActorPoseLocalRequest(items=batch),
+            "SetActorPoseLocal",
+            items,
+            timeout,
+            max_concurrency,
+        )
+
     @staticmethod
     @safe_async_rpc(default=None)
     async def get_actor_pose_local(
@@ -755,6 +1123,51 @@ class UnaryAPI:
         await stub.DestroyActor(req, timeout=2.0)
         return True
 
+    @staticmethod
+    @safe_async_rpc(default=[])
+    async def destroy_actors_bulk(
+        conn: GrpcConnection,
+        actor_ids: Sequence[ActorId | bytes | str | dict],
+        force: bool = False,
+        timeout: float = 5.0,
+        chunk_size: int = BATCH_MAX_ITEMS,
+        max_concurrency: int = 64,
+    ) -> list[bool]:
+        """
+        Destroy many actors with ``BatchDestroyActors``.
+
+        Items are split into chunks of at most ``chunk_size`` (capped at the
+        server limit ``BATCH_MAX_ITEMS``) that are sent concurrently. Servers
+        without the batch endpoint get concurrent ``DestroyActor`` calls instead.
+
+        Args:
+            actor_ids (Sequence): Actors to destroy.
+            force (bool): Passed through to the server.
+            timeout (float): Per-RPC timeout in seconds.
+            chunk_size (int): Items per batch call.
+            max_concurrency (int): Unary calls in flight in the fallback path.
+
+        Returns:
+            list[bool]: Success per item (empty if the request failed as a whole).
+        """
+        items = [
+            DestroyActorRequest(actor_id=_to_object_id(a), force=force)
+            for a in actor_ids
+        ]
+        return await _apply_bulk(
+            conn,
+            DemoRLServiceStub,
+            "BatchDestroyActors",
+            lambda batch: BatchDestroyActorsRequest(
+                actor_ids=[r.actor_id for r in batch], force=force
+            ),
+            "DestroyActor",
+            items,
+            timeout,
+            max_concurrency,
+            chunk_size,
+        )
+
     # Arena Load/Reset/Destroy now complete asynchronously on the server,
     # but remain awaitable for SDK clients (signatures and IDs stay unchanged).
 
@@ -918,3 +1331,91 @@ class UnaryAPI:
                 item["hits"].append(hit)
             out.append(item)
         return out
+
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def single_line_trace_arrays(
+        conn: GrpcConnection,
+        starts: ArrayLike,
+        ends: ArrayLike,
+        object_types: Sequence[int],
+        *,
+        actors_to_ignore: Sequence[bytes | str | dict] = (),
+        trace_complex: bool | None = None,
+        timeout: float = 5.0,
+    ) -> LineTraceHits | None:
+        """
+        Array variant of ``single_line_trace_by_object`` for ray sensors.
+
+        Every ray shares ``object_types``, ``actors_to_ignore`` and
+        ``trace_complex``; the request is encoded and the response decoded
+        without building per-ray Python objects.
+
+        Args:
+            starts (ArrayLike): ``(N, 3)`` ray starts (a single ``(3,)`` origin is broadcast).
+            ends (ArrayLike): ``(N, 3)`` ray ends.
+            object_types (Sequence[int]): ``CollisionObjectType`` values to trace against.
+            actors_to_ignore (Sequence[bytes | str | dict]): Actors ignored by every ray.
+            trace_complex (bool | None): Trace against complex collision; ``None`` uses the server default.
+            timeout (float): RPC timeout in seconds.
+
+        Returns:
+            LineTraceHits | None: At most one hit per ray, or ``None`` on failure.
+        """
+        s, e = _as_ray_endpoints(starts, ends)
+        req = BatchSingleLineTraceByObjectRequest.FromString(
+            encode_line_trace_jobs(
+                s,
+                e,
+                object_types,
+                [_to_object_id(a) for a in actors_to_ignore],
+                trace_complex,
+            )
+        )
+        stub = conn.get_stub(DemoRLServiceStub)
+        resp = await stub.BatchSingleLineTraceByObject(req, timeout=timeout)
+        return LineTraceHits.from_single(len(s), resp.results)
+
+    @staticmethod
+    @safe_async_rpc(default=None)
+    async def multi_line_trace_arrays(
+        conn: GrpcConnection,
+        starts: ArrayLike,
+        ends: ArrayLike,
+        object_types: Sequence[int],
+        *,
+        actors_to_ignore: Sequence[bytes | str | dict] = (),
+        trace_complex: bool | None = None,
+        timeout: float = 5.0,
+        enable_debug_draw: bool = False,
+    ) -> LineTraceHits | None:
+        """
+        Array variant of ``multi_line_trace_by_object`` for ray sensors.
+
+        Args:
+            starts (ArrayLike): ``(N, 3)`` ray starts (a single ``(3,)`` origin is broadcast).
+            ends (ArrayLike): ``(N, 3)`` ray ends.
+            object_types (Sequence[int]): ``CollisionObjectType`` values to trace against.
+            actors_to_ignore (Sequence[bytes | str | dict]): Actors ignored by every ray.
+            trace_complex (bool | None): Trace against complex collision; ``None`` uses the server default.
+            timeout (float): RPC timeout in seconds.
+            enable_debug_draw (bool): Whether to render debug lines in UE.
+
+        Returns:
+            LineTraceHits | None: All blocking hits per ray ordered by distance,
+                or ``None`` on failure.
+        """
+        s, e = _as_ray_endpoints(starts, ends)
+        req = BatchMultiLineTraceByObjectRequest.FromString(
+            encode_line_trace_jobs(
+                s,
+                e,
+                object_types,
+                [_to_object_id(a) for a in actors_to_ignore],
+                trace_complex,
+            )
+        )
+        req.enable_debug_draw = bool(enable_debug_draw)
+        stub = conn.get_stub(DemoRLServiceStub)
+        resp = await stub.BatchMultiLineTraceByObject(req, timeout=timeout)
+        return LineTraceHits.from_multi(len(s), resp.results)
@@ -11,6 +11,7 @@ import pkgutil
 from collections.abc import AsyncIterator, Awaitable, Callable, Generator
 from typing import Any, ParamSpec, TypeVar, cast
 
+import grpc.aio
 from google.protobuf.message import Message as ProtoMessage
 
 from tongsim.logger import get_logger
@@ -22,6 +23,7 @@ from tongsim_lite_protobuf.common_pb2 import Vector3f as ProtoVector3f
 _logger = get_logger("gRPC")
 
 __all__ = [
+    "grpc_stub_registry",
     "iter_all_grpc_stubs",
     "iter_all_proto_messages",
     "proto_to_sdk",
@@ -68,12 +70,37 @@ def iter_all_grpc_stubs() -> Generator[tuple[str, type], None, None]:
                     yield name, obj
 
 
+@functools.cache
+def grpc_stub_registry() -> dict[str, str]:
+    """
+    Map every known gRPC stub class name to the module defining it.
+
+    Prefers the static ``_stub_registry`` module emitted by
+    ``scripts/generate_pb2.py``; falls back to ``iter_all_grpc_stubs`` when the
+    generated code predates the registry. The result is computed once per
+    process.
+
+    Returns:
+        dict[str, str]: ``{"DemoRLServiceStub": "tongsim_lite_protobuf.demo_rl_pb2_grpc", ...}``.
+    """
+    try:
+        registry = importlib.import_module(f"{_PACKAGE}._stub_registry")
+        return dict(registry.STUBS)
+    except ImportError:
+        _logger.debug("Static stub registry not found; scanning protocol package.")
+        return {name: stub_cls.__module__ for name, stub_cls in iter_all_grpc_stubs()}
+
+
 def safe_async_rpc[T](
     default: T | None = None, raise_on_error: bool = False
 ) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
     """
     Decorator that wraps async RPC invocations with safety guards.
 
+    Transient failures are handled below this decorator by the connection's
+    ``PolicyInterceptor`` (retries, hedging, deadlines, circuit breaker); only
+    the final outcome reaches it and is logged with its status code.
+
     Args:
         default: Value (or awaitable factory) returned when an exception occurs.
         raise_on_error: When ``True``, re-raise the captured exception instead of
@@ -92,6 +119,15 @@ def safe_async_rpc[T](
             try:
                 _logger.debug(f"gRPC async call {func.__name__}")
                 return await func(*args, **kwargs)
+            except grpc.aio.AioRpcError as e:
+                # Retries/hedging already ran in PolicyInterceptor; log the final
+                # status without a traceback, it carries no extra information.
+                _logger.error(
+                    f"gRPC async call {func.__name__} failed: "
+                    f"{e.code().name} {e.details() or ''}"
+                )
+                if raise_on_error:
+                    raise
             except Exception:
                 _logger.error(f"gRPC async call {func.__name__} failed", exc_info=True)
                 if raise_on_error:
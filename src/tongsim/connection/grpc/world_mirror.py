@@ -0,0 +1,403 @@
+"""
+connection.grpc.world_mirror
+
+Client-side mirror of the world state, kept current with deltas.
+
+``UnaryAPI.query_info`` transfers every actor of the level on each call,
+although most of a large scene (static props) never changes. The server
+stamps its state with a monotonically increasing version, and
+``QueryStateDelta`` / ``StreamStateDelta`` return only the actors changed or
+removed since a given version. ``WorldStateMirror`` applies those deltas in
+place to NumPy columns and answers lookups by id, tag and arena locally.
+
+Exports:
+- WorldStateMirror: columnar world state with delta updates
+"""
+
+import asyncio
+import time
+import weakref
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import grpc
+import grpc.aio
+import numpy as np
+from numpy.typing import NDArray
+from tongsim_lite_protobuf.common_pb2 import Empty
+from tongsim_lite_protobuf.demo_rl_pb2 import (
+    ActorState,
+    QueryStateDeltaRequest,
+    StateDelta,
+)
+from tongsim_lite_protobuf.demo_rl_pb2_grpc import DemoRLServiceStub
+from tongsim_lite_protobuf.object_pb2 import ObjectId
+
+from tongsim.logger import get_logger
+
+from .actor_id import ACTOR_IDS, ActorId
+from .actor_table import ActorStateTable, _float_rows, _id_columns
+from .core import GrpcConnection
+
+__all__ = ["WorldStateMirror"]
+
+_logger = get_logger("gRPC")
+
+_INITIAL_CAPACITY = 256
+
+
+class WorldStateMirror:
+    """
+    Columnar copy of the server's actor states, updated by deltas.
+
+    Rows are stored densely (removing an actor moves the last row into its
+    slot), so row numbers are only stable between two updates; address
+    actors by id. Lookups return ``ActorStateTable`` copies that stay valid
+    after later updates.
+
+    Against a server without ``QueryStateDelta`` every ``refresh`` falls back
+    to a full ``QueryState`` snapshot, which keeps the mirror correct at the
+    old cost.
+
+    Attributes:
+        version: Server state version of the last applied delta (``0``
+            before the first update).
+        tick: Server frame number of that version.
+        updated_at: ``time.monotonic()`` of the last applied delta.
+    """
+
+    def __init__(
+        self,
+        conn: GrpcConnection,
+        tags: Sequence[str] = (),
+        timeout: float = 2.0,
+    ):
+        """
+        Args:
+            conn: Connection to read from.
+            tags: Mirror only actors with these tags (all actors when empty).
+            timeout: Per-RPC timeout in seconds.
+        """
+        self._conn = weakref.ref(conn)
+        self._tag_filter = list(tags)
+        self._timeout = timeout
+        self.version = 0
+        self.tick = 0
+        self.updated_at = 0.0
+
+        self._size = 0
+        self._rows: dict[bytes, int] = {}
+        self._guids: list[bytes] = []
+        self._by_tag: dict[str, set[bytes]] = {}
+        self._by_arena: dict[str, set[bytes]] = {}
+        # Columns, grown by doubling; rows [0, _size) are live.
+        self._floats = np.empty((0, 16), dtype=np.float32)
+        self._handles = np.empty(0, dtype=np.int32)
+        self._destroyed = np.empty(0, dtype=np.bool_)
+        self._versions = np.empty(0, dtype=np.uint64)
+        self._ids = np.empty(0, dtype=object)
+        self._names = np.empty(0, dtype=object)
+        self._class_paths = np.empty(0, dtype=object)
+        self._tags = np.empty(0, dtype=object)
+        self._arenas = np.empty(0, dtype=object)
+        self._allocate(_INITIAL_CAPACITY)
+
+        self._full_syncs = 0
+        self._deltas = 0
+        self._rows_changed = 0
+        self._rows_removed = 0
+
+    # ---------------------------
+    # Storage
+    # ---------------------------
+
+    def _allocate(self, capacity: int) -> None:
+        def grow(old: NDArray, fill: Any) -> NDArray:
+            new = np.full((capacity, *old.shape[1:]), fill, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            return new
+
+        self._floats = grow(self._floats, 0.0)
+        self._handles = grow(self._handles, -1)
+        self._destroyed = grow(self._destroyed, False)
+        self._versions = grow(self._versions, 0)
+        self._ids = grow(self._ids, "")
+        self._names = grow(self._names, "")
+        self._class_paths = grow(self._class_paths, "")
+        self._tags = grow(self._tags, "")
+        self._arenas = grow(self._arenas, "")
+
+    def _clear(self) -> None:
+        self._size = 0
+        self._rows.clear()
+        self._guids.clear()
+        self._by_tag.clear()
+        self._by_arena.clear()
+
+    def _index(self, index: dict[str, set[bytes]], key: str, guid: bytes) -> None:
+        index.setdefault(key, set()).add(guid)
+
+    def _unindex(self, index: dict[str, set[bytes]], key: str, guid: bytes) -> None:
+        members = index.get(key)
+        if members is not None:
+            members.discard(guid)
+            if not members:
+                del index[key]
+
+    def _remove(self, guid: bytes) -> None:
+        row = self._rows.pop(guid, None)
+        if row is None:
+            return
+        self._unindex(self._by_tag, self._tags[row], guid)
+        self._unindex(self._by_arena, self._arenas[row], guid)
+        last = self._size - 1
+        if row != last:
+            moved = self._guids[last]
+            self._guids[row] = moved
+            self._rows[moved] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self._guids.pop()
+        self._size = last
+
+    def _columns(self) -> tuple[NDArray, ...]:
+        return (
+            self._floats,
+            self._handles,
+            self._destroyed,
+            self._versions,
+            self._ids,
+            self._names,
+            self._class_paths,
+            self._tags,
+            self._arenas,
+        )
+
+    def _upsert(
+        self, states: Sequence[ActorState], arenas: Sequence[str], version: int
+    ) -> None:
+        if self._size + len(states) > len(self._handles):
+            capacity = len(self._handles)
+            while capacity < self._size + len(states):
+                capacity *= 2
+            self._allocate(capacity)
+
+        ids, handles = _id_columns(states)
+        rows = np.empty(len(states), dtype=np.intp)
+        for i, state in enumerate(states):
+            guid = state.object_info.id.guid
+            row = self._rows.get(guid)
+            if row is None:
+                row = self._rows[guid] = self._size
+                self._guids.append(guid)
+                self._size += 1
+                self._tags[row] = self._arenas[row] = None
+            tag, arena = state.tag, arenas[i]
+            if self._tags[row] != tag:
+                if self._tags[row] is not None:
+                    self._unindex(self._by_tag, self._tags[row], guid)
+                self._index(self._by_tag, tag, guid)
+                self._tags[row] = tag
+            if self._arenas[row] != arena:
+                if self._arenas[row] is not None:
+                    self._unindex(self._by_arena, self._arenas[row], guid)
+                self._index(self._by_arena, arena, guid)
+                self._arenas[row] = arena
+            self._names[row] = state.object_info.name
+            self._class_paths[row] = state.object_info.class_path
+            rows[i] = row
+
+        self._floats[rows] = _float_rows(states)
+        self._ids[rows] = ids
+        self._handles[rows] = handles
+        self._destroyed[rows] = [s.destroyed for s in states]
+        self._versions[rows] = version
+
+    # ---------------------------
+    # Updates
+    # ---------------------------
+
+    def apply(self, delta: StateDelta) -> int:
+        """
+        Apply one ``StateDelta`` (from ``QueryStateDelta`` or the stream).
+
+        Returns:
+            int: Number of actors added, changed or removed.
+        """
+        if delta.full:
+            self._clear()
+            self._full_syncs += 1
+        else:
+            self._deltas += 1
+        for actor_id in delta.removed:
+            self._remove(actor_id.guid)
+        arenas = [_arena_text(a) for a in delta.changed_arena_ids]
+        arenas += [""] * (len(delta.changed) - len(arenas))
+        self._upsert(delta.changed, arenas, delta.version)
+
+        self._rows_changed += len(delta.changed)
+        self._rows_removed += len(delta.removed)
+        self.version = delta.version
+        self.tick = delta.tick
+        self.updated_at = time.monotonic()
+        return len(delta.changed) + len(delta.removed)
+
+    def _apply_snapshot(self, states: Sequence[ActorState]) -> int:
+        if self._tag_filter:
+            states = [s for s in states if s.tag in self._tag_filter]
+        self._clear()
+        self.version += 1
+        self._upsert(states, [""] * len(states), self.version)
+        self._full_syncs += 1
+        self._rows_changed += len(states)
+        self.updated_at = time.monotonic()
+        return len(states)
+
+    def _stub(self) -> tuple[GrpcConnection, DemoRLServiceStub]:
+        conn = self._conn()
+        if conn is None:
+            raise RuntimeError("[WorldStateMirror] connection is gone.")
+        return conn, conn.get_stub(DemoRLServiceStub)
+
+    def _request(self) -> QueryStateDeltaRequest:
+        return QueryStateDeltaRequest(since_version=self.version, tags=self._tag_filter)
+
+    async def refresh(self) -> int:
+        """
+        Fetch and apply the changes since ``version``.
+
+        Returns:
+            int: Number of actors added, changed or removed.
+        """
+        conn, stub = self._stub()
+        if conn.supports("QueryStateDelta"):
+            try:
+                delta = await stub.QueryStateDelta(
+                    self._request(), timeout=self._timeout
+                )
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                conn.mark_unsupported("QueryStateDelta")
+            else:
+                return self.apply(delta)
+        snapshot = await stub.QueryState(Empty(), timeout=self._timeout)
+        return self._apply_snapshot(snapshot.actor_states)
+
+    async def follow(self, interval_s: float = 0.05) -> None:
+        """
+        Keep the mirror current until cancelled.
+
+        Subscribes to ``StreamStateDelta``; if the server does not implement
+        it (or the stream ends), polls ``refresh`` every ``interval_s``.
+        Run it as a task and cancel the task to stop.
+        """
+        conn, stub = self._stub()
+        if conn.supports("StreamStateDelta"):
+            try:
+                async for delta in stub.StreamStateDelta(self._request()):
+                    self.apply(delta)
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                conn.mark_unsupported("StreamStateDelta")
+        while True:
+            try:
+                await self.refresh()
+            except grpc.aio.AioRpcError as e:
+                _logger.warning(f"[WorldStateMirror] refresh failed: {e.code().name}")
+            await asyncio.sleep(interval_s)
+
+    # ---------------------------
+    # Lookups
+    # ---------------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, actor_id: object) -> bool:
+        return self.index_of(actor_id) >= 0
+
+    def __repr__(self) -> str:
+        return (
+            f"WorldStateMirror(actors={self._size}, version={self.version}, "
+            f"tick={self.tick})"
+        )
+
+    def index_of(self, actor_id: Any) -> int:
+        """Current row of ``actor_id`` (any form ``ACTOR_IDS`` accepts), or ``-1``."""
+        try:
+            guid = ACTOR_IDS.intern(actor_id).guid
+        except ValueError:
+            return -1
+        return self._rows.get(guid, -1)
+
+    def _table(self, rows: NDArray[np.intp]) -> ActorStateTable:
+        floats = self._floats[rows]
+        return ActorStateTable(
+            ids=self._ids[rows],
+            handles=self._handles[rows],
+            names=self._names[rows],
+            class_paths=self._class_paths[rows],
+            tags=self._tags[rows],
+            location=floats[:, 0:3],
+            forward=floats[:, 3:6],
+            right=floats[:, 6:9],
+            bbox_min=floats[:, 9:12],
+            bbox_max=floats[:, 12:15],
+            speed=floats[:, 15],
+            destroyed=self._destroyed[rows],
+        )
+
+    def _rows_of(self, guids: Iterable[bytes]) -> NDArray[np.intp]:
+        return np.sort(np.fromiter((self._rows[g] for g in guids), dtype=np.intp))
+
+    def table(self) -> ActorStateTable:
+        """Every mirrored actor."""
+        return self._table(np.arange(self._size))
+
+    def get(self, actor_id: Any) -> dict[str, Any] | None:
+        """``actor_id`` in the ``query_info`` format, or ``None`` when unknown."""
+        row = self.index_of(actor_id)
+        return None if row < 0 else self._table(np.array([row])).row(0)
+
+    def with_tag(self, tag: str) -> ActorStateTable:
+        """Actors whose tag equals ``tag``."""
+        return self._table(self._rows_of(self._by_tag.get(tag, ())))
+
+    def in_arena(self, arena_id: ActorId | str) -> ActorStateTable:
+        """Actors the server reported inside ``arena_id``."""
+        key = arena_id.text if isinstance(arena_id, ActorId) else arena_id.upper()
+        return self._table(self._rows_of(self._by_arena.get(key, ())))
+
+    def changed_since(self, version: int) -> ActorStateTable:
+        """Actors added or changed after ``version`` (a previous ``version`` stamp)."""
+        return self._table(np.flatnonzero(self._versions[: self._size] > version))
+
+    def arena_of(self, actor_id: Any) -> str:
+        """Arena id of ``actor_id`` (``""`` when unknown or outside any arena)."""
+        row = self.index_of(actor_id)
+        return "" if row < 0 else self._arenas[row]
+
+    def locations(self, actor_ids: Iterable[Any]) -> NDArray[np.float32]:
+        """``(N, 3)`` locations of several actors (``NaN`` rows for unknown ids)."""
+        rows = np.fromiter((self.index_of(a) for a in actor_ids), dtype=np.intp)
+        out = self._floats[rows, 0:3]
+        out[rows < 0] = np.nan
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        """Update counters: full syncs, deltas, rows changed/removed and stamps."""
+        return {
+            "actors": self._size,
+            "version": self.version,
+            "tick": self.tick,
+            "full_syncs": self._full_syncs,
+            "deltas": self._deltas,
+            "rows_changed": self._rows_changed,
+            "rows_removed": self._rows_removed,
+        }
+
+
+def _arena_text(arena_id: ObjectId) -> str:
+    return ACTOR_IDS.from_guid(arena_id.guid).text if len(arena_id.guid) == 16 else ""
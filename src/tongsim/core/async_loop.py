@@ -15,6 +15,7 @@ Goals:
 
 import asyncio
 import contextlib
+import contextvars
 import threading
 from collections.abc import Awaitable
 from concurrent.futures import Future
@@ -128,9 +129,14 @@ class AsyncLoop:
             raise RuntimeError(f"[AsyncLoop {self._name}] not started.")
 
         outer: Future[Any] = Future()
+        # Run in the caller's context so context variables (e.g. RPC deadlines)
+        # cross the thread boundary.
+        context = contextvars.copy_context()
 
         def _schedule() -> None:
-            task: asyncio.Task[Any] = self._task_group.create_task(coro, name=name)
+            task: asyncio.Task[Any] = self._task_group.create_task(
+                coro, name=name, context=context
+            )
             self._business_tasks.add(task)
 
             def _on_done(t: asyncio.Task[Any]) -> None:
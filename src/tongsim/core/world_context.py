@@ -5,14 +5,17 @@ Defines WorldContext, which owns the resources bound to a single TongSim
 runtime: the async event loop and gRPC connectivity.
 """
 
+import asyncio
 import threading
 import uuid
-from collections.abc import Awaitable
+from collections.abc import Awaitable, Iterable
 from concurrent.futures import Future
-from typing import Any, Final
+from typing import Any, Final, Literal
 
 from tongsim.connection.grpc import (
     GrpcConnection,
+    RpcPolicy,
+    render_metrics,
 )
 from tongsim.core import AsyncLoop
 from tongsim.logger import get_logger
@@ -32,7 +35,26 @@ class WorldContext:
         - All owned resources are closed automatically during teardown.
     """
 
-    def __init__(self, grpc_endpoint: str):
+    def __init__(
+        self,
+        grpc_endpoint: str,
+        channel_pool_size: int = 1,
+        rpc_policy: RpcPolicy | None = None,
+        connect_timeout: float = 0.0,
+    ):
+        """
+        Args:
+            grpc_endpoint (str): gRPC endpoint of the UE server.
+            channel_pool_size (int): Number of gRPC channels opened to the
+                endpoint; values above 1 spread concurrent RPCs over several
+                HTTP/2 connections.
+            rpc_policy (RpcPolicy | None): Retry/hedge/circuit-breaker policy
+                applied to unary RPCs; ``None`` uses the defaults.
+            connect_timeout (float): Bounded wait for the channels to become
+                ready before returning; ``0`` (default) starts connecting
+                without waiting. A server that is not up yet only produces a
+                warning.
+        """
         self._uuid: Final[uuid.UUID] = uuid.uuid4()
         self._loop: Final[AsyncLoop] = AsyncLoop(name=f"world-main-loop-{self._uuid}")
         self._loop.start()
@@ -40,14 +62,27 @@ class WorldContext:
         self._conn: Final[GrpcConnection]
 
         # Ensure stubs are initialised on the AsyncLoop so gRPC sees the same loop.
-        self.sync_run(self._async_init_grpc(grpc_endpoint))
+        self.sync_run(
+            self._async_init_grpc(
+                grpc_endpoint, channel_pool_size, rpc_policy, connect_timeout
+            )
+        )
 
         _logger.debug(f"[WorldContext {self._uuid}] started.")
         self._is_shutdown: bool = False
 
     # TODO: classmethod
-    async def _async_init_grpc(self, grpc_endpoint: str):
-        self._conn = GrpcConnection(grpc_endpoint)
+    async def _async_init_grpc(
+        self,
+        grpc_endpoint: str,
+        channel_pool_size: int,
+        rpc_policy: RpcPolicy | None,
+        connect_timeout: float,
+    ):
+        self._conn = GrpcConnection(
+            grpc_endpoint, pool_size=channel_pool_size, policy=rpc_policy
+        )
+        await self._conn.connect(timeout=connect_timeout)
 
     @property
     def uuid(self) -> str:
@@ -68,6 +103,9 @@ class WorldContext:
         """
         Execute an async coroutine on the loop and wait for it synchronously.
 
+        The coroutine runs in a copy of the caller's context, so an enclosing
+        ``deadline(...)`` scope bounds the RPCs it issues.
+
         Args:
             coro (Awaitable): Coroutine to run.
             timeout (float | None): Optional timeout in seconds. Raises TimeoutError
@@ -89,6 +127,85 @@ class WorldContext:
         """Schedule a coroutine on the loop without waiting for completion."""
         return self._loop.spawn(coro, name=name)
 
+    def sync_run_many(
+        self,
+        coros: Iterable[Awaitable],
+        timeout: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Run several coroutines concurrently on the loop and wait for all of them.
+
+        Unlike calling ``sync_run`` once per coroutine, the whole batch crosses
+        the thread boundary in a single hop and completes a single future.
+
+        Args:
+            coros (Iterable[Awaitable]): Coroutines to run.
+            timeout (float | None): Optional timeout in seconds for the whole
+                batch. Raises TimeoutError if exceeded.
+            return_exceptions (bool): When ``True``, exceptions are returned in
+                place of results; otherwise the first exception (in input
+                order) is raised once every coroutine has finished.
+
+        Returns:
+            list[Any]: Results in the same order as ``coros``.
+        """
+        if threading.current_thread() is self._loop.thread:
+            raise RuntimeError(
+                f"Cannot call `sync_run_many` from the same thread as AsyncLoop [{self._loop.name}] - this would cause a deadlock."
+            )
+
+        results = self.gather_sync(coros).result(timeout=timeout)
+        if not return_exceptions:
+            for item in results:
+                if isinstance(item, BaseException):
+                    raise item
+        return results
+
+    def gather_sync(self, coros: Iterable[Awaitable], name: str = "") -> Future[list]:
+        """
+        Submit several coroutines to the loop in one hop without waiting.
+
+        This is the non-blocking counterpart of ``sync_run_many``: a synchronous
+        caller can issue all RPCs of a step, do other work, then collect them.
+
+        Args:
+            coros (Iterable[Awaitable]): Coroutines to run concurrently.
+            name (str): Optional task name for logging.
+
+        Returns:
+            Future[list]: Resolves to the ordered list of results; a coroutine
+                that raised contributes its exception object instead of a
+                result, so one failure never cancels its siblings.
+        """
+        return self._loop.spawn(
+            _gather_all(list(coros)),
+            name=name or f"[World-Context {self.uuid} batch task]",
+        )
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Client-side RPC metrics of this world's connection.
+
+        Returns:
+            dict: Per-method latency percentiles (p50/p95/p99), payload bytes,
+                in-flight counts and status codes, plus call-policy decisions
+                and per-channel load. See ``GrpcConnection.metrics``.
+        """
+        return self._conn.metrics()
+
+    def dump_metrics(self, fmt: Literal["prometheus", "json"] = "prometheus") -> str:
+        """
+        Render ``metrics()`` as Prometheus text exposition or as JSON.
+
+        Args:
+            fmt (str): ``"prometheus"`` or ``"json"``.
+
+        Returns:
+            str: Serialised metrics.
+        """
+        return render_metrics(self._conn.metrics(), fmt)
+
     def release(self):
         """
         Release all managed resources:
@@ -125,3 +242,8 @@ class WorldContext:
     def __del__(self):
         _logger.debug(f"[WorldContext {self._uuid}] gc.")
         self.release()
+
+
+async def _gather_all(coros: list[Awaitable]) -> list[Any]:
+    """Await ``coros`` concurrently, keeping exceptions as ordered results."""
+    return await asyncio.gather(*coros, return_exceptions=True)
@@ -0,0 +1,3 @@
+from .pointcloud import depth_to_linear, depth_to_points, fuse_points
+
+__all__ = ["depth_to_linear", "depth_to_points", "fuse_points"]
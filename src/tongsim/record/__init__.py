@@ -0,0 +1,5 @@
+from .dataset import CaptureDataset, RecordedFrame
+from .layout import INDEX_DTYPE
+from .recorder import CaptureRecorder
+
+__all__ = ["INDEX_DTYPE", "CaptureDataset", "CaptureRecorder", "RecordedFrame"]
@@ -0,0 +1,255 @@
+"""
+record.dataset
+
+Random access to a dataset written by ``CaptureRecorder``.
+
+The index is memory-mapped as one structured array and chunk files are
+mapped read-only on first use, so opening an hours-long recording is
+instant and a frame's images are NumPy views into the page cache: nothing is
+read until the pixels are touched, and nothing is copied.
+
+Exports:
+- CaptureDataset: reader over a recorded dataset directory
+- RecordedFrame: one recorded frame with zero-copy image views
+"""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .layout import INDEX_DTYPE, INDEX_FILE, chunk_path, frame_layout, read_meta
+
+__all__ = ["CaptureDataset", "RecordedFrame"]
+
+
+class RecordedFrame:
+    """
+    One frame of a ``CaptureDataset``, shaped like ``CaptureFrame``.
+
+    ``bgra`` / ``rgb`` / ``alpha`` / ``depth`` are read-only views into the
+    chunk files; ``np.array(frame.rgb)`` makes a writable copy. ``width`` /
+    ``height`` are the camera's resolution, so frames can be passed to
+    ``tongsim.perception`` like live ones.
+    """
+
+    __slots__ = ("_record", "bgra", "camera_id", "depth", "height", "width")
+
+    def __init__(
+        self,
+        record: np.void,
+        camera_id: bytes,
+        bgra: NDArray[np.uint8] | None,
+        depth: NDArray[np.float32] | None,
+        width: int,
+        height: int,
+    ):
+        self._record = record
+        self.camera_id = camera_id
+        self.bgra = bgra
+        self.depth = depth
+        self.width = width
+        self.height = height
+
+    def __repr__(self) -> str:
+        return (
+            f"RecordedFrame(camera={self.camera_id.hex()[:8]}, "
+            f"frame_id={self.frame_id}, game_time={self.game_time:.4f})"
+        )
+
+    @property
+    def record(self) -> np.void:
+        """Raw ``INDEX_DTYPE`` record."""
+        return self._record
+
+    @property
+    def frame_id(self) -> int:
+        return int(self._record["frame_id"])
+
+    @property
+    def game_time(self) -> float:
+        return float(self._record["game_time"])
+
+    @property
+    def gpu_ready(self) -> float:
+        return float(self._record["gpu_ready"])
+
+    @property
+    def wall_time(self) -> float:
+        """``time.time()`` when the frame was handed to the recorder."""
+        return float(self._record["wall_time"])
+
+    @property
+    def has_color(self) -> bool:
+        return bool(self._record["has_color"])
+
+    @property
+    def has_depth(self) -> bool:
+        return bool(self._record["has_depth"])
+
+    @property
+    def depth_near(self) -> float:
+        return float(self._record["depth_near"])
+
+    @property
+    def depth_far(self) -> float:
+        return float(self._record["depth_far"])
+
+    @property
+    def depth_mode(self) -> int:
+        return int(self._record["depth_mode"])
+
+    @property
+    def intrinsics(self) -> NDArray[np.float64]:
+        """``(3, 3)`` pinhole matrix, as ``CaptureFrame.intrinsics``."""
+        return self._record["intrinsics"]
+
+    @property
+    def world_pose(self) -> NDArray[np.float64]:
+        """``(4, 4)`` camera-to-world matrix, as ``CaptureFrame.world_pose``."""
+        return self._record["world_pose"]
+
+    @property
+    def rgb(self) -> NDArray[np.uint8] | None:
+        return None if self.bgra is None else self.bgra[..., 2::-1]
+
+    @property
+    def alpha(self) -> NDArray[np.uint8] | None:
+        return None if self.bgra is None else self.bgra[..., 3]
+
+
+class CaptureDataset:
+    """
+    Read a dataset recorded by ``CaptureRecorder``.
+
+    Usage::
+
+        data = CaptureDataset("logs/run_01")
+        frame = data[1234]                    # any frame, in recording order
+        frame.rgb, frame.depth, frame.world_pose
+        for i in data.frames_of(cam):         # one camera's frames
+            ...
+        data.index["game_time"]               # every timestamp, one array
+
+    Frames recorded after the dataset was opened are picked up by
+    ``refresh()``.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        """
+        Args:
+            path: Dataset directory.
+
+        Raises:
+            FileNotFoundError: If ``path`` holds no dataset.
+            ValueError: If the dataset version is not supported.
+        """
+        self._root = Path(path)
+        self._chunks: dict[tuple[int, str, int], np.memmap] = {}
+        self._index: NDArray[np.void] = np.zeros(0, dtype=INDEX_DTYPE)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-read ``meta.json`` and map every index record written so far."""
+        meta = read_meta(self._root)
+        self._chunk_frames = int(meta["chunk_frames"])
+        self._cameras = [
+            (bytes.fromhex(c["id"]), int(c["width"]), int(c["height"]))
+            for c in meta["cameras"]
+        ]
+        self._complete = bool(meta["complete"])
+        path = self._root / INDEX_FILE
+        # A recorder still running may have written part of a record.
+        count = path.stat().st_size // INDEX_DTYPE.itemsize if path.exists() else 0
+        if count:
+            self._index = np.memmap(path, dtype=INDEX_DTYPE, mode="r", shape=(count,))
+        else:
+            self._index = np.zeros(0, dtype=INDEX_DTYPE)
+
+    @property
+    def path(self) -> Path:
+        return self._root
+
+    @property
+    def complete(self) -> bool:
+        """``True`` once the recorder closed cleanly."""
+        return self._complete
+
+    @property
+    def camera_ids(self) -> list[bytes]:
+        return [camera_id for camera_id, _, _ in self._cameras]
+
+    @property
+    def index(self) -> NDArray[np.void]:
+        """Every frame's ``INDEX_DTYPE`` record (read-only, memory-mapped)."""
+        return self._index
+
+    def resolution(self, camera_id: bytes) -> tuple[int, int]:
+        """``(width, height)`` of a camera."""
+        _, width, height = self._cameras[self._camera(camera_id)]
+        return width, height
+
+    def _camera(self, camera_id: bytes) -> int:
+        for i, (known, _, _) in enumerate(self._cameras):
+            if known == camera_id:
+                return i
+        raise KeyError(camera_id)
+
+    def frames_of(self, camera_id: bytes) -> NDArray[np.intp]:
+        """Dataset positions of one camera's frames, in recording order."""
+        return np.flatnonzero(self._index["camera"] == self._camera(camera_id))
+
+    def _chunk(self, camera: int, kind: str, chunk: int) -> np.memmap:
+        key = (camera, kind, chunk)
+        out = self._chunks.get(key)
+        if out is None:
+            camera_id, width, height = self._cameras[camera]
+            shape, dtype = frame_layout(kind, width, height)
+            out = self._chunks[key] = np.memmap(
+                chunk_path(self._root, camera_id, kind, chunk),
+                dtype=dtype,
+                mode="r",
+                shape=(self._chunk_frames, *shape),
+            )
+        return out
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> RecordedFrame:
+        record = self._index[i]
+        camera, chunk, slot = (
+            int(record["camera"]),
+            int(record["chunk"]),
+            int(record["slot"]),
+        )
+        bgra = (
+            self._chunk(camera, "color", chunk)[slot] if record["has_color"] else None
+        )
+        depth = (
+            self._chunk(camera, "depth", chunk)[slot] if record["has_depth"] else None
+        )
+        camera_id, width, height = self._cameras[camera]
+        return RecordedFrame(record, camera_id, bgra, depth, width, height)
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def stats(self) -> dict[str, Any]:
+        """Frames per camera, recorded span and mean rate."""
+        times = self._index["wall_time"]
+        span = float(times.max() - times.min()) if len(times) > 1 else 0.0
+        return {
+            "frames": len(self._index),
+            "per_camera": {
+                camera_id: int(np.count_nonzero(self._index["camera"] == i))
+                for i, (camera_id, _, _) in enumerate(self._cameras)
+            },
+            "span_s": span,
+            "fps": (len(times) - 1) / span if span > 0 else 0.0,
+            "complete": self._complete,
+        }
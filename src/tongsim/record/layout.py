@@ -0,0 +1,89 @@
+"""
+record.layout
+
+On-disk layout of a capture dataset directory::
+
+    <root>/
+        meta.json                   cameras, resolutions, chunk size
+        index.bin                   one INDEX_DTYPE record per frame, appended
+        <camera hex>/
+            color_000000.bin        (chunk_frames, H, W, 4) uint8 BGRA
+            depth_000000.bin        (chunk_frames, H, W) little-endian float32
+            ...
+
+Frame ``i`` of the dataset is ``index[i]``; its images live at slot
+``index[i]["slot"]`` of chunk ``index[i]["chunk"]`` of its camera. Chunk files
+are preallocated at full size and keep it, including the last, partly filled
+one; readers always map ``chunk_frames`` slots and only read the slots the
+index points at.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+__all__ = [
+    "FORMAT_VERSION",
+    "INDEX_DTYPE",
+    "INDEX_FILE",
+    "META_FILE",
+    "chunk_path",
+    "frame_layout",
+    "read_meta",
+    "write_meta",
+]
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+INDEX_FILE = "index.bin"
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("camera", "<u2"),
+        ("chunk", "<u4"),
+        ("slot", "<u4"),
+        ("has_color", "u1"),
+        ("has_depth", "u1"),
+        ("depth_mode", "u1"),
+        ("frame_id", "<u8"),
+        ("game_time", "<f8"),
+        ("gpu_ready", "<f8"),
+        ("wall_time", "<f8"),
+        ("depth_near", "<f4"),
+        ("depth_far", "<f4"),
+        ("intrinsics", "<f8", (3, 3)),
+        ("world_pose", "<f8", (4, 4)),
+    ]
+)
+"""One fixed-size record per frame; ``camera`` indexes ``meta["cameras"]``."""
+
+
+def frame_layout(kind: str, width: int, height: int) -> tuple[tuple[int, ...], str]:
+    """Per-frame shape and dtype of the ``"color"`` or ``"depth"`` chunks."""
+    if kind == "color":
+        return (height, width, 4), "u1"
+    if kind == "depth":
+        return (height, width), "<f4"
+    raise ValueError(f"unknown chunk kind {kind!r}.")
+
+
+def chunk_path(root: Path, camera_id: bytes, kind: str, chunk: int) -> Path:
+    return root / camera_id.hex() / f"{kind}_{chunk:06d}.bin"
+
+
+def write_meta(root: Path, meta: dict[str, Any]) -> None:
+    """Replace ``meta.json`` atomically so readers never see half a file."""
+    tmp = root / (META_FILE + ".tmp")
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    tmp.replace(root / META_FILE)
+
+
+def read_meta(root: Path) -> dict[str, Any]:
+    meta = json.loads((root / META_FILE).read_text(encoding="utf-8"))
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"{root}: unsupported capture dataset version {meta.get('version')}."
+        )
+    return meta
@@ -0,0 +1,413 @@
+"""
+record.recorder
+
+Record capture frames to disk without stalling the simulation loop.
+
+Saving every frame as its own PNG/EXR file, on the thread that captures it,
+caps recording far below the camera rate. ``CaptureRecorder`` instead:
+
+- hands each frame to a bounded queue and returns immediately; what happens
+  when the queue is full follows the stream ``DropPolicy``
+- copies images on a background writer thread into chunked, preallocated
+  memory-mapped files, one set per camera (the only copy of the pixels)
+- appends poses, intrinsics and timestamps to a fixed-record index file, so
+  any frame can be located without scanning
+
+The layout is described in ``record.layout``; ``CaptureDataset`` reads it
+back as zero-copy views.
+
+Exports:
+- CaptureRecorder: background, chunked writer for ``CaptureFrame`` objects
+"""
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from tongsim.connection.grpc import CaptureFrame, DropPolicy
+from tongsim.logger import get_logger
+
+from .layout import (
+    FORMAT_VERSION,
+    INDEX_DTYPE,
+    INDEX_FILE,
+    META_FILE,
+    chunk_path,
+    frame_layout,
+    write_meta,
+)
+
+__all__ = ["CaptureRecorder"]
+
+_logger = get_logger("record")
+
+# Frames the writer takes off the queue before writing their index records.
+_WRITE_BATCH = 64
+
+
+def _allocate(path: Path, size: int) -> None:
+    """Create ``path`` with ``size`` bytes reserved on disk."""
+    with path.open("wb") as f:
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except (AttributeError, OSError):
+            # Not available (or not supported by the filesystem): sparse file.
+            f.truncate(size)
+
+
+class _CameraWriter:
+    """Chunk files and slot counter of one camera."""
+
+    __slots__ = (
+        "camera_id",
+        "chunk",
+        "chunk_frames",
+        "height",
+        "maps",
+        "root",
+        "slot",
+        "width",
+    )
+
+    def __init__(
+        self, root: Path, camera_id: bytes, width: int, height: int, chunk_frames: int
+    ):
+        self.root = root
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.chunk_frames = chunk_frames
+        self.chunk = 0
+        self.slot = 0
+        self.maps: dict[str, np.memmap] = {}
+        (root / camera_id.hex()).mkdir(exist_ok=True)
+
+    def map(self, kind: str) -> np.memmap:
+        """Current chunk of ``kind``, preallocated on first use."""
+        out = self.maps.get(kind)
+        if out is None:
+            shape, dtype = frame_layout(kind, self.width, self.height)
+            path = chunk_path(self.root, self.camera_id, kind, self.chunk)
+            _allocate(
+                path, self.chunk_frames * int(np.prod(shape)) * np.dtype(dtype).itemsize
+            )
+            out = self.maps[kind] = np.memmap(
+                path, dtype=dtype, mode="r+", shape=(self.chunk_frames, *shape)
+            )
+        return out
+
+    def advance(self) -> bool:
+        """Move to the next slot; return ``True`` when a chunk was completed."""
+        self.slot += 1
+        if self.slot < self.chunk_frames:
+            return False
+        self.close()
+        self.chunk += 1
+        self.slot = 0
+        return True
+
+    def close(self) -> None:
+        for array in self.maps.values():
+            array.flush()
+        self.maps.clear()
+
+
+class CaptureRecorder:
+    """
+    Record ``CaptureFrame`` objects of any number of cameras into a dataset.
+
+    Usage::
+
+        with CaptureRecorder("logs/run_01") as recorder:
+            async with CaptureAPI.stream_frames(conn, cams, qps=30) as frames:
+                async for frame in frames:
+                    recorder.record(frame)        # returns immediately
+        print(recorder.stats())
+
+    ``record`` only enqueues: it never touches the disk. Each camera keeps
+    the resolution of its first frame. Compressed frames must be decoded
+    first (``FrameDecoder``); ``record`` rejects any that are not. Frames
+    hold their message until written, so ``queue_size`` bounds the memory in
+    flight.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        chunk_frames: int = 128,
+        queue_size: int = 256,
+        policy: DropPolicy | str = DropPolicy.DROP_NEWEST,
+        name: str = "CaptureRecorder",
+    ):
+        """
+        Args:
+            path: Dataset directory; created if missing, and must not already
+                hold a dataset.
+            chunk_frames: Frames per chunk file (per camera and image kind).
+            queue_size: Frames waiting for the writer before ``policy`` applies.
+            policy: ``"drop_newest"`` (default) skips frames arriving at a full
+                queue, ``"drop_oldest"`` discards the oldest queued frame,
+                ``"block"`` makes ``record`` wait for room.
+            name: Name used for the writer thread and in logs.
+
+        Raises:
+            FileExistsError: If ``path`` already holds a dataset.
+        """
+        if chunk_frames < 1:
+            raise ValueError(f"chunk_frames must be >= 1, got {chunk_frames}.")
+        self._root = Path(path)
+        if (self._root / META_FILE).exists():
+            raise FileExistsError(f"{self._root} already holds a capture dataset.")
+        self._chunk_frames = chunk_frames
+        self._policy = DropPolicy(policy)
+        self._name = name
+        self._queue: queue.Queue[tuple[int, CaptureFrame, float]] = queue.Queue(
+            maxsize=queue_size
+        )
+        # Camera id -> (index, width, height), in the order cameras appeared.
+        self._cameras: dict[bytes, tuple[int, int, int]] = {}
+        self._cameras_lock = threading.Lock()
+        self._writers: dict[int, _CameraWriter] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._index_file = None
+        self._recorded = 0
+        self._dropped = 0
+        self._blocked_s = 0.0
+        self._bytes = 0
+        self._write_s = 0.0
+        self._chunks = 0
+
+    @property
+    def path(self) -> Path:
+        return self._root
+
+    def start(self) -> None:
+        """Create the dataset directory and start the writer thread."""
+        if self._thread is not None:
+            raise RuntimeError(f"[{self._name}] already started.")
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._index_file = (self._root / INDEX_FILE).open("ab")
+        self._write_meta(complete=False)
+        self._thread = threading.Thread(
+            target=self._run, name=f"[{self._name}] writer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "CaptureRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # ---------------------------
+    # Producer side
+    # ---------------------------
+
+    def _camera(self, frame: CaptureFrame) -> int:
+        known = self._cameras.get(frame.camera_id)
+        if known is None:
+            with self._cameras_lock:
+                known = (len(self._cameras), frame.width, frame.height)
+                self._cameras[frame.camera_id] = known
+        elif known[1:] != (frame.width, frame.height):
+            raise ValueError(
+                f"[{self._name}] camera {frame.camera_id.hex()} changed resolution "
+                f"from {known[1]}x{known[2]} to {frame.width}x{frame.height}."
+            )
+        return known[0]
+
+    def record(self, frame: CaptureFrame) -> bool:
+        """
+        Queue one frame for writing.
+
+        Returns:
+            bool: ``False`` if the frame was dropped because the queue is full
+            (``drop_newest``).
+
+        Raises:
+            RuntimeError: If the recorder is not running or the writer failed.
+            ValueError: If the frame is still compressed or a camera changed
+                resolution.
+        """
+        if self._thread is None or self._stop.is_set():
+            raise RuntimeError(f"[{self._name}] not running.")
+        if self._error is not None:
+            raise RuntimeError(f"[{self._name}] writer failed.") from self._error
+        # Only the codec magic is compared; the writer reuses the buffers read.
+        if not frame.decoded:
+            raise ValueError(
+                f"[{self._name}] frame {frame.frame_id} holds a compressed buffer; "
+                f"decode it with FrameDecoder (or pass decoder= to CaptureAPI)."
+            )
+        item = (self._camera(frame), frame, time.time())
+        if self._policy is DropPolicy.BLOCK:
+            start = time.perf_counter()
+            self._queue.put(item)
+            self._blocked_s += time.perf_counter() - start
+            return True
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                self._dropped += 1
+                if self._policy is DropPolicy.DROP_NEWEST:
+                    return False
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+
+    def record_many(self, frames: Iterable[CaptureFrame]) -> int:
+        """Queue several frames (for example a ``FrameSet``); return how many were queued."""
+        return sum(self.record(frame) for frame in frames)
+
+    def flush(self) -> None:
+        """Wait until every queued frame is written and indexed."""
+        self._queue.join()
+
+    # ---------------------------
+    # Writer thread
+    # ---------------------------
+
+    def _run(self) -> None:
+        try:
+            while not (self._stop.is_set() and self._queue.empty()):
+                try:
+                    batch = [self._queue.get(timeout=0.05)]
+                except queue.Empty:
+                    continue
+                while len(batch) < _WRITE_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    self._write(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        except BaseException as e:
+            self._error = e
+            _logger.error(f"[{self._name}] writer failed", exc_info=True)
+            # Unblock producers and flush() waiting on a dead writer.
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    break
+
+    def _writer(self, camera: int, frame: CaptureFrame) -> _CameraWriter:
+        writer = self._writers.get(camera)
+        if writer is None:
+            writer = self._writers[camera] = _CameraWriter(
+                self._root,
+                frame.camera_id,
+                frame.width,
+                frame.height,
+                self._chunk_frames,
+            )
+            self._write_meta(complete=False)
+        return writer
+
+    def _write(self, batch: list[tuple[int, CaptureFrame, float]]) -> None:
+        start = time.perf_counter()
+        records = np.zeros(len(batch), dtype=INDEX_DTYPE)
+        for record, (camera, frame, wall_time) in zip(records, batch, strict=True):
+            writer = self._writer(camera, frame)
+            if frame.has_color:
+                writer.map("color")[writer.slot] = frame.bgra
+                self._bytes += frame.bgra.nbytes
+            if frame.has_depth:
+                writer.map("depth")[writer.slot] = frame.depth
+                self._bytes += frame.depth.nbytes
+            record["camera"] = camera
+            record["chunk"] = writer.chunk
+            record["slot"] = writer.slot
+            record["has_color"] = frame.has_color
+            record["has_depth"] = frame.has_depth
+            record["depth_mode"] = frame.depth_mode
+            record["frame_id"] = frame.frame_id
+            record["game_time"] = frame.game_time
+            record["gpu_ready"] = frame.gpu_ready
+            record["wall_time"] = wall_time
+            record["depth_near"] = frame.depth_near
+            record["depth_far"] = frame.depth_far
+            record["intrinsics"] = frame.intrinsics
+            record["world_pose"] = frame.world_pose
+            self._chunks += writer.advance()
+        self._index_file.write(records.tobytes())
+        self._index_file.flush()
+        self._recorded += len(batch)
+        self._write_s += time.perf_counter() - start
+
+    def _write_meta(self, complete: bool) -> None:
+        with self._cameras_lock:
+            cameras = list(self._cameras.items())
+        write_meta(
+            self._root,
+            {
+                "version": FORMAT_VERSION,
+                "chunk_frames": self._chunk_frames,
+                "cameras": [
+                    {"id": camera_id.hex(), "width": width, "height": height}
+                    for camera_id, (_, width, height) in cameras
+                ],
+                "frames": self._recorded,
+                "complete": complete,
+            },
+        )
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Counters: ``recorded`` frames written, ``dropped`` at a full queue,
+        ``queued`` now, ``blocked_s`` spent in ``record`` under ``block``,
+        ``bytes`` of image data, ``mean_write_ms`` per frame and completed
+        ``chunks``.
+        """
+        return {
+            "recorded": self._recorded,
+            "dropped": self._dropped,
+            "queued": self._queue.qsize(),
+            "blocked_s": self._blocked_s,
+            "bytes": self._bytes,
+            "mean_write_ms": self._write_s / self._recorded * 1e3
+            if self._recorded
+            else 0.0,
+            "chunks": self._chunks,
+        }
+
+    def close(self) -> None:
+        """
+        Write the queued frames, flush every chunk and finalise ``meta.json``.
+
+        Raises:
+            RuntimeError: If the writer thread failed.
+        """
+        if self._thread is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        for writer in self._writers.values():
+            writer.close()
+        self._index_file.close()
+        self._write_meta(complete=self._error is None)
+        _logger.info(f"[{self._name}] closed: {self.stats()}")
+        if self._error is not None:
+            raise RuntimeError(f"[{self._name}] writer failed.") from self._error
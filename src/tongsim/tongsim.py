@@ -7,6 +7,7 @@ connection management and task scheduling.
 
 from typing import Final
 
+from tongsim.connection.grpc import RpcPolicy
 from tongsim.core.world_context import WorldContext
 from tongsim.manager.utils import UtilFuncs
 
@@ -20,15 +21,34 @@ class TongSim:
     synchronous applications.
     """
 
-    def __init__(self, grpc_endpoint: str = "127.0.0.1:5726"):
+    def __init__(
+        self,
+        grpc_endpoint: str = "127.0.0.1:5726",
+        channel_pool_size: int = 1,
+        rpc_policy: RpcPolicy | None = None,
+        connect_timeout: float = 0.0,
+    ):
         """
         Create a TongSim runtime binding.
 
         Args:
             grpc_endpoint (str): gRPC endpoint of the UE server, for example
                 "localhost:5726".
+            channel_pool_size (int): Number of gRPC channels to open. Use a
+                value above 1 when many RPCs are in flight at once (for
+                example parallel arenas) to avoid HTTP/2 head-of-line blocking.
+            rpc_policy (RpcPolicy | None): Retry/hedge/circuit-breaker policy
+                for unary RPCs; ``None`` uses the defaults.
+            connect_timeout (float): Seconds to wait for the connection to be
+                established before returning, so the first step does not pay
+                the setup; ``0`` (default) starts connecting without waiting.
         """
-        self._context: Final[WorldContext] = WorldContext(grpc_endpoint)
+        self._context: Final[WorldContext] = WorldContext(
+            grpc_endpoint,
+            channel_pool_size=channel_pool_size,
+            rpc_policy=rpc_policy,
+            connect_timeout=connect_timeout,
+        )
         self._utils: Final[UtilFuncs] = UtilFuncs(self._context)
 
     @property
@@ -686,6 +686,8 @@ void UTSCaptureSubsystem::EnsureTargetsAndComponents_GameThread(const TSharedPtr
 	SceneCap->bAlwaysPersistRenderingState = true;
 	SceneCap->CaptureSource = static_cast<ESceneCaptureSource>(Node->Config.ColorSource.GetValue());
 	SceneCap->FOVAngle = Node->Config.Fov;
+	// The frame reports DepthNearPlane as depth_near; clients invert DEVICE_Z
+	// depth with it, so it must stay the projection's near clip plane.
 	SceneCap->bOverride_CustomNearClippingPlane = true;
 	SceneCap->CustomNearClippingPlane = Node->Config.DepthNearPlane;
 	SceneCap->MaxViewDistanceOverride = Node->Config.DepthFarPlane;